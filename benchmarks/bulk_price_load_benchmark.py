@@ -0,0 +1,100 @@
+"""
+BIST30 Alım-Satım Bot - Sinyal Fiyat Yükleme Performans Ölçümü
+
+Simülatörlerin sinyal başına ayrı f-string sorgu ile fiyat çektiği eski
+yöntemi, tüm sinyaller için tek parametreli aralık sorgusu kullanan
+load_signal_price_frames ile karşılaştırır. Sorgu sayısı SQLite trace
+callback ile sayılır.
+
+Kullanım:
+    python -m benchmarks.bulk_price_load_benchmark [--symbols 30] [--signals 200]
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+from src.bot.data_fetcher import DataFetcher
+from src.bot.exit_engine import load_signal_price_frames
+
+def build_database(db_path, symbol_count, bar_count, seed=7):
+    """Sentetik günlük fiyat verisiyle veritabanı oluştur"""
+    DataFetcher(db_path=db_path)
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=bar_count).strftime('%Y-%m-%d')
+    
+    rows = []
+    for index in range(symbol_count):
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bar_count)))
+        for date, close in zip(dates, closes):
+            rows.append((f"SYM{index:03d}", date, close, close * 1.01, close * 0.99, close, 1000))
+    
+    conn = sqlite3.connect(db_path)
+    conn.executemany('INSERT INTO stock_data VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+    return list(dates)
+
+def load_per_signal(conn, signals):
+    """Eski yöntem: sinyal başına f-string sorgu, date(date) karşılaştırması"""
+    frames = []
+    for signal in signals:
+        price_query = f"""
+        SELECT * FROM stock_data 
+        WHERE symbol = '{signal['symbol']}' 
+        AND date(date) >= date('{signal['signal_date']}')
+        ORDER BY date ASC
+        """
+        price_df = pd.read_sql_query(price_query, conn)
+        if len(price_df) >= 2:
+            frames.append(price_df)
+    return frames
+
+def measure(conn, loader, signals, repeats):
+    """Yükleyicinin sorgu sayısını ve ortalama süresini ölç"""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    loader(conn, signals)
+    conn.set_trace_callback(None)
+    query_count = sum(1 for statement in statements if statement.lstrip().upper().startswith(('SELECT', 'WITH')))
+    
+    started = time.perf_counter()
+    for _ in range(repeats):
+        loader(conn, signals)
+    elapsed = (time.perf_counter() - started) / repeats
+    return query_count, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Sinyal fiyat yükleme performans ölçümü')
+    parser.add_argument('--symbols', type=int, default=30)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--signals', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'benchmark.db')
+        dates = build_database(db_path, args.symbols, args.bars)
+        
+        rng = np.random.default_rng(1)
+        signals = [{
+            'symbol': f"SYM{rng.integers(args.symbols):03d}",
+            'signal_date': dates[rng.integers(len(dates) - 60, len(dates) - 2)]
+        } for _ in range(args.signals)]
+        
+        conn = sqlite3.connect(db_path)
+        before_queries, before_time = measure(conn, load_per_signal, signals, args.repeats)
+        after_queries, after_time = measure(conn, load_signal_price_frames, signals, args.repeats)
+        conn.close()
+    
+    print(f"{args.signals} sinyal, {args.symbols} hisse x {args.bars} bar")
+    print(f"Önce  (sinyal başına sorgu): {before_queries:4d} sorgu, {before_time * 1000:8.1f} ms")
+    print(f"Sonra (tek aralık sorgusu):  {after_queries:4d} sorgu, {after_time * 1000:8.1f} ms")
+    print(f"Hızlanma: {before_time / after_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
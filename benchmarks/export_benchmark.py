@@ -0,0 +1,85 @@
+"""
+BIST30 Alım-Satım Bot - Toplu Dışa Aktarma Performans Ölçümü
+
+Tüm fiyat geçmişini DataFrame'e yükleyip to_dict(orient='records') ile
+serileştiren eski yöntemi, TableExporter'ın sayfalı akışıyla karşılaştırır.
+Her yöntem için süre, çıktı boyutu ve tracemalloc ile ölçülen en yüksek
+bellek kullanımı raporlanır. Akışın bellek kullanımı satır sayısıyla
+büyümemelidir.
+
+Kullanım:
+    python -m benchmarks.export_benchmark [--symbols 100] [--bars 2500] [--formats ndjson,csv,arrow]
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+import pandas as pd
+
+from src.bot.data_fetcher import DataFetcher
+from src.bot.exporter import TableExporter, pa
+
+def build_database(db_path, symbol_count, bar_count):
+    """Sentetik günlük fiyat verisiyle veritabanı oluştur"""
+    DataFetcher(db_path=db_path)
+    dates = pd.bdate_range('2010-01-01', periods=bar_count).strftime('%Y-%m-%d')
+    
+    conn = sqlite3.connect(db_path)
+    for index in range(symbol_count):
+        conn.executemany('INSERT INTO stock_data VALUES (?, ?, ?, ?, ?, ?, ?)', [
+            (f"SYM{index:03d}", date, 100.0, 101.0, 99.0, 100.5, 1000 + bar) for bar, date in enumerate(dates)
+        ])
+    conn.commit()
+    conn.close()
+
+def export_dataframe(db_path):
+    """Eski yöntem: tüm tabloyu DataFrame'e yükle ve tek JSON gövdesine çevir"""
+    conn = sqlite3.connect(db_path)
+    data = pd.read_sql_query('SELECT * FROM stock_data', conn)
+    conn.close()
+    return [json.dumps(data.to_dict(orient='records')).encode('utf-8')]
+
+def measure(export):
+    """Dışa aktarmanın süresini, boyutunu ve en yüksek bellek kullanımını ölç"""
+    started = time.perf_counter()
+    size = sum(len(chunk) for chunk in export())
+    elapsed = time.perf_counter() - started
+    
+    # tracemalloc ölçümü yavaşlattığı için süre ayrı çalıştırmada ölçülür
+    tracemalloc.start()
+    for _ in export():
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Toplu dışa aktarma performans ölçümü')
+    parser.add_argument('--symbols', type=int, default=100)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--formats', default='ndjson,csv,arrow', help='Virgülle ayrılmış biçimler')
+    args = parser.parse_args()
+    
+    formats = [name for name in args.formats.split(',') if name and (name != 'arrow' or pa is not None)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'benchmark.db')
+        build_database(db_path, args.symbols, args.bars)
+        exporter = TableExporter(db_path=db_path)
+        
+        results = [('DataFrame + to_dict', measure(lambda: export_dataframe(db_path)))]
+        for name in formats:
+            results.append((f"akış {name}", measure(lambda: exporter.export('stock_data', name))))
+            results.append((f"akış {name} + gzip", measure(lambda: exporter.export('stock_data', name, compress=True))))
+    
+    print(f"{args.symbols * args.bars} satır ({args.symbols} hisse x {args.bars} bar)")
+    print(f"{'Yöntem':<22} {'Süre s':>8} {'Boyut MB':>9} {'Bellek MB':>10}")
+    for name, (elapsed, size, peak) in results:
+        print(f"{name:<22} {elapsed:8.2f} {size / 1e6:9.1f} {peak / 1e6:10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+BIST30 Alım-Satım Bot - Sahte Telegram Bot API Sunucusu
+
+Bildirim hattının gerçek Telegram'a bağlanmadan ölçülebilmesi ve hız/hata
+davranışının tekrar üretilebilmesi için yerel HTTP sunucusu. getMe ve
+sendMessage metodlarını Telegram ile aynı yanıt biçiminde uygular:
+
+- Yapılandırılabilir gecikme (sabit + rastgele sapma)
+- Olasılıkla 429 (retry_after) ve 5xx hata enjeksiyonu
+- İsteğe bağlı olarak Telegram'ın global ve sohbet başı hız sınırlarının
+  taklidi (sınır aşılırsa 429)
+- 4096 karakter sınırı ve kapanmamış HTML etiketleri için 400 yanıtı
+
+TelegramNotifier(base_url=server.base_url) veya TELEGRAM_API_BASE_URL ortam
+değişkeni ile bu sunucuya yönlendirilir.
+
+Kullanım:
+    python -m benchmarks.fake_telegram [--port 8081] [--latency 0.05] [--rate-limit-rate 0.01]
+"""
+
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import deque, defaultdict
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('FakeTelegramServer')
+
+# Telegram'ın HTML parse_mode için kabul ettiği etiketler
+SUPPORTED_TAGS = {'b', 'strong', 'i', 'em', 'u', 'ins', 's', 'strike', 'del', 'a', 'code', 'pre', 'span', 'tg-spoiler', 'blockquote'}
+
+# Sınır taklidinde kullanılan pencere (saniye)
+RATE_WINDOW = 1.0
+
+class _EntityChecker(HTMLParser):
+    """HTML mesajındaki etiketlerin dengeli ve desteklenen olduğunu doğrula"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.error = None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag not in SUPPORTED_TAGS:
+            self.error = self.error or f"Unsupported start tag \"{tag}\""
+        self.stack.append(tag)
+    
+    def handle_endtag(self, tag):
+        if not self.stack or self.stack[-1] != tag:
+            self.error = self.error or f"Unexpected end tag \"{tag}\""
+            return
+        self.stack.pop()
+
+def check_entities(text):
+    """
+    Telegram'ın "can't parse entities" hatasını taklit et
+    
+    Args:
+        text: HTML mesaj metni
+    
+    Returns:
+        str: Hata açıklaması, mesaj geçerliyse None
+    """
+    checker = _EntityChecker()
+    checker.feed(text)
+    checker.close()
+    if checker.error is None and checker.stack:
+        checker.error = f"Can't find end tag corresponding to start tag \"{checker.stack[-1]}\""
+    return checker.error
+
+class FakeTelegramServer:
+    """Yük testleri için yerel Telegram Bot API taklidi"""
+    
+    def __init__(self, host='127.0.0.1', port=0, latency=0.05, latency_jitter=0.0,
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                 enforce_limits=False, global_rate=TELEGRAM_GLOBAL_RATE,
+                 chat_rate=TELEGRAM_CHAT_RATE, chat_burst=TELEGRAM_CHAT_BURST, seed=None):
+        """
+        FakeTelegramServer sınıfını başlat
+        
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+            latency: Her isteğe eklenen sabit gecikme (saniye)
+            latency_jitter: Gecikmeye eklenen rastgele sapma üst sınırı (saniye)
+            error_rate: sendMessage isteklerinin 502 ile yanıtlanma olasılığı
+            rate_limit_rate: sendMessage isteklerinin 429 ile yanıtlanma olasılığı
+            retry_after: 429 yanıtlarındaki retry_after değeri (saniye)
+            enforce_limits: True ise global/sohbet başı sınır aşımında 429 döner
+            global_rate: Sınır taklidinde saniyede toplam mesaj
+            chat_rate: Sınır taklidinde sohbet başına saniyede mesaj
+            chat_burst: Sınır taklidinde sohbete pencere içinde izin verilen ani mesaj
+            seed: Hata enjeksiyonu için rastgele tohum
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.enforce_limits = enforce_limits
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset()
+    
+    @property
+    def base_url(self):
+        """TelegramNotifier(base_url=...) için adres"""
+        return f"http://{self.host}:{self.port}/bot"
+    
+    def reset(self):
+        """Sayaçları ve alınan mesajları sıfırla"""
+        with self._lock:
+            self.messages = []
+            self.stats = {
+                'requests': 0,
+                'sent': 0,
+                'rate_limited': 0,
+                'limit_violations': 0,
+                'errors': 0,
+                'bad_requests': 0,
+                'active_requests': 0,
+                'max_active_requests': 0
+            }
+            self.connections = set()
+            self._global_window = deque()
+            self._chat_windows = defaultdict(deque)
+    
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlat"""
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Kalıcı (keep-alive) bağlantılar: notifier'ın bağlantı havuzu yeniden kullanılır
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                server._handle(self, self.rfile.read(length))
+            
+            do_GET = do_POST
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-telegram', daemon=True)
+        self._thread.start()
+        logger.info(f"Sahte Telegram sunucusu başlatıldı: {self.base_url}")
+        return self
+    
+    def stop(self):
+        """Sunucuyu durdur"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            logger.info("Sahte Telegram sunucusu durduruldu")
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+    
+    def _parse_params(self, handler, body):
+        """İstek gövdesini (JSON veya form) sözlüğe çevir"""
+        if not body:
+            return {}
+        if 'json' in handler.headers.get('Content-Type', ''):
+            return json.loads(body)
+        return dict(parse_qsl(body.decode('utf-8')))
+    
+    def _exceeds_limits(self, chat_id, now):
+        """Kayan pencere ile global ve sohbet başı hız sınırı aşımını kontrol et"""
+        chat_window = self._chat_windows[chat_id]
+        for window in (self._global_window, chat_window):
+            while window and now - window[0] >= RATE_WINDOW:
+                window.popleft()
+        if len(self._global_window) >= self.global_rate * RATE_WINDOW or len(chat_window) >= max(self.chat_burst, self.chat_rate * RATE_WINDOW):
+            return True
+        self._global_window.append(now)
+        chat_window.append(now)
+        return False
+    
+    def _send_message(self, params):
+        """sendMessage yanıtını (HTTP durum kodu, gövde) üret"""
+        chat_id = str(params.get('chat_id', ''))
+        text = params.get('text', '')
+        now = time.monotonic()
+        
+        with self._lock:
+            if self._random.random() < self.rate_limit_rate:
+                self.stats['rate_limited'] += 1
+                return 429, self._retry_after_response()
+            if self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 502, {'ok': False, 'error_code': 502, 'description': 'Bad Gateway'}
+            if not chat_id or not text:
+                self.stats['bad_requests'] += 1
+                return 400, {'ok': False, 'error_code': 400, 'description': 'Bad Request: message text is empty'}
+            if len(text) > TELEGRAM_MESSAGE_LIMIT:
+                self.stats['bad_requests'] += 1
+                return 400, {'ok': False, 'error_code': 400, 'description': 'Bad Request: message is too long'}
+            if params.get('parse_mode') == 'HTML':
+                entity_error = check_entities(text)
+                if entity_error:
+                    self.stats['bad_requests'] += 1
+                    return 400, {'ok': False, 'error_code': 400, 'description': f"Bad Request: can't parse entities: {entity_error}"}
+            if self.enforce_limits and self._exceeds_limits(chat_id, now):
+                self.stats['rate_limited'] += 1
+                self.stats['limit_violations'] += 1
+                return 429, self._retry_after_response()
+            
+            self.stats['sent'] += 1
+            message_id = self.stats['sent']
+            self.messages.append({
+                'message_id': message_id,
+                'chat_id': chat_id,
+                'text': text,
+                'received_at': time.time()
+            })
+        
+        return 200, {'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(chat_id) if chat_id.lstrip('-').isdigit() else 0, 'type': 'private'},
+            'text': text
+        }}
+    
+    def _retry_after_response(self):
+        """Telegram biçiminde 429 yanıt gövdesi"""
+        return {
+            'ok': False,
+            'error_code': 429,
+            'description': f"Too Many Requests: retry after {self.retry_after}",
+            'parameters': {'retry_after': self.retry_after}
+        }
+    
+    def _handle(self, handler, body):
+        """Gelen isteği gecikme ve enjeksiyon kurallarıyla yanıtla"""
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['active_requests'] += 1
+            self.stats['max_active_requests'] = max(self.stats['max_active_requests'], self.stats['active_requests'])
+            self.connections.add(handler.client_address)
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+        
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            
+            method = handler.path.rstrip('/').rsplit('/', 1)[-1]
+            try:
+                params = self._parse_params(handler, body)
+            except ValueError:
+                params = None
+            
+            if params is None:
+                status, response = 400, {'ok': False, 'error_code': 400, 'description': 'Bad Request: invalid request body'}
+            elif method == 'getMe':
+                status, response = 200, {'ok': True, 'result': {
+                    'id': 1, 'is_bot': True, 'first_name': 'BIST30 Test Bot', 'username': 'bist30_test_bot'
+                }}
+            elif method == 'sendMessage':
+                status, response = self._send_message(params)
+            else:
+                status, response = 404, {'ok': False, 'error_code': 404, 'description': 'Not Found: method not found'}
+        finally:
+            with self._lock:
+                self.stats['active_requests'] -= 1
+        
+        payload = json.dumps(response).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+    
+    def get_stats(self):
+        """
+        Sunucu metriklerini getir
+        
+        Returns:
+            dict: İstek, başarılı mesaj, enjekte edilen hata sayıları ve
+                  kullanılan farklı bağlantı sayısı
+        """
+        with self._lock:
+            return {
+                **self.stats,
+                'connections': len(self.connections),
+                'chats': len({message['chat_id'] for message in self.messages})
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description='Sahte Telegram Bot API sunucusu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--enforce-limits', action='store_true')
+    args = parser.parse_args()
+    
+    server = FakeTelegramServer(
+        host=args.host, port=args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after, enforce_limits=args.enforce_limits
+    ).start()
+    print(f"TELEGRAM_API_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(server.get_stats()))
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
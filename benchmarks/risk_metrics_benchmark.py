@@ -0,0 +1,57 @@
+"""
+BIST30 Alım-Satım Bot - Risk Metrikleri Performans Ölçümü
+
+Sentetik işlem listesi üzerinde summarize_trades ile özsermaye eğrisi,
+düşüş, Sharpe/Sortino/Calmar, exposure ve turnover hesaplama süresini ölçer.
+
+Kullanım:
+    python -m benchmarks.risk_metrics_benchmark [--trades 100000]
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.bot.risk_metrics import summarize_trades
+
+def make_trades(trade_count, seed=3):
+    """Rastgele giriş tarihleri ve bekleme süreleriyle sentetik işlem listesi üret"""
+    rng = np.random.default_rng(seed)
+    calendar = pd.bdate_range('2015-01-01', periods=2500)
+    entry_index = rng.integers(0, len(calendar) - 30, trade_count)
+    exit_index = entry_index + rng.integers(1, 30, trade_count)
+    buy_prices = rng.uniform(10, 200, trade_count)
+    returns = rng.normal(0.002, 0.04, trade_count)
+    
+    entry_dates = calendar[entry_index].strftime('%Y-%m-%d')
+    exit_dates = calendar[exit_index].strftime('%Y-%m-%d')
+    return [{
+        'buy_date': entry_dates[i],
+        'sell_date': exit_dates[i],
+        'buy_price': float(buy_prices[i]),
+        'profit_loss': float(buy_prices[i] * returns[i]),
+        'profit_loss_percentage': float(returns[i] * 100)
+    } for i in range(trade_count)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Risk metrikleri performans ölçümü')
+    parser.add_argument('--trades', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    trades = make_trades(args.trades)
+    summarize_trades(trades)
+    
+    started = time.perf_counter()
+    for _ in range(args.repeats):
+        summary, equity_curve = summarize_trades(trades)
+    elapsed = (time.perf_counter() - started) / args.repeats
+    
+    print(f"{args.trades} işlem, {len(equity_curve)} günlük özsermaye noktası")
+    print(f"Süre: {elapsed * 1000:.1f} ms")
+    print(f"Sharpe: {summary['sharpe_ratio']:.2f}, Sortino: {summary['sortino_ratio']:.2f}, "
+          f"Maks. düşüş: %{summary['max_drawdown_percentage']:.2f} ({summary['max_drawdown_duration']} gün)")
+
+if __name__ == '__main__':
+    main()
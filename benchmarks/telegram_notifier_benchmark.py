@@ -0,0 +1,125 @@
+"""
+BIST30 Alım-Satım Bot - Telegram Bildirim Performans Ölçümü
+
+TelegramNotifier.send_signals'ı yerel sahte Telegram sunucusuna
+(benchmarks/fake_telegram.py) karşı farklı hisse evreni boyutlarında çalıştırır;
+saniyede mesaj, toplam süre ve kuyruk gecikme yüzdeliklerini raporlar.
+Sunucu gecikmesi, 429 ve hata enjeksiyonu ile Telegram'ın hız sınırlarının
+taklidi komut satırından ayarlanır.
+
+Kullanım:
+    python -m benchmarks.telegram_notifier_benchmark [--sizes 30,100,300] [--latency 0.05]
+        [--rate-limit-rate 0.02] [--error-rate 0.01] [--enforce-limits]
+"""
+
+import time
+import argparse
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.bot.config import TELEGRAM_CONNECTION_POOL_SIZE, TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_RATE
+from benchmarks.fake_telegram import FakeTelegramServer
+from src.bot.telegram_notifier import TelegramNotifier
+
+BENCHMARK_CHAT_ID = '1000'
+
+def build_signals(universe_size, signal_ratio, seed=7):
+    """Evrenin signal_ratio kadarı için sentetik alım/satım sinyalleri üret"""
+    rng = np.random.default_rng(seed)
+    last_date = datetime(2024, 1, 5)
+    signals = {'buy_signals': [], 'sell_signals': []}
+    
+    for index in range(universe_size):
+        if rng.random() >= signal_ratio:
+            continue
+        is_buy = rng.random() < 0.5
+        signal = {
+            'symbol': f"SYM{index:04d}",
+            'buy_signal': is_buy,
+            'sell_signal': not is_buy,
+            'buy_reason': 'Fiyat 5 haftalık MA üzerinde ve yükseliş trendinde, RSI 30-50 aralığında',
+            'sell_reason': 'Fiyat 5 haftalık MA altında ve düşüş trendinde, RSI 70 üzerinde',
+            'current_price': float(rng.uniform(5, 500)),
+            'last_date': last_date - timedelta(days=int(rng.integers(0, 3)))
+        }
+        signals['buy_signals' if is_buy else 'sell_signals'].append(signal)
+    return signals
+
+def run_size(server, universe_size, args):
+    """Tek evren boyutu için send_signals'ı ölç"""
+    signals = build_signals(universe_size, args.signal_ratio)
+    signal_count = len(signals['buy_signals']) + len(signals['sell_signals'])
+    
+    server.reset()
+    notifier = TelegramNotifier(
+        token='123456:BENCHMARK', chat_id=BENCHMARK_CHAT_ID,
+        connection_pool_size=args.pool_size, base_url=server.base_url,
+        global_rate=args.global_rate, chat_rate=args.chat_rate
+    )
+    try:
+        started = time.perf_counter()
+        success = notifier.send_signals(signals)
+        elapsed = time.perf_counter() - started
+        queue_stats = notifier.get_queue_stats()
+    finally:
+        notifier.close()
+    
+    server_stats = server.get_stats()
+    return {
+        'universe': universe_size,
+        'signals': signal_count,
+        'success': success,
+        'messages': server_stats['sent'],
+        'requests': server_stats['requests'],
+        'rate_limited': server_stats['rate_limited'],
+        'errors': server_stats['errors'],
+        'failed': queue_stats['failed'],
+        'elapsed': elapsed,
+        'messages_per_second': server_stats['sent'] / elapsed if elapsed else 0,
+        'send_latency': queue_stats['send_latency'],
+        'delivery_latency': queue_stats['delivery_latency']
+    }
+
+def format_ms(value):
+    """Gecikme değerini yazdırılabilir hale getir"""
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Telegram bildirim performans ölçümü')
+    parser.add_argument('--sizes', default='30,100,300,1000', help='Virgülle ayrılmış evren boyutları')
+    parser.add_argument('--signal-ratio', type=float, default=0.3, help='Sinyal üreten hisse oranı')
+    parser.add_argument('--latency', type=float, default=0.05, help='Sunucu gecikmesi (saniye)')
+    parser.add_argument('--latency-jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--enforce-limits', action='store_true', help='Telegram hız sınırlarını taklit et')
+    parser.add_argument('--pool-size', type=int, default=TELEGRAM_CONNECTION_POOL_SIZE)
+    parser.add_argument('--global-rate', type=float, default=TELEGRAM_GLOBAL_RATE)
+    parser.add_argument('--chat-rate', type=float, default=TELEGRAM_CHAT_RATE)
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    server = FakeTelegramServer(
+        latency=args.latency, latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        enforce_limits=args.enforce_limits, seed=1
+    )
+    
+    with server:
+        results = [run_size(server, size, args) for size in sizes]
+    
+    print(f"Sunucu gecikmesi {args.latency * 1000:.0f}±{args.latency_jitter * 1000:.0f} ms, "
+          f"429 oranı {args.rate_limit_rate:.2%}, hata oranı {args.error_rate:.2%}, "
+          f"havuz {args.pool_size}, sınır {args.global_rate:g}/sn global, {args.chat_rate:g}/sn sohbet")
+    print(f"{'Evren':>6} {'Sinyal':>7} {'Mesaj':>6} {'İstek':>6} {'429':>5} {'Hata':>5} {'Süre s':>8} "
+          f"{'Mesaj/sn':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for result in results:
+        latency = result['delivery_latency']
+        print(f"{result['universe']:6d} {result['signals']:7d} {result['messages']:6d} {result['requests']:6d} "
+              f"{result['rate_limited']:5d} {result['errors']:5d} {result['elapsed']:8.2f} "
+              f"{result['messages_per_second']:9.1f} {format_ms(latency['p50_ms'])} {format_ms(latency['p95_ms'])} "
+              f"{format_ms(latency['p99_ms'])} {format_ms(latency['max_ms'])}"
+              + ("" if result['success'] and not result['failed'] else f"  ({result['failed']} başarısız)"))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+BIST30 Alım-Satım Bot - Haftalık Toplulaştırma Performans Ölçümü
+
+get_weekly_bist30_performance'ın eski sembol başına sorgu + pandas
+yöntemini, tüm evreni pencere fonksiyonlarıyla tek sorguda toplulaştıran
+load_weekly_aggregates ile karşılaştırır.
+
+Kullanım:
+    python -m benchmarks.weekly_aggregation_benchmark [--symbols 500] [--bars 750]
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+import pandas as pd
+
+from src.bot.weekly_aggregation import load_weekly_aggregates
+from benchmarks.bulk_price_load_benchmark import build_database
+
+def aggregate_per_symbol(conn, symbols, start_date, end_date):
+    """Eski yöntem: sembol başına sorgu, pandas ile ilk/son/maks/min/toplam"""
+    performances = []
+    for symbol in symbols:
+        df = pd.read_sql_query(
+            'SELECT * FROM stock_data WHERE symbol = ? AND date >= ? AND date <= ? ORDER BY date ASC',
+            conn,
+            params=(symbol, start_date, end_date)
+        )
+        if df.empty:
+            continue
+        performances.append({
+            'symbol': symbol,
+            'first_price': df.iloc[0]['close'],
+            'last_price': df.iloc[-1]['close'],
+            'weekly_high': df['high'].max(),
+            'weekly_low': df['low'].min(),
+            'weekly_volume': df['volume'].sum()
+        })
+    return performances
+
+def timed(function, repeats):
+    """Fonksiyonun ortalama çalışma süresini ölç"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return result, (time.perf_counter() - started) / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description='Haftalık toplulaştırma performans ölçümü')
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=750)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'benchmark.db')
+        dates = build_database(db_path, args.symbols, args.bars)
+        symbols = [f"SYM{index:03d}" for index in range(args.symbols)]
+        
+        # Son tam hafta
+        week_start = pd.Timestamp(dates[-10]).to_period('W-SUN').start_time
+        start_date = week_start.strftime('%Y-%m-%d')
+        end_date = (week_start + pd.Timedelta(days=6)).strftime('%Y-%m-%d')
+        
+        conn = sqlite3.connect(db_path)
+        before, before_time = timed(lambda: aggregate_per_symbol(conn, symbols, start_date, end_date), args.repeats)
+        after, after_time = timed(lambda: load_weekly_aggregates(conn, start_date, end_date), args.repeats)
+        history, history_time = timed(lambda: load_weekly_aggregates(conn, dates[0], dates[-1]), args.repeats)
+        conn.close()
+    
+    print(f"{args.symbols} hisse x {args.bars} günlük bar, hafta {start_date} - {end_date}")
+    print(f"Önce  (sembol başına sorgu): {len(before):4d} hisse, {before_time * 1000:8.1f} ms")
+    print(f"Sonra (tek pencere sorgusu): {len(after):4d} hisse, {after_time * 1000:8.1f} ms")
+    print(f"Hızlanma: {before_time / after_time:.1f}x")
+    print(f"Tüm geçmiş ({len(history)} hisse-hafta satırı): {history_time * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,567 @@
+"""
+BIST30 Alım-Satım Bot - Portföy Backtest Modülü
+
+Sinyal kurallarını veritabanındaki tüm fiyat geçmişi üzerinde, nakit,
+pozisyon büyüklüğü, komisyon, kayma, eş zamanlı pozisyon sınırı ve kısmi
+kâr alma ile çalıştırır. Göstergeler ve sinyaller tüm semboller için
+(tarih x sembol) panelleri üzerinde vektörel olarak hesaplanır; simülasyon
+her bar için tüm sembolleri aynı anda işler.
+"""
+
+import logging
+import sqlite3
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.risk_metrics import equity_metrics, trade_metrics
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('PortfolioBacktester')
+
+# Varsayılan strateji ve portföy parametreleri
+DEFAULT_BACKTEST_PARAMS = {
+    'initial_capital': BACKTEST_INITIAL_CAPITAL,
+    'position_size': BACKTEST_POSITION_SIZE,
+    'max_positions': BACKTEST_MAX_POSITIONS,
+    'commission_rate': BACKTEST_COMMISSION_RATE,
+    'slippage_rate': BACKTEST_SLIPPAGE_RATE,
+    'target_pct': TARGET_PROFIT_PERCENTAGE,
+    'stop_pct': STOP_LOSS_PERCENTAGE,
+    'max_holding_bars': BACKTEST_MAX_HOLDING_BARS,
+    'partial_threshold': PARTIAL_PROFIT_THRESHOLD,
+    'partial_fraction': PARTIAL_PROFIT_PERCENTAGE,
+    'same_bar_policy': SAME_BAR_EXIT_POLICY,
+    'use_sell_signals': True,
+    # Sinyal kuralları (SignalGenerator ile aynı varsayılanlar)
+    'rsi_buy_low': RSI_OVERSOLD,
+    'rsi_buy_high': 50,
+    'rsi_sell': RSI_OVERBOUGHT,
+    'min_conditions': 2
+}
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _shift(values, periods=1):
+    """Paneli satır ekseninde kaydır, boşalan satırları NaN ile doldur"""
+    shifted = np.full_like(values, np.nan, dtype=float)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+def build_price_panel(prices):
+    """
+    Uzun formattaki fiyat tablosunu (tarih x sembol) paneline dönüştür
+    
+    Args:
+        prices: symbol, date, open, high, low, close, volume sütunlu pandas.DataFrame
+    
+    Returns:
+        dict: 'dates', 'symbols' ve her fiyat sütunu için 2B numpy dizisi
+    """
+    panel = {'dates': np.array([], dtype=object), 'symbols': []}
+    if prices.empty:
+        for column in PRICE_COLUMNS:
+            panel[column] = np.empty((0, 0))
+        return panel
+    
+    for column in PRICE_COLUMNS:
+        wide = prices.pivot(index='date', columns='symbol', values=column).sort_index()
+        panel[column] = wide.to_numpy(dtype=float)
+        panel['dates'] = wide.index.to_numpy()
+        panel['symbols'] = list(wide.columns)
+    
+    return panel
+
+def compute_indicator_panel(panel):
+    """
+    Tüm semboller için teknik göstergeleri tek seferde hesapla
+    
+    TechnicalAnalyzer ile aynı formüller kullanılır; fark, hesaplamanın
+    her sembol için ayrı ayrı değil (tarih x sembol) paneli üzerinde yapılmasıdır.
+    
+    Args:
+        panel: build_price_panel çıktısı
+    
+    Returns:
+        dict: Gösterge adı -> 2B numpy dizisi
+    """
+    close = pd.DataFrame(panel['close'])
+    
+    ma_short = close.rolling(window=MA_SHORT).mean()
+    ma_long = close.rolling(window=MA_LONG).mean()
+    
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=RSI_PERIOD).mean()
+    avg_loss = loss.rolling(window=RSI_PERIOD).mean()
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    
+    ema_fast = close.ewm(span=MACD_FAST, adjust=False).mean()
+    ema_slow = close.ewm(span=MACD_SLOW, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    macd_signal = macd.ewm(span=MACD_SIGNAL, adjust=False).mean()
+    
+    bollinger_middle = close.rolling(window=BOLLINGER_PERIOD).mean()
+    rolling_std = close.rolling(window=BOLLINGER_PERIOD).std()
+    
+    volume_max = pd.DataFrame(panel['volume']).rolling(window=5).max()
+    
+    return {
+        'ma_short': ma_short.to_numpy(),
+        'ma_long': ma_long.to_numpy(),
+        'rsi': rsi.to_numpy(),
+        'macd': macd.to_numpy(),
+        'macd_signal': macd_signal.to_numpy(),
+        'bollinger_upper': (bollinger_middle + rolling_std * BOLLINGER_STD).to_numpy(),
+        'bollinger_middle': bollinger_middle.to_numpy(),
+        'bollinger_lower': (bollinger_middle - rolling_std * BOLLINGER_STD).to_numpy(),
+        'volume_max_5': volume_max.to_numpy()
+    }
+
+def compute_signal_panel(panel, indicators, params=None):
+    """
+    SignalGenerator alım/satım kurallarını tüm panel üzerinde vektörel uygula
+    
+    Args:
+        panel: build_price_panel çıktısı
+        indicators: compute_indicator_panel çıktısı
+        params: Sinyal kuralı parametreleri (None ise varsayılanlar)
+    
+    Returns:
+        dict: 'buy', 'sell' boolean panelleri ve 'buy_score' (sağlanan koşul sayısı)
+    """
+    params = {**DEFAULT_BACKTEST_PARAMS, **(params or {})}
+    
+    close = panel['close']
+    volume = panel['volume']
+    prev_close = _shift(close)
+    
+    rsi = indicators['rsi']
+    prev_rsi = _shift(rsi)
+    macd = indicators['macd']
+    macd_signal = indicators['macd_signal']
+    prev_macd = _shift(macd)
+    prev_macd_signal = _shift(macd_signal)
+    ma_short = indicators['ma_short']
+    prev_ma_short = _shift(ma_short)
+    lower = indicators['bollinger_lower']
+    middle = indicators['bollinger_middle']
+    upper = indicators['bollinger_upper']
+    prev_lower = _shift(lower)
+    prev_upper = _shift(upper)
+    
+    with np.errstate(invalid='ignore'):
+        # Alım koşulları
+        band_threshold = (middle - lower) * 0.2
+        buy_conditions = [
+            (close > ma_short) & (close > prev_close),
+            (rsi >= params['rsi_buy_low']) & (rsi <= params['rsi_buy_high']) & (rsi > prev_rsi),
+            (prev_macd < prev_macd_signal) & (macd > macd_signal),
+            (close <= lower + band_threshold) | ((prev_close < prev_lower) & (close > lower)),
+            volume == indicators['volume_max_5']
+        ]
+        
+        # Satım koşulları
+        sell_conditions = [
+            (rsi > params['rsi_sell']) & (rsi < prev_rsi),
+            (prev_macd > prev_macd_signal) & (macd < macd_signal),
+            (prev_close > prev_ma_short) & (close < ma_short),
+            (prev_close > prev_upper) & (close < upper)
+        ]
+    
+    buy_score = np.sum(buy_conditions, axis=0)
+    sell_score = np.sum(sell_conditions, axis=0)
+    
+    return {
+        'buy': buy_score >= params['min_conditions'],
+        'sell': sell_score >= params['min_conditions'],
+        'buy_score': buy_score
+    }
+
+def summarize_backtest(equity, trades, dates, initial_capital, exposure=None):
+    """
+    Özsermaye eğrisi ve işlem listesinden özet metrikleri hesapla
+    
+    Args:
+        equity: Bar başına özsermaye dizisi
+        trades: İşlem listesi
+        dates: Bar tarihleri
+        initial_capital: Başlangıç sermayesi
+        exposure: Bar başına piyasadaki sermaye oranı
+    
+    Returns:
+        dict: Özet metrikler
+    """
+    pnl = np.array([trade['profit_loss'] for trade in trades], dtype=float)
+    returns = np.array([trade['profit_loss_percentage'] for trade in trades], dtype=float)
+    traded_value = sum(trade['shares'] * (trade['entry_price'] + trade['exit_price']) for trade in trades)
+    
+    trade_summary = trade_metrics(pnl, returns)
+    summary = {
+        'initial_capital': initial_capital,
+        'final_equity': float(equity[-1]) if len(equity) else initial_capital,
+        **equity_metrics(
+            equity,
+            dates=dates,
+            exposure=exposure,
+            traded_value=traded_value,
+            initial_capital=initial_capital
+        ),
+        'total_trades': trade_summary['total_trades'],
+        'successful_trades': trade_summary['successful_trades'],
+        'success_rate': trade_summary['success_rate'],
+        'avg_return_percentage': trade_summary['avg_profit_loss_percentage'],
+        'profit_factor': trade_summary['profit_factor'] if len(pnl) else 0
+    }
+    summary['avg_exposure_percentage'] = summary.pop('exposure_percentage')
+    return summary
+
+def run_backtest(panel, signals, params=None):
+    """
+    Portföy simülasyonunu çalıştır
+    
+    Sinyal t. barın kapanışında oluşur, işlem t+1. barın açılışında yapılır.
+    Açık pozisyonlar her barda sırasıyla satım sinyali (açılışta), stop /
+    kısmi kâr / hedef (bar içinde) ve maksimum bekleme (kapanışta) kurallarına
+    göre kapatılır. Tüm kontroller açık pozisyonlar üzerinde vektörel yapılır.
+    
+    Args:
+        panel: build_price_panel çıktısı
+        signals: compute_signal_panel çıktısı
+        params: Portföy parametreleri (None ise varsayılanlar)
+    
+    Returns:
+        dict: 'equity_curve', 'trades' ve 'summary'
+    """
+    params = {**DEFAULT_BACKTEST_PARAMS, **(params or {})}
+    
+    dates = panel['dates']
+    symbols = panel['symbols']
+    opens = panel['open']
+    highs = panel['high']
+    lows = panel['low']
+    closes = panel['close']
+    n_bars = len(dates)
+    n_symbols = len(symbols)
+    
+    initial_capital = float(params['initial_capital'])
+    commission = float(params['commission_rate'])
+    slippage = float(params['slippage_rate'])
+    target_pct = float(params['target_pct'])
+    stop_pct = float(params['stop_pct'])
+    partial_pct = target_pct * float(params['partial_threshold'])
+    partial_fraction = float(params['partial_fraction'])
+    max_holding = int(params['max_holding_bars'])
+    max_positions = int(params['max_positions'])
+    stop_first = params['same_bar_policy'] != 'target_first'
+    
+    # Değerleme için son bilinen kapanış fiyatı
+    marks = pd.DataFrame(closes).ffill().fillna(0).to_numpy()
+    
+    # Sembol başına pozisyon durumu
+    shares = np.zeros(n_symbols)
+    entry_price = np.zeros(n_symbols)
+    entry_cost = np.zeros(n_symbols)  # Komisyon dahil hisse başı maliyet
+    entry_bar = np.full(n_symbols, -1)
+    partial_done = np.zeros(n_symbols, dtype=bool)
+    
+    cash = initial_capital
+    equity = np.full(n_bars, initial_capital)
+    exposure = np.zeros(n_bars)
+    trades = []
+    
+    def close_positions(mask, fill_prices, fraction, reason, bar):
+        """Maskelenen pozisyonların belirtilen oranını kapat ve işlemleri kaydet"""
+        nonlocal cash
+        indexes = np.flatnonzero(mask)
+        if len(indexes) == 0:
+            return
+        
+        sold = shares[indexes] * fraction
+        net_price = fill_prices[indexes] * (1 - commission)
+        cash += float(np.sum(sold * net_price))
+        pnl = sold * (net_price - entry_cost[indexes])
+        returns = (net_price / entry_cost[indexes] - 1) * 100
+        
+        for k, i in enumerate(indexes):
+            trades.append({
+                'symbol': symbols[i],
+                'entry_date': dates[entry_bar[i]],
+                'entry_price': float(entry_price[i]),
+                'exit_date': dates[bar],
+                'exit_price': float(fill_prices[i]),
+                'shares': float(sold[k]),
+                'profit_loss': float(pnl[k]),
+                'profit_loss_percentage': float(returns[k]),
+                'holding_bars': int(bar - entry_bar[i]),
+                'exit_reason': reason
+            })
+        
+        shares[indexes] -= sold
+        closed = indexes[shares[indexes] <= 1e-12]
+        shares[closed] = 0
+        entry_bar[closed] = -1
+        partial_done[closed] = False
+    
+    for t in range(1, n_bars):
+        open_t = opens[t]
+        has_open = ~np.isnan(open_t)
+        
+        # 1. Önceki barın satım sinyali: açılışta çık
+        if params['use_sell_signals']:
+            sell_mask = (shares > 0) & signals['sell'][t - 1] & has_open
+            close_positions(sell_mask, open_t * (1 - slippage), 1.0, 'sell_signal', t)
+        
+        # 2. Önceki barın alım sinyalleri: boş slot varsa açılışta gir
+        held = shares > 0
+        free_slots = max_positions - int(held.sum())
+        if free_slots > 0:
+            candidates = np.flatnonzero(signals['buy'][t - 1] & ~held & has_open)
+            if len(candidates) > 0:
+                # En çok koşulu sağlayan sinyaller önce
+                order = np.argsort(-signals['buy_score'][t - 1][candidates], kind='stable')
+                portfolio_value = cash + float(np.sum(shares * marks[t - 1]))
+                allocation = portfolio_value * float(params['position_size'])
+                for i in candidates[order][:free_slots]:
+                    budget = min(allocation, cash)
+                    fill = open_t[i] * (1 + slippage)
+                    if budget <= 0 or fill <= 0:
+                        break
+                    cost_per_share = fill * (1 + commission)
+                    quantity = budget / cost_per_share
+                    cash -= quantity * cost_per_share
+                    shares[i] = quantity
+                    entry_price[i] = fill
+                    entry_cost[i] = cost_per_share
+                    entry_bar[i] = t
+                    partial_done[i] = False
+        
+        # 3. Bar içi stop / kısmi kâr / hedef kontrolleri
+        held = (shares > 0) & ~np.isnan(highs[t]) & ~np.isnan(lows[t])
+        if held.any():
+            stop_price = entry_price * (1 - stop_pct / 100)
+            target_price = entry_price * (1 + target_pct / 100)
+            partial_price = entry_price * (1 + partial_pct / 100)
+            reference_open = np.where(has_open, open_t, closes[t])
+            
+            with np.errstate(invalid='ignore'):
+                stop_hit = held & (lows[t] <= stop_price)
+                target_hit = held & (highs[t] >= target_price)
+                partial_hit = held & ~partial_done & (highs[t] >= partial_price)
+            
+            full_stop = stop_hit & (~target_hit | stop_first)
+            full_target = target_hit & ~full_stop
+            partial = partial_hit & ~full_stop & (partial_fraction > 0)
+            
+            # Boşluklu açılışlarda dolum açılış fiyatından olur
+            stop_fill = np.minimum(stop_price, reference_open) * (1 - slippage)
+            target_fill = np.maximum(target_price, reference_open) * (1 - slippage)
+            partial_fill = np.maximum(partial_price, reference_open) * (1 - slippage)
+            
+            close_positions(full_stop, stop_fill, 1.0, 'stop_loss', t)
+            close_positions(partial, partial_fill, partial_fraction, 'partial_profit', t)
+            partial_done[partial & (shares > 0)] = True
+            close_positions(full_target, target_fill, 1.0, 'target_profit', t)
+        
+        # 4. Maksimum bekleme süresi: kapanışta çık
+        held = shares > 0
+        expired = held & (t - entry_bar >= max_holding) & ~np.isnan(closes[t])
+        close_positions(expired, closes[t] * (1 - slippage), 1.0, 'max_holding', t)
+        
+        positions_value = float(np.sum(shares * marks[t]))
+        equity[t] = cash + positions_value
+        exposure[t] = positions_value / equity[t] if equity[t] > 0 else 0
+    
+    # Veri sonunda açık kalan pozisyonları son kapanıştan kapat
+    if n_bars > 0:
+        close_positions(shares > 0, marks[-1] * (1 - slippage), 1.0, 'end_of_data', n_bars - 1)
+        equity[-1] = cash
+    
+    summary = summarize_backtest(equity, trades, dates, initial_capital, exposure)
+    
+    return {
+        'equity_curve': [{'date': date, 'equity': float(value)} for date, value in zip(dates, equity)],
+        'trades': trades,
+        'summary': summary
+    }
+
+# Sayısal parametrelerin geçerli aralıkları: (tam sayı mı, alt sınır, alt sınır dahil mi, üst sınır)
+BACKTEST_PARAM_RANGES = {
+    'initial_capital': (False, 0, False, None),
+    'position_size': (False, 0, False, 1),
+    'max_positions': (True, 1, True, None),
+    'commission_rate': (False, 0, True, 1),
+    'slippage_rate': (False, 0, True, 1),
+    'target_pct': (False, 0, False, None),
+    'stop_pct': (False, 0, False, 100),
+    'max_holding_bars': (True, 1, True, None),
+    'partial_threshold': (False, 0, False, None),
+    'partial_fraction': (False, 0, True, 1),
+    'rsi_buy_low': (False, 0, True, 100),
+    'rsi_buy_high': (False, 0, True, 100),
+    'rsi_sell': (False, 0, True, 100),
+    'min_conditions': (True, 1, True, 5)
+}
+
+SAME_BAR_POLICIES = ('stop_first', 'target_first')
+
+def validate_backtest_request(start_date=None, end_date=None, symbols=None, params=None):
+    """
+    Backtest isteğinin tarih, sembol ve strateji parametrelerini doğrula
+    
+    Args:
+        start_date: Başlangıç tarihi (YYYY-MM-DD veya None)
+        end_date: Bitiş tarihi (YYYY-MM-DD veya None)
+        symbols: Sembol listesi veya virgülle ayrılmış metin (None ise tümü)
+        params: Strateji ve portföy parametreleri
+    
+    Returns:
+        tuple: (sembol listesi veya None, normalize edilmiş parametreler)
+    
+    Raises:
+        ValueError: Geçersiz parametre
+    """
+    for name, value in (('start_date', start_date), ('end_date', end_date)):
+        if value is not None:
+            try:
+                datetime.strptime(str(value), '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f"{name} YYYY-MM-DD biçiminde olmalı: {value}")
+    if start_date and end_date and str(start_date) > str(end_date):
+        raise ValueError("start_date, end_date'den sonra olamaz")
+    
+    if isinstance(symbols, str):
+        symbols = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
+    if symbols is not None and (not isinstance(symbols, list) or not all(isinstance(symbol, str) for symbol in symbols)):
+        raise ValueError("symbols sembol listesi olmalı")
+    
+    params = dict(params or {})
+    unknown = sorted(set(params) - set(DEFAULT_BACKTEST_PARAMS))
+    if unknown:
+        raise ValueError(f"Bilinmeyen backtest parametresi: {', '.join(unknown)}")
+    
+    for name, (integer, low, low_inclusive, high) in BACKTEST_PARAM_RANGES.items():
+        if name not in params:
+            continue
+        value = params[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+            raise ValueError(f"{name} sayısal olmalı")
+        if integer and value != int(value):
+            raise ValueError(f"{name} tam sayı olmalı")
+        if value < low or (value == low and not low_inclusive) or (high is not None and value > high):
+            bounds = f"{'[' if low_inclusive else '('}{low}, {high if high is not None else '∞'}{']' if high is not None else ')'}"
+            raise ValueError(f"{name} {bounds} aralığında olmalı: {value}")
+        params[name] = int(value) if integer else float(value)
+    
+    if 'same_bar_policy' in params and params['same_bar_policy'] not in SAME_BAR_POLICIES:
+        raise ValueError(f"same_bar_policy {' veya '.join(SAME_BAR_POLICIES)} olmalı")
+    if 'use_sell_signals' in params and not isinstance(params['use_sell_signals'], bool):
+        raise ValueError("use_sell_signals true/false olmalı")
+    
+    merged = {**DEFAULT_BACKTEST_PARAMS, **params}
+    if merged['rsi_buy_low'] > merged['rsi_buy_high']:
+        raise ValueError("rsi_buy_low, rsi_buy_high'tan büyük olamaz")
+    
+    return symbols, params
+
+class PortfolioBacktester:
+    """Sinyal kurallarını fiyat geçmişi üzerinde portföy olarak test eden sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        PortfolioBacktester sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        logger.info("PortfolioBacktester başlatıldı")
+    
+    def load_price_panel(self, symbols=None, start_date=None, end_date=None):
+        """
+        Fiyat geçmişini tek sorguda (tarih x sembol) paneli olarak yükle
+        
+        Args:
+            symbols: Sembol listesi (None ise tüm semboller)
+            start_date: Başlangıç tarihi (YYYY-MM-DD, None ise en eski)
+            end_date: Bitiş tarihi (YYYY-MM-DD, None ise en yeni)
+        
+        Returns:
+            dict: build_price_panel çıktısı
+        """
+        query = 'SELECT symbol, date, open, high, low, close, volume FROM stock_data WHERE 1 = 1'
+        params = []
+        if symbols:
+            query += f" AND symbol IN ({', '.join('?' for _ in symbols)})"
+            params.extend(symbols)
+        if start_date:
+            query += ' AND date >= ?'
+            params.append(start_date)
+        if end_date:
+            query += ' AND date <= ?'
+            params.append(end_date)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            prices = pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+        
+        return build_price_panel(prices)
+    
+    def run(self, start_date=None, end_date=None, symbols=None, params=None):
+        """
+        Veritabanındaki geçmiş üzerinde portföy backtesti çalıştır
+        
+        Args:
+            start_date: Başlangıç tarihi (None ise en eski)
+            end_date: Bitiş tarihi (None ise en yeni)
+            symbols: Sembol listesi (None ise tüm semboller)
+            params: Strateji ve portföy parametreleri
+        
+        Returns:
+            dict: Backtest sonuçları
+        
+        Raises:
+            ValueError: Geçersiz tarih, sembol veya parametre
+        """
+        symbols, params = validate_backtest_request(start_date, end_date, symbols, params)
+        
+        started = datetime.now()
+        panel = self.load_price_panel(symbols, start_date, end_date)
+        
+        if len(panel['dates']) < 2:
+            return {
+                'success': False,
+                'message': 'Backtest için yeterli fiyat verisi bulunamadı'
+            }
+        
+        indicators = compute_indicator_panel(panel)
+        signals = compute_signal_panel(panel, indicators, params)
+        result = run_backtest(panel, signals, params)
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        logger.info(f"Backtest tamamlandı: {len(panel['symbols'])} hisse, {len(panel['dates'])} bar, {len(result['trades'])} işlem ({elapsed:.2f} sn)")
+        
+        return {
+            'success': True,
+            'start_date': panel['dates'][0],
+            'end_date': panel['dates'][-1],
+            'symbol_count': len(panel['symbols']),
+            'bar_count': len(panel['dates']),
+            'params': {**DEFAULT_BACKTEST_PARAMS, **(params or {})},
+            'summary': result['summary'],
+            'equity_curve': result['equity_curve'],
+            'trades': result['trades'],
+            'elapsed_seconds': elapsed
+        }
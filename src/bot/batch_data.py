@@ -0,0 +1,247 @@
+"""
+BIST30 Alım-Satım Bot - Çoklu Sembol (Batch) Veri Modülü
+
+Gösterge panelinin hisse başına ayrı ayrı çağırdığı fiyat, teknik gösterge
+ve sinyal uç noktalarının çoklu sembol karşılıklarını besler. İstenen tüm
+sembollerin son N satırı tek pencere (ROW_NUMBER) sorgusuyla okunur ve
+(bar x sembol) paneline dönüştürülür; göstergeler backtester'daki vektörel
+panel formülleriyle tek seferde hesaplanır.
+
+Panel tarihe göre değil, her sembolün kendi bar sırasına göre hizalanır ve
+her sembolün en eski barı ilk satırdadır: bu sayede eksik haftası veya kısa
+geçmişi olan bir sembolün göstergeleri diğer sembollerin tarihleri ya da
+boş satırlar yüzünden bozulmaz ve sonuçlar tek sembollük uç noktalarla
+aynı olur.
+
+Yanıtlar sütunsal (columnar) biçimdedir: her sembol için sütun adı -> değer
+listesi (eskiden yeniye). Bu, satır listesine göre hem daha küçük hem de
+grafik kütüphanelerine doğrudan verilebilir.
+"""
+
+import logging
+import sqlite3
+import pandas as pd
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.backtester import PRICE_COLUMNS, compute_indicator_panel
+from src.bot.signal_generator import SignalGenerator
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('BatchDataReader')
+
+INDICATOR_COLUMNS = [
+    'ma_short', 'ma_long', 'rsi', 'macd', 'macd_signal',
+    'bollinger_upper', 'bollinger_middle', 'bollinger_lower'
+]
+
+# Tek sembollük uç noktalarla aynı pencereler
+TECHNICAL_LOOKBACK = 52  # TechnicalAnalyzer.get_stock_data varsayılanı
+SIGNAL_WINDOW = 10       # SignalGenerator.generate_signals'ın kullandığı son satır sayısı
+
+def resolve_symbols(symbols=None, universe=None):
+    """
+    symbols= veya universe= parametresini sembol listesine çevir
+    
+    Args:
+        symbols: Virgülle ayrılmış semboller (ör. 'AKBNK,GARAN')
+        universe: SYMBOL_UNIVERSES içindeki evren adı (ör. 'bist30')
+    
+    Returns:
+        list: Tekrarsız, büyük harfli semboller (istek sırasıyla)
+    """
+    if symbols:
+        requested = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
+    elif universe:
+        if universe.lower() not in SYMBOL_UNIVERSES:
+            raise ValueError(f"Bilinmeyen sembol evreni: {universe} (geçerli: {', '.join(SYMBOL_UNIVERSES)})")
+        requested = list(SYMBOL_UNIVERSES[universe.lower()])
+    else:
+        raise ValueError("symbols= veya universe= parametresi gerekli")
+    
+    resolved = list(dict.fromkeys(requested))
+    if not resolved:
+        raise ValueError("En az bir sembol gerekli")
+    if len(resolved) > BATCH_MAX_SYMBOLS:
+        raise ValueError(f"Tek istekte en fazla {BATCH_MAX_SYMBOLS} sembol istenebilir")
+    return resolved
+
+def _to_list(values, integer=False):
+    """Numpy dizisini NaN'ları None olan JSON uyumlu listeye çevir"""
+    if integer:
+        return [None if pd.isna(value) else int(value) for value in values]
+    return [None if pd.isna(value) else float(value) for value in values]
+
+class BatchDataReader:
+    """Birden çok sembolün verisini tek sorguda okuyup sütunsal biçimde döndüren sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH, signal_generator=None):
+        """
+        BatchDataReader sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            signal_generator: Sinyal kurallarını sağlayan SignalGenerator (None ise oluşturulur)
+        """
+        self.db_path = db_path
+        self.signal_generator = signal_generator or SignalGenerator(db_path)
+        logger.info("BatchDataReader başlatıldı")
+    
+    def read_latest(self, symbols, limit):
+        """
+        Her sembolün son limit satırını tek sorguda oku
+        
+        Args:
+            symbols: Sembol listesi
+            limit: Sembol başına satır sayısı
+        
+        Returns:
+            pandas.DataFrame: symbol, date, fiyat sütunları ve bar_index (1 = en yeni)
+        """
+        query = f'''
+        SELECT symbol, date, open, high, low, close, volume, bar_index FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS bar_index
+            FROM stock_data
+            WHERE symbol IN ({', '.join('?' for _ in symbols)})
+        )
+        WHERE bar_index <= ?
+        '''
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return pd.read_sql_query(query, conn, params=[*symbols, limit])
+        finally:
+            conn.close()
+    
+    def load_bar_panel(self, symbols, limit):
+        """
+        Son limit barı (bar x sembol) paneli olarak yükle
+        
+        Satırlar eskiden yeniye sıralıdır ve her sembolün en eski barı ilk
+        satırdadır; az verisi olan sembollerin sondaki satırları boştur.
+        
+        Args:
+            symbols: Sembol listesi
+            limit: Sembol başına bar sayısı
+        
+        Returns:
+            dict: 'symbols', 'missing', 'counts', 'date' ve her fiyat sütunu için 2B numpy dizisi
+        """
+        prices = self.read_latest(symbols, limit)
+        found = [symbol for symbol in symbols if symbol in set(prices['symbol'])]
+        counts = prices.groupby('symbol')['bar_index'].transform('max')
+        panel = {
+            'symbols': found,
+            'missing': [symbol for symbol in symbols if symbol not in found],
+            'counts': prices.groupby('symbol').size().reindex(found).to_numpy(dtype=int)
+        }
+        
+        # bar_index en yeni bar için 1 olduğundan her sembolün en eski barı 0. satıra gelir
+        prices['position'] = counts - prices['bar_index']
+        rows = range(int(counts.max()) if not prices.empty else 0)
+        for column in ['date', *PRICE_COLUMNS]:
+            wide = prices.pivot(index='position', columns='symbol', values=column).reindex(index=rows, columns=found)
+            panel[column] = wide.to_numpy(dtype=object if column == 'date' else float)
+        return panel
+    
+    def _symbol_columns(self, panel, index, columns, row_count=None):
+        """Panelin tek sembol sütununu sütunsal sözlüğe çevir"""
+        count = panel['counts'][index]
+        start = 0 if row_count is None else max(count - row_count, 0)
+        payload = {'date': list(panel['date'][start:count, index])}
+        for column in columns:
+            payload[column] = _to_list(panel[column][start:count, index], integer=column == 'volume')
+        return payload
+    
+    def get_stock_data(self, symbols, limit=10):
+        """
+        Sembollerin son fiyat verilerini sütunsal olarak getir
+        
+        Args:
+            symbols: Sembol listesi
+            limit: Sembol başına satır sayısı
+        
+        Returns:
+            dict: 'columns', 'symbols', 'missing' ve sembol -> sütun -> değerler içeren 'data'
+        """
+        panel = self.load_bar_panel(symbols, limit)
+        return {
+            'columns': ['date', *PRICE_COLUMNS],
+            'symbols': panel['symbols'],
+            'missing': panel['missing'],
+            'data': {
+                symbol: self._symbol_columns(panel, index, PRICE_COLUMNS)
+                for index, symbol in enumerate(panel['symbols'])
+            }
+        }
+    
+    def get_technical_data(self, symbols, limit=TECHNICAL_LOOKBACK):
+        """
+        Sembollerin teknik göstergelerini tek panel hesabıyla sütunsal olarak getir
+        
+        Args:
+            symbols: Sembol listesi
+            limit: Sembol başına döndürülecek son bar sayısı
+        
+        Returns:
+            dict: 'columns', 'symbols', 'missing' ve sembol -> sütun -> değerler içeren 'data'
+        """
+        # Göstergeler en az tek sembollük uç noktanın penceresi üzerinde hesaplanır;
+        # küçük limit yalnızca döndürülen satırları kısaltır
+        panel = self.load_bar_panel(symbols, max(limit, TECHNICAL_LOOKBACK))
+        panel.update(compute_indicator_panel(panel))
+        columns = [*PRICE_COLUMNS, *INDICATOR_COLUMNS]
+        return {
+            'columns': ['date', *columns],
+            'symbols': panel['symbols'],
+            'missing': panel['missing'],
+            'data': {
+                symbol: self._symbol_columns(panel, index, columns, limit)
+                for index, symbol in enumerate(panel['symbols'])
+            }
+        }
+    
+    def get_signals(self, symbols):
+        """
+        Sembollerin güncel alım/satım sinyallerini sütunsal olarak getir
+        
+        Göstergeler panel üzerinde hesaplanır; kurallar ve gerekçe metinleri
+        SignalGenerator'daki kontrollerle aynıdır.
+        
+        Args:
+            symbols: Sembol listesi
+        
+        Returns:
+            dict: 'columns', 'missing' ve sütun -> sembol sırasıyla değerler içeren 'data'
+        """
+        panel = self.load_bar_panel(symbols, TECHNICAL_LOOKBACK)
+        panel.update(compute_indicator_panel(panel))
+        columns = ['symbol', 'buy_signal', 'sell_signal', 'buy_reason', 'sell_reason', 'current_price', 'last_date']
+        data = {column: [] for column in columns}
+        
+        for index, symbol in enumerate(panel['symbols']):
+            frame = pd.DataFrame(self._symbol_columns(panel, index, [*PRICE_COLUMNS, *INDICATOR_COLUMNS], SIGNAL_WINDOW))
+            frame = frame.astype({column: float for column in INDICATOR_COLUMNS})
+            buy_signal, buy_reason = self.signal_generator.check_buy_signals(frame)
+            sell_signal, sell_reason = self.signal_generator.check_sell_signals(frame)
+            
+            data['symbol'].append(symbol)
+            data['buy_signal'].append(bool(buy_signal))
+            data['sell_signal'].append(bool(sell_signal))
+            data['buy_reason'].append(buy_reason)
+            data['sell_reason'].append(sell_reason)
+            data['current_price'].append(frame['close'].iloc[-1])
+            data['last_date'].append(frame['date'].iloc[-1])
+        
+        return {
+            'columns': columns,
+            'missing': panel['missing'],
+            'data': data
+        }
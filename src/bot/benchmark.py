@@ -0,0 +1,246 @@
+"""
+BIST30 Alım-Satım Bot - Endeks Karşılaştırma Modülü
+
+XU030 (ve isteğe bağlı XU100) endeks serilerini benchmark_data tablosunda
+saklar. Her kayıtla birlikte logaritmik getiri ve kümülatif logaritmik getiri
+önceden hesaplanır; böylece herhangi bir pencerenin endeks getirisi iki
+indeksli satır okumasıyla bulunur. Strateji özsermaye eğrisi endeks barlarına
+hizalanarak alfa, beta ve takip hatası hesaplanır.
+"""
+
+import logging
+import sqlite3
+import numpy as np
+import pandas as pd
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.data_version import get_data_version
+from src.bot.risk_metrics import periods_per_year, relative_metrics
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('BenchmarkSeries')
+
+def ensure_benchmark_schema(conn):
+    """
+    Endeks serileri tablosunu oluştur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS benchmark_data (
+        index_symbol TEXT,
+        date TEXT,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume INTEGER,
+        log_return REAL,
+        cum_log_return REAL,
+        PRIMARY KEY (index_symbol, date)
+    )
+    ''')
+
+class BenchmarkSeries:
+    """Endeks serilerini saklayan ve strateji ile karşılaştıran sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        BenchmarkSeries sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        self._return_cache = {}
+        conn = sqlite3.connect(self.db_path)
+        try:
+            ensure_benchmark_schema(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("BenchmarkSeries başlatıldı")
+    
+    def save_series(self, index_symbol, data):
+        """
+        Yeni veya değişen endeks barlarını kaydet ve getirileri o bardan itibaren güncelle
+        
+        Args:
+            index_symbol: Endeks sembolü (örn. XU030)
+            data: DataFetcher.fetch_stock_data formatında pandas.DataFrame
+        
+        Returns:
+            bool: İşlem başarılı ise True, değilse False
+        """
+        if data is None or data.empty:
+            logger.warning(f"{index_symbol} için kaydedilecek veri yok")
+            return False
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = pd.DataFrame({
+                'date': pd.to_datetime(data['date']).dt.strftime('%Y-%m-%d').to_numpy(),
+                'open': data['open'].astype(float).to_numpy(),
+                'high': data['high'].astype(float).to_numpy(),
+                'low': data['low'].astype(float).to_numpy(),
+                'close': data['close'].astype(float).to_numpy(),
+                'volume': data['volume'].fillna(0).astype('int64').to_numpy() if 'volume' in data else np.zeros(len(data), dtype='int64')
+            })
+            
+            # Yalnızca yeni veya değişen barları yaz (değişmeyen barlar veri versiyonunu artırmaz)
+            existing = pd.read_sql_query(
+                'SELECT date, open, high, low, close, volume FROM benchmark_data WHERE index_symbol = ? AND date >= ? AND date <= ?',
+                conn,
+                params=(index_symbol, rows['date'].min(), rows['date'].max())
+            )
+            merged = rows.merge(existing, on='date', how='left', suffixes=('', '_existing'))
+            changed = merged['close_existing'].isna().to_numpy().copy()
+            for column in ['open', 'high', 'low', 'close', 'volume']:
+                changed |= ~np.isclose(merged[column].astype(float), merged[f'{column}_existing'].astype(float), rtol=1e-9, atol=0)
+            changed_rows = rows[changed]
+            
+            if changed_rows.empty:
+                logger.info(f"{index_symbol} için {len(data)} satır endeks verisinin hiçbiri değişmemiş")
+                return True
+            
+            conn.executemany('''
+            INSERT OR REPLACE INTO benchmark_data
+            (index_symbol, date, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                (index_symbol, row.date, row.open, row.high, row.low, row.close, int(row.volume))
+                for row in changed_rows.itertuples(index=False)
+            ))
+            
+            # Getiriler yalnızca ilk değişen bardan itibaren yeniden hesaplanır;
+            # önceki barın kapanışı ve kümülatif getirisi başlangıç noktasıdır
+            first_changed = changed_rows['date'].min()
+            previous = conn.execute('''
+            SELECT close, cum_log_return FROM benchmark_data
+            WHERE index_symbol = ? AND date < ?
+            ORDER BY date DESC LIMIT 1
+            ''', (index_symbol, first_changed)).fetchone()
+            series = pd.read_sql_query(
+                'SELECT date, close FROM benchmark_data WHERE index_symbol = ? AND date >= ? ORDER BY date',
+                conn,
+                params=(index_symbol, first_changed)
+            )
+            closes = series['close'].to_numpy()
+            if previous is None:
+                log_returns = np.diff(np.log(closes), prepend=np.nan)
+                log_returns[0] = 0.0
+                cumulative = np.cumsum(log_returns)
+            else:
+                log_returns = np.diff(np.log(closes), prepend=np.log(previous[0]))
+                cumulative = previous[1] + np.cumsum(log_returns)
+            
+            conn.executemany('''
+            UPDATE benchmark_data SET log_return = ?, cum_log_return = ?
+            WHERE index_symbol = ? AND date = ?
+            ''', zip(log_returns.tolist(), cumulative.tolist(), [index_symbol] * len(series), series['date']))
+            
+            conn.commit()
+            logger.info(f"{index_symbol} için {len(data)} satır endeks verisinden {len(changed_rows)} tanesi yeni/değişmiş olarak kaydedildi")
+            return True
+        except Exception as e:
+            logger.error(f"{index_symbol} için endeks verisi kaydetme hatası: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def get_window_return(self, index_symbol, start_date, end_date):
+        """
+        Endeksin [start_date, end_date] penceresindeki getirisini hesapla
+        
+        Kümülatif logaritmik getiriden iki satır okunarak hesaplanır ve
+        veri versiyonuna göre önbelleklenir.
+        
+        Args:
+            index_symbol: Endeks sembolü
+            start_date: Pencere başlangıcı (YYYY-MM-DD)
+            end_date: Pencere bitişi (YYYY-MM-DD)
+        
+        Returns:
+            float: Yüzde getiri (pencerede veri yoksa None)
+        """
+        cache_key = (index_symbol, start_date, end_date, get_data_version(self.db_path))
+        if cache_key in self._return_cache:
+            return self._return_cache[cache_key]
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # Pencere öncesi kümülatif getiri = ilk bardaki kümülatif - o barın getirisi
+            start = conn.execute('''
+            SELECT cum_log_return - log_return FROM benchmark_data
+            WHERE index_symbol = ? AND date >= ? AND date <= ?
+            ORDER BY date ASC LIMIT 1
+            ''', (index_symbol, start_date, end_date)).fetchone()
+            end = conn.execute('''
+            SELECT cum_log_return FROM benchmark_data
+            WHERE index_symbol = ? AND date >= ? AND date <= ?
+            ORDER BY date DESC LIMIT 1
+            ''', (index_symbol, start_date, end_date)).fetchone()
+        finally:
+            conn.close()
+        
+        result = None
+        if start is not None and end is not None and start[0] is not None and end[0] is not None:
+            result = float(np.expm1(end[0] - start[0])) * 100
+        
+        # Eski versiyonlara ait kayıtları at
+        self._return_cache = {
+            key: value for key, value in self._return_cache.items()
+            if key[3] == cache_key[3]
+        }
+        self._return_cache[cache_key] = result
+        return result
+    
+    def get_relative_performance(self, equity_curve, index_symbol=BENCHMARK_INDEX):
+        """
+        Strateji özsermaye eğrisini endeks barlarına hizalayıp alfa/beta hesapla
+        
+        Args:
+            equity_curve: [{'date', 'equity'}] listesi
+            index_symbol: Karşılaştırılacak endeks
+        
+        Returns:
+            dict: Endeks adı ve relative_metrics çıktısı
+        """
+        if not equity_curve:
+            return {'index': index_symbol, **relative_metrics([], [])}
+        
+        curve_dates = np.array([point['date'] for point in equity_curve], dtype='datetime64[D]')
+        equity = np.array([point['equity'] for point in equity_curve], dtype=float)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            bars = pd.read_sql_query('''
+            SELECT date, cum_log_return FROM benchmark_data
+            WHERE index_symbol = ? AND date >= ? AND date <= ?
+            ORDER BY date
+            ''', conn, params=(index_symbol, str(curve_dates[0]), str(curve_dates[-1])))
+        finally:
+            conn.close()
+        
+        bar_dates = bars['date'].to_numpy(dtype='datetime64[D]')
+        
+        # Her endeks barında stratejinin son bilinen özsermayesi
+        positions = np.searchsorted(curve_dates, bar_dates, side='right') - 1
+        strategy_equity = equity[positions]
+        
+        strategy_returns = strategy_equity[1:] / strategy_equity[:-1] - 1
+        benchmark_returns = np.expm1(np.diff(bars['cum_log_return'].to_numpy(dtype=float)))
+        
+        return {
+            'index': index_symbol,
+            **relative_metrics(strategy_returns, benchmark_returns, periods_per_year(bars['date']))
+        }
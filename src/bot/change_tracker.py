@@ -0,0 +1,168 @@
+"""
+BIST30 Alım-Satım Bot - Değişiklik Takip Modülü
+"""
+
+import os
+import logging
+import hashlib
+import sqlite3
+from datetime import datetime
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('ChangeTracker')
+
+# Pipeline aşamaları
+STAGE_FETCH = 'fetch'
+STAGE_ANALYZE = 'analyze'
+STAGE_SIGNALS = 'signals'
+
+class ChangeTracker:
+    """Pipeline aşamaları için sembol bazlı veri parmak izlerini tutan sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH, bars=FINGERPRINT_BARS):
+        """
+        ChangeTracker sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            bars: Parmak izine dahil edilecek son bar sayısı
+        """
+        self.db_path = db_path
+        self.bars = bars
+        self._ensure_table_exists()
+    
+    def _ensure_table_exists(self):
+        """Parmak izi tablosunu oluştur"""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS data_fingerprints (
+                symbol TEXT,
+                stage TEXT,
+                last_date TEXT,
+                fingerprint TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (symbol, stage)
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def compute_fingerprint(self, symbol, include_indicators=False):
+        """
+        Sembolün son K barından parmak izi hesapla
+        
+        Args:
+            symbol: Hisse sembolü
+            include_indicators: Teknik göstergeler de parmak izine dahil edilsin mi
+            
+        Returns:
+            tuple: (son_tarih, parmak_izi), veri yoksa (None, None)
+        """
+        if include_indicators:
+            query = '''
+            SELECT s.date, s.open, s.high, s.low, s.close, s.volume,
+                   t.ma_short, t.ma_long, t.rsi, t.macd, t.macd_signal,
+                   t.bollinger_upper, t.bollinger_middle, t.bollinger_lower
+            FROM stock_data s
+            LEFT JOIN technical_indicators t ON s.symbol = t.symbol AND s.date = t.date
+            WHERE s.symbol = ?
+            ORDER BY s.date DESC
+            LIMIT ?
+            '''
+        else:
+            query = '''
+            SELECT date, open, high, low, close, volume
+            FROM stock_data
+            WHERE symbol = ?
+            ORDER BY date DESC
+            LIMIT ?
+            '''
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(query, (symbol, self.bars)).fetchall()
+        finally:
+            conn.close()
+        
+        if not rows:
+            return None, None
+        
+        digest = hashlib.sha1(repr(rows).encode('utf-8')).hexdigest()
+        return rows[0][0], digest
+    
+    def get_fingerprint(self, symbol, stage):
+        """
+        Aşamanın en son işlediği parmak izini getir
+        
+        Args:
+            symbol: Hisse sembolü
+            stage: Pipeline aşaması
+            
+        Returns:
+            tuple: (son_tarih, parmak_izi), kayıt yoksa (None, None)
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute('''
+            SELECT last_date, fingerprint FROM data_fingerprints
+            WHERE symbol = ? AND stage = ?
+            ''', (symbol, stage)).fetchone()
+        finally:
+            conn.close()
+        
+        return row if row else (None, None)
+    
+    def save_fingerprint(self, symbol, stage, last_date, fingerprint):
+        """
+        Aşamanın işlediği parmak izini kaydet
+        
+        Args:
+            symbol: Hisse sembolü
+            stage: Pipeline aşaması
+            last_date: İşlenen son bar tarihi
+            fingerprint: İşlenen verinin parmak izi
+        """
+        if fingerprint is None:
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+            INSERT OR REPLACE INTO data_fingerprints
+            (symbol, stage, last_date, fingerprint, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (symbol, stage, last_date, fingerprint, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def check_changed(self, symbol, stage, include_indicators=False):
+        """
+        Aşamanın girdisinin son işlemeden bu yana değişip değişmediğini kontrol et
+        
+        Args:
+            symbol: Hisse sembolü
+            stage: Pipeline aşaması
+            include_indicators: Teknik göstergeler de girdiye dahil mi
+            
+        Returns:
+            tuple: (değişti_mi, son_tarih, parmak_izi)
+        """
+        last_date, fingerprint = self.compute_fingerprint(symbol, include_indicators)
+        _, stored_fingerprint = self.get_fingerprint(symbol, stage)
+        
+        changed = fingerprint is None or fingerprint != stored_fingerprint
+        return changed, last_date, fingerprint
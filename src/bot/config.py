@@ -8,6 +8,44 @@ import os
 # Environment variables'dan oku, yoksa default değerler kullan
 TELEGRAM_TOKEN = os.environ.get('TELEGRAM_TOKEN', 'YOUR_TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID', 'YOUR_CHAT_ID')
+# Bot API adresi; yük testlerinde yerel sahte sunucuya (benchmarks/fake_telegram.py) yönlendirilebilir
+TELEGRAM_API_BASE_URL = os.environ.get('TELEGRAM_API_BASE_URL', 'https://api.telegram.org/bot')
+TELEGRAM_CONNECTION_POOL_SIZE = 8  # Kalıcı HTTP bağlantı havuzu (aynı anda gönderilebilecek mesaj sayısı)
+TELEGRAM_SEND_TIMEOUT = 30         # Senkron gönderimlerde beklenecek en uzun süre (saniye)
+TELEGRAM_GLOBAL_RATE = 30.0        # Bot genelinde saniyede gönderilebilecek mesaj (Telegram sınırı ~30/sn)
+TELEGRAM_CHAT_RATE = 1.0           # Aynı sohbete saniyede gönderilecek mesaj (Telegram sınırı ~1/sn)
+TELEGRAM_CHAT_BURST = 3            # Aynı sohbete beklemeden art arda gönderilebilecek mesaj
+TELEGRAM_MAX_ATTEMPTS = 5          # Bir mesaj için en fazla gönderim denemesi (429 ve ağ hataları dahil)
+TELEGRAM_MESSAGE_LIMIT = 4096      # Telegram mesajı başına en fazla karakter
+
+# Bildirim Outbox Ayarları
+OUTBOX_BATCH_SIZE = 200            # Dağıtıcının tek seferde aldığı bildirim sayısı
+OUTBOX_POLL_INTERVAL = 5           # Yeni bildirim kontrolü aralığı (saniye)
+OUTBOX_MAX_ATTEMPTS = 8            # Bir bildirim için en fazla gönderim turu
+OUTBOX_RETRY_BASE_SECONDS = 30     # Başarısız gönderim sonrası ilk bekleme (her denemede iki katına çıkar)
+OUTBOX_CLAIM_TIMEOUT = 600         # Gönderimde kalan (çöken süreç) kayıtların yeniden denenme süresi (saniye)
+OUTBOX_SEND_TIMEOUT = 300          # Bir grubun gönderimi için en fazla bekleme (OUTBOX_CLAIM_TIMEOUT'tan kısa olmalı)
+OUTBOX_CLAIM_RENEW_INTERVAL = 60   # Gönderim sürerken sahiplenme zamanının yenilenme aralığı (saniye)
+OUTBOX_MAX_AGE_HOURS = 72          # Bu süreden eski gönderilmemiş bildirimler gönderilmez
+
+# Arka Plan İş Ayarları
+JOB_WORKERS = 2                    # Süreç başına aynı anda çalışan arka plan işi (uzun walk-forward haftalık analizi bekletmez)
+JOB_HEARTBEAT_TIMEOUT = 1800       # Bu süre ilerleme bildirmeyen aktif iş terk edilmiş sayılır (saniye)
+JOB_RETENTION_DAYS = 30            # Tamamlanan işlerin saklanma süresi
+
+# Zamanlayıcı Ayarları (uygulama içi, borsa takvimine göre)
+SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'True').lower() == 'true'
+SCHEDULER_TICK_SECONDS = 30        # Zamanlamaların kontrol aralığı
+SCHEDULER_LEASE_TTL = 120          # Lider kilidinin (lease) yenilenmezse düşeceği süre (saniye)
+SCHEDULER_MISFIRE_GRACE = 900      # Kaçırılan (ör. yeniden başlatma sırasında) çalıştırmanın geç yapılabileceği süre (saniye)
+# Her zamanlama bir arka plan işi (jobs.py) çalıştırır:
+#   time: Borsa günlerinde HH:MM (MARKET_TIMEZONE), every: seans içinde her N dakikada bir
+#   weekdays: Yalnızca bu günlerde (0 = Pazartesi), trading_days_only: tatil ve hafta sonu atlanır
+SCHEDULES = [
+    {'name': 'midday-analysis', 'job': 'weekly-analysis', 'time': '13:00'},
+    {'name': 'close-analysis', 'job': 'weekly-analysis', 'time': '18:15'},
+    {'name': 'weekly-report', 'job': 'report', 'time': '18:45', 'weekdays': [4]},
+]
 
 # Yahoo Finance API Ayarları
 YAHOO_FINANCE_REGION = "IS"  # Türkiye borsası için
@@ -22,6 +60,7 @@ STOP_LOSS_PERCENTAGE = 3.0      # Stop-loss yüzdesi
 MAX_HOLDING_WEEKS = 4           # Maksimum bekleme süresi (hafta)
 PARTIAL_PROFIT_THRESHOLD = 0.8   # Kısmi kâr alma eşiği (hedefin %80'i)
 PARTIAL_PROFIT_PERCENTAGE = 0.5  # Kısmi kâr alma yüzdesi (pozisyonun %50'si)
+SAME_BAR_EXIT_POLICY = "stop_first"  # Hedef ve stop aynı barda görülürse: "stop_first" (temkinli) veya "target_first"
 
 # Teknik Gösterge Parametreleri
 MA_SHORT = 5   # Kısa vadeli hareketli ortalama periyodu
@@ -35,6 +74,66 @@ MACD_SIGNAL = 9  # MACD sinyal periyodu
 BOLLINGER_PERIOD = 20  # Bollinger bantları periyodu
 BOLLINGER_STD = 2  # Bollinger bantları standart sapma çarpanı
 
+# Strateji versiyonu: sinyal kuralları veya çıkış mantığı değiştiğinde artırılmalı
+# (önbelleklenmiş sonuçlar bu versiyona göre ayrışır)
+STRATEGY_VERSION = "1"
+
+# Backtest Ayarları
+BACKTEST_INITIAL_CAPITAL = 100000.0  # Başlangıç sermayesi (TL)
+BACKTEST_POSITION_SIZE = 0.10        # Her pozisyona ayrılacak özsermaye oranı
+BACKTEST_MAX_POSITIONS = 10          # Aynı anda açık tutulabilecek maksimum pozisyon
+BACKTEST_COMMISSION_RATE = 0.002     # Alış ve satışta uygulanan komisyon oranı (binde 2)
+BACKTEST_SLIPPAGE_RATE = 0.001       # Fiyat kayması oranı (binde 1)
+# Maksimum bekleme süresi bar cinsinden (haftalık veride 1 bar = 1 hafta)
+BACKTEST_MAX_HOLDING_BARS = MAX_HOLDING_WEEKS if DATA_FETCH_INTERVAL == "1wk" else MAX_HOLDING_WEEKS * 5
+
+# Walk-Forward Doğrulama Ayarları
+WALK_FORWARD_TRAIN_BARS = 104   # Eğitim penceresi uzunluğu (bar, haftalık veride 2 yıl)
+WALK_FORWARD_TEST_BARS = 26     # Test penceresi uzunluğu (bar, haftalık veride 6 ay)
+WALK_FORWARD_WORKERS = None     # Paralel süreç sayısı (None ise CPU çekirdek sayısı)
+WALK_FORWARD_OBJECTIVE = "total_return_percentage"  # Eğitimde maksimize edilecek metrik
+WALK_FORWARD_MAX_COMBINATIONS = 500  # Bir istekte denenebilecek en fazla parametre kombinasyonu
+WALK_FORWARD_PARAM_GRID = {
+    'target_pct': [3.0, 5.0, 8.0],
+    'stop_pct': [2.0, 3.0, 5.0],
+    'min_conditions': [2, 3]
+}
+
+# Monte Carlo Ayarları
+MONTE_CARLO_SIMULATIONS = 20000  # Bootstrap tekrar sayısı
+MONTE_CARLO_BLOCK_SIZE = 5       # Blok bootstrap blok uzunluğu (işlem sayısı)
+MONTE_CARLO_CONFIDENCE = 0.95    # Güven aralığı seviyesi
+MONTE_CARLO_MAX_SIMULATIONS = 100000  # Bir istekte izin verilen en fazla bootstrap tekrarı
+
+# Risk Metrikleri Ayarları
+RISK_FREE_RATE = 0.0  # Sharpe/Sortino için yıllık risksiz faiz oranı
+
+# Endeks Karşılaştırma Ayarları
+BENCHMARK_INDICES = ["XU030", "XU100"]  # Yahoo Finance'ten çekilecek endeksler (XU030.IS, XU100.IS)
+BENCHMARK_INDEX = "XU030"               # Alfa/beta hesabında kullanılacak ana endeks
+BENCHMARK_LOOKBACK_BARS = 52            # Alfa/beta için geriye bakılan bar sayısı (haftalık veride 1 yıl)
+
+# Sonuç Önbelleği Ayarları
+RESULT_CACHE_MAX_ENTRIES = 256  # Bellekte tutulacak maksimum rapor/performans sonucu
+
+# HTTP Yanıt Önbelleği Ayarları (ETag / 304)
+RESPONSE_CACHE_MAX_ENTRIES = 512  # Bellekte tutulacak maksimum serileştirilmiş yanıt
+RESPONSE_CACHE_MAX_AGE = 0        # Tarayıcının yeniden doğrulamadan kullanma süresi (0: her istekte 304 kontrolü)
+
+# Çoklu Sembol (Batch) Uç Noktası Ayarları
+BATCH_MAX_SYMBOLS = 100  # Tek istekte istenebilecek maksimum sembol sayısı
+BATCH_MAX_LIMIT = 520    # Sembol başına döndürülebilecek maksimum satır (10 yıllık haftalık veri)
+
+# Toplu Dışa Aktarma (Export) Ayarları
+EXPORT_BATCH_SIZE = 5000  # Her sayfada okunup gönderilen satır sayısı (bellek kullanımını sınırlar)
+EXPORT_GZIP_LEVEL = 6     # Anlık gzip sıkıştırma seviyesi (1: hızlı, 9: en küçük)
+
+# HTML Rapor Ayarları
+REPORT_HEATMAP_CLIP_PERCENTAGE = 5.0  # Isı haritasında renk skalasının doygunlaştığı yüzde değişim
+
+# Değişiklik Takibi Ayarları
+FINGERPRINT_BARS = 5  # Veri parmak izine dahil edilecek son bar sayısı
+
 # Veritabanı Ayarları
 # Render.com için kalıcı disk yolu, yerel ortamda yerel klasör
 if os.path.exists("/app/data"):
@@ -55,6 +154,9 @@ DATABASE_PATH = os.path.join(BASE_DATA_PATH, DATABASE_NAME)
 LOG_FILE_PATH = None # Dosyaya loglama yapmayacağız
 
 REPORT_TEMPLATE_PATH = "templates/report_template.html"
+REPORT_OUTPUT_DIR = os.path.join(BASE_DATA_PATH, "reports")  # Önceden üretilmiş HTML raporlar (/reports/<ad> ile sunulur)
+REPORT_KEEP_COUNT = 12              # Diskte tutulacak en son rapor dosyası sayısı
+REPORT_CACHE_MAX_AGE = 31536000     # İçerik özetli rapor dosyaları için tarayıcı önbellek süresi (1 yıl)
 
 # Gerekli klasörleri oluştur (eğer yoksa)
 # Log klasörü oluşturmaya gerek yok, konsola loglayacağız.
@@ -70,22 +172,68 @@ BIST30_SYMBOLS = [
     "TUPRS", "ULKER", "YKBNK", "PGSUS", "ASTOR"
 ]
 
+# Batch uç noktalarında universe= ile istenebilecek sembol evrenleri
+SYMBOL_UNIVERSES = {
+    "bist30": BIST30_SYMBOLS
+}
+
+# BIST30 hisselerinin sektörleri (rapordaki ısı haritası için)
+SECTOR_MAP = {
+    "AKBNK": "Bankacılık", "GARAN": "Bankacılık", "ISCTR": "Bankacılık", "YKBNK": "Bankacılık",
+    "KCHOL": "Holding", "SAHOL": "Holding", "ENKAI": "Holding",
+    "EREGL": "Metal", "KRDMD": "Metal", "KOZAL": "Metal",
+    "FROTO": "Otomotiv", "TOASO": "Otomotiv",
+    "THYAO": "Ulaştırma", "PGSUS": "Ulaştırma", "TAVHL": "Ulaştırma",
+    "BIMAS": "Perakende", "MGROS": "Perakende",
+    "AEFES": "Gıda", "ULKER": "Gıda",
+    "TUPRS": "Enerji & Kimya", "PETKM": "Enerji & Kimya", "SASA": "Enerji & Kimya", "HEKTS": "Enerji & Kimya",
+    "TCELL": "Telekom & Teknoloji", "TTKOM": "Telekom & Teknoloji", "ASELS": "Telekom & Teknoloji", "ASTOR": "Telekom & Teknoloji",
+    "SISE": "Sanayi", "CIMSA": "Sanayi",
+    "EKGYO": "Gayrimenkul"
+}
+
+# Borsa İstanbul Seans ve Tatil Takvimi
+MARKET_TIMEZONE = "Europe/Istanbul"
+MARKET_OPEN_TIME = "10:00"       # Pay piyasası sürekli işlem başlangıcı
+MARKET_CLOSE_TIME = "18:00"      # Sürekli işlem bitişi (kapanış seansı öncesi)
+MARKET_HALF_DAY_CLOSE_TIME = "12:30"  # Arife günleri yarım gün
+# Her yıl aynı tarihteki resmi tatiller (AA-GG)
+MARKET_FIXED_HOLIDAYS = ["01-01", "04-23", "05-01", "05-19", "07-15", "08-30", "10-29"]
+# Dini bayramlar (yıla göre değişir, her yıl güncellenmeli)
+MARKET_HOLIDAYS = [
+    "2024-04-10", "2024-04-11", "2024-04-12",                # Ramazan Bayramı
+    "2024-06-17", "2024-06-18", "2024-06-19",                # Kurban Bayramı
+    "2025-03-31", "2025-04-01",                              # Ramazan Bayramı
+    "2025-06-06", "2025-06-09",                              # Kurban Bayramı
+    "2026-03-20",                                            # Ramazan Bayramı
+    "2026-05-27", "2026-05-28", "2026-05-29",                # Kurban Bayramı
+]
+# Yarım gün işlem yapılan arife günleri
+MARKET_HALF_DAYS = [
+    "2024-04-09", "2024-10-28",
+    "2025-06-05", "2025-10-28",
+    "2026-03-19", "2026-05-26", "2026-10-28",
+]
+
 # Production/Development ayarları
 DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
 
-def validate_telegram_config():
-    """Telegram konfigürasyonunu doğrula"""
+def validate_telegram_config(verbose=True):
+    """Telegram konfigürasyonunu doğrula (verbose=False ise uyarı yazdırılmaz)"""
     if TELEGRAM_TOKEN == 'YOUR_TELEGRAM_TOKEN':
-        print("⚠️  UYARI: Telegram token ayarlanmamış!")
-        print("📋 Telegram bot kurulumu için TELEGRAM_SETUP.md dosyasına bakın")
+        if verbose:
+            print("⚠️  UYARI: Telegram token ayarlanmamış!")
+            print("📋 Telegram bot kurulumu için TELEGRAM_SETUP.md dosyasına bakın")
         return False
     
     if TELEGRAM_CHAT_ID == 'YOUR_CHAT_ID':
-        print("⚠️  UYARI: Telegram chat ID ayarlanmamış!")
-        print("📋 Telegram bot kurulumu için TELEGRAM_SETUP.md dosyasına bakın")
+        if verbose:
+            print("⚠️  UYARI: Telegram chat ID ayarlanmamış!")
+            print("📋 Telegram bot kurulumu için TELEGRAM_SETUP.md dosyasına bakın")
         return False
     
-    print("✅ Telegram konfigürasyonu OK")
+    if verbose:
+        print("✅ Telegram konfigürasyonu OK")
     return True
 
 # Startup'ta konfigürasyonu kontrol et
@@ -5,6 +5,7 @@ BIST30 Alım-Satım Bot - Veri Çekme Modülü
 import os
 import logging
 import pandas as pd
+import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
 import sqlite3
@@ -12,6 +13,13 @@ import sys
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.change_tracker import ChangeTracker, STAGE_FETCH
+from src.bot.data_version import ensure_data_version_schema
+from src.bot.benchmark import BenchmarkSeries, ensure_benchmark_schema
+from src.bot.outbox import ensure_outbox_schema
+from src.bot.weekly_aggregation import (
+    ensure_weekly_indexes, ensure_weekly_summary, refresh_weekly_summary, week_start_of
+)
 
 # Loglama ayarları
 # LOG_FILE_PATH config.py'den None olarak gelecek, bu yüzden FileHandler kullanmayacağız.
@@ -36,6 +44,9 @@ class DataFetcher:
         """
         self.db_path = db_path
         self._ensure_db_exists()
+        self.change_tracker = ChangeTracker(db_path)
+        self.benchmark = BenchmarkSeries(db_path)
+        self.last_run_stats = {'changed': [], 'unchanged': []}
         logger.info("DataFetcher başlatıldı")
     
     def _ensure_db_exists(self):
@@ -92,6 +103,19 @@ class DataFetcher:
             )
             ''')
             
+            # Haftalık toplulaştırma için tarih indeksi ve haftalık özet tablosu
+            ensure_weekly_indexes(conn)
+            ensure_weekly_summary(conn)
+            
+            # Endeks serileri tablosu (XU030, XU100)
+            ensure_benchmark_schema(conn)
+            
+            # Telegram bildirimleri için outbox tablosu
+            ensure_outbox_schema(conn)
+            
+            # Önbelleklerin geçersiz kılınması için veri versiyonu tetikleyicileri
+            ensure_data_version_schema(conn)
+            
             conn.commit()
             conn.close()
             logger.info("Veritabanı ve tablolar oluşturuldu")
@@ -183,27 +207,47 @@ class DataFetcher:
         try:
             conn = sqlite3.connect(self.db_path)
             
-            # Veriyi kaydet
-            for _, row in data.iterrows():
-                date_str = row['date'].strftime('%Y-%m-%d') if isinstance(row['date'], datetime) else row['date']
-                
-                conn.execute('''
-                INSERT OR REPLACE INTO stock_data 
-                (symbol, date, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    symbol,
-                    date_str,
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    int(row['volume'])
-                ))
+            rows = pd.DataFrame({
+                'date': pd.to_datetime(data['date']).dt.strftime('%Y-%m-%d'),
+                'open': data['open'].astype(float).to_numpy(),
+                'high': data['high'].astype(float).to_numpy(),
+                'low': data['low'].astype(float).to_numpy(),
+                'close': data['close'].astype(float).to_numpy(),
+                'volume': data['volume'].astype('int64').to_numpy()
+            })
+            
+            # Yalnızca yeni veya değişen barları yaz (değişmeyen barlar veri versiyonunu artırmaz)
+            existing = pd.read_sql_query(
+                'SELECT date, open, high, low, close, volume FROM stock_data WHERE symbol = ? AND date >= ? AND date <= ?',
+                conn,
+                params=(symbol, rows['date'].min(), rows['date'].max())
+            )
+            merged = rows.merge(existing, on='date', how='left', suffixes=('', '_existing'))
+            changed = merged['close_existing'].isna().to_numpy().copy()
+            for column in ['open', 'high', 'low', 'close', 'volume']:
+                changed |= ~np.isclose(merged[column].astype(float), merged[f'{column}_existing'].astype(float), rtol=1e-9, atol=0)
+            changed_rows = rows[changed]
+            
+            conn.executemany('''
+            INSERT OR REPLACE INTO stock_data 
+            (symbol, date, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                (symbol, row.date, row.open, row.high, row.low, row.close, int(row.volume))
+                for row in changed_rows.itertuples(index=False)
+            ))
+            
+            # Haftalık özetin yalnızca etkilenen haftalarını güncelle; bir sonraki
+            # haftanın referans fiyatı bu haftanın kapanışı olduğundan o da dahil edilir
+            affected_weeks = set(week_start_of(changed_rows['date']))
+            affected_weeks |= {
+                (pd.Timestamp(week) + pd.Timedelta(days=7)).strftime('%Y-%m-%d') for week in affected_weeks
+            }
+            refresh_weekly_summary(conn, symbol, affected_weeks)
             
             conn.commit()
             conn.close()
-            logger.info(f"{symbol} için {len(data)} satır veri veritabanına kaydedildi")
+            logger.info(f"{symbol} için {len(data)} satır veriden {len(changed_rows)} tanesi yeni/değişmiş olarak kaydedildi, {len(affected_weeks)} hafta güncellendi")
             return True
         
         except Exception as e:
@@ -218,19 +262,55 @@ class DataFetcher:
             dict: Her sembol için başarı durumu
         """
         results = {}
+        changed_symbols = []
+        unchanged_symbols = []
         
         for symbol in BIST30_SYMBOLS:
             try:
                 data = self.fetch_stock_data(symbol)
                 success = self.save_to_db(symbol, data)
                 results[symbol] = success
+                
+                # Yeni bar gelip gelmediğini parmak izi ile tespit et
+                changed, last_date, fingerprint = self.change_tracker.check_changed(symbol, STAGE_FETCH)
+                if changed:
+                    self.change_tracker.save_fingerprint(symbol, STAGE_FETCH, last_date, fingerprint)
+                    changed_symbols.append(symbol)
+                else:
+                    unchanged_symbols.append(symbol)
             except Exception as e:
                 logger.error(f"{symbol} için işlem hatası: {e}")
                 results[symbol] = False
         
+        # Karşılaştırma endekslerini de güncelle
+        benchmark_results = self.fetch_all_benchmarks()
+        
+        self.last_run_stats = {
+            'changed': changed_symbols,
+            'unchanged': unchanged_symbols,
+            'benchmarks': benchmark_results
+        }
+        
         success_count = sum(1 for success in results.values() if success)
-        logger.info(f"Toplam {len(results)} hisseden {success_count} tanesi başarıyla işlendi")
+        logger.info(f"Toplam {len(results)} hisseden {success_count} tanesi başarıyla işlendi, {len(changed_symbols)} tanesinde veri değişti")
+        
+        return results
+    
+    def fetch_all_benchmarks(self):
+        """
+        Karşılaştırma endekslerinin (XU030, XU100) verisini çek ve kaydet
         
+        Returns:
+            dict: Her endeks için başarı durumu
+        """
+        results = {}
+        for index_symbol in BENCHMARK_INDICES:
+            try:
+                data = self.fetch_stock_data(index_symbol)
+                results[index_symbol] = self.benchmark.save_series(index_symbol, data)
+            except Exception as e:
+                logger.error(f"{index_symbol} endeksi için işlem hatası: {e}")
+                results[index_symbol] = False
         return results
     
     def get_latest_data(self, symbol, limit=10):
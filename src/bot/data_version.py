@@ -0,0 +1,90 @@
+"""
+BIST30 Alım-Satım Bot - Veri Versiyonu Modülü
+
+stock_data, technical_indicators, signals ve benchmark_data tablolarına yapılan her yazma
+işleminde SQLite tetikleyicileri ile artan tek bir versiyon sayacı ve son
+değişiklik zamanını tutar. Önbellekler bu sayacı anahtarlarına ekleyerek veri
+değiştiğinde kendiliğinden geçersiz olur; HTTP yanıtlarının ETag ve
+Last-Modified başlıkları da buradan üretilir.
+"""
+
+import sqlite3
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Versiyonu takip edilen tablolar
+VERSIONED_TABLES = ['stock_data', 'technical_indicators', 'signals', 'benchmark_data']
+
+def ensure_data_version_schema(conn):
+    """
+    Versiyon tablosunu ve tetikleyicileri oluştur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+    ''')
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(data_version)')]
+    if 'updated_at' not in columns:
+        conn.execute('ALTER TABLE data_version ADD COLUMN updated_at INTEGER')
+    conn.execute('''
+    INSERT OR IGNORE INTO data_version (id, version, updated_at)
+    VALUES (1, 0, CAST(strftime('%s', 'now') AS INTEGER))
+    ''')
+    
+    for table in VERSIONED_TABLES:
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            # Önceki sürümün yalnızca sayacı artıran tetikleyicileri kaldırılır
+            conn.execute(f'DROP TRIGGER IF EXISTS {table}_{operation.lower()}_data_version')
+            conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_data_version_v2
+            AFTER {operation} ON {table}
+            BEGIN
+                UPDATE data_version
+                SET version = version + 1, updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+                WHERE id = 1;
+            END
+            ''')
+
+def get_data_version(db_path=DATABASE_PATH):
+    """
+    Güncel veri versiyonunu getir
+    
+    Args:
+        db_path: Veritabanı dosya yolu
+    
+    Returns:
+        int: Veri versiyonu (tablo yoksa 0)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+        return row[0] if row else 0
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+def get_data_version_info(db_path=DATABASE_PATH):
+    """
+    Güncel veri versiyonunu ve son değişiklik zamanını getir
+    
+    Args:
+        db_path: Veritabanı dosya yolu
+    
+    Returns:
+        tuple: (versiyon, son değişiklik Unix zamanı veya None); tablo yoksa (0, None)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute('SELECT version, updated_at FROM data_version WHERE id = 1').fetchone()
+        return (row[0], row[1]) if row else (0, None)
+    except sqlite3.OperationalError:
+        return 0, None
+    finally:
+        conn.close()
@@ -0,0 +1,258 @@
+"""
+BIST30 Alım-Satım Bot - Vektörel Çıkış Simülasyonu Modülü
+
+Birden çok alım sinyali için hedef kâr / stop-loss / maksimum bekleme
+çıkışlarını tek seferde, dizi işlemleriyle hesaplar. PerformanceSimulator
+ve WeeklyReportGenerator bu modülü ortak kullanır.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Çıkış nedenleri
+EXIT_NONE = 0
+EXIT_TARGET = 1
+EXIT_STOP = 2
+EXIT_MAX_HOLDING = 3
+
+EXIT_SCENARIOS = {
+    EXIT_TARGET: 'target_profit',
+    EXIT_STOP: 'stop_loss',
+    EXIT_MAX_HOLDING: 'max_holding'
+}
+
+# Tek sorguda istenecek maksimum sembol sayısı (SQLite parametre sınırı)
+MAX_SYMBOLS_PER_QUERY = 400
+
+def load_signal_price_frames(conn, signals, end_date=None, min_bars=2):
+    """
+    Tüm sinyallerin fiyat aralıklarını tek sorguda yükle ve sinyal başına dilimle
+    
+    Her sembol için en erken sinyal tarihinden itibaren fiyatlar parametreli tek
+    bir aralık sorgusuyla çekilir; sorgu (symbol, date) birincil anahtar
+    indeksini kullanır. Sinyal başına tablolar bellekte kesilir.
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        signals: 'symbol' ve 'signal_date' alanlı sinyal listesi
+        end_date: Son tarih (YYYY-MM-DD, None ise sınırsız)
+        min_bars: Sinyalin simüle edilebilmesi için gereken minimum bar sayısı
+        
+    Returns:
+        tuple: (fiyat tabloları listesi, bu tablolara karşılık gelen sinyaller)
+    """
+    start_dates = {}
+    for signal in signals:
+        start = str(signal['signal_date'])[:10]
+        if signal['symbol'] not in start_dates or start < start_dates[signal['symbol']]:
+            start_dates[signal['symbol']] = start
+    
+    if not start_dates:
+        return [], []
+    
+    frames = []
+    items = list(start_dates.items())
+    for offset in range(0, len(items), MAX_SYMBOLS_PER_QUERY):
+        chunk = items[offset:offset + MAX_SYMBOLS_PER_QUERY]
+        query = f'''
+        WITH requested(symbol, start_date) AS (VALUES {', '.join('(?, ?)' for _ in chunk)})
+        SELECT s.symbol, s.date, s.open, s.high, s.low, s.close, s.volume
+        FROM stock_data s
+        JOIN requested r ON s.symbol = r.symbol AND s.date >= r.start_date
+        {'WHERE s.date <= ?' if end_date else ''}
+        ORDER BY s.symbol, s.date
+        '''
+        params = [value for item in chunk for value in item]
+        if end_date:
+            params.append(end_date)
+        frames.append(pd.read_sql_query(query, conn, params=params))
+    
+    prices = pd.concat(frames, ignore_index=True)
+    by_symbol = {symbol: group.reset_index(drop=True) for symbol, group in prices.groupby('symbol', sort=False)}
+    
+    price_frames = []
+    simulated_signals = []
+    for signal in signals:
+        symbol_prices = by_symbol.get(signal['symbol'])
+        if symbol_prices is None:
+            continue
+        
+        start = symbol_prices['date'].searchsorted(str(signal['signal_date'])[:10])
+        price_df = symbol_prices.iloc[start:]
+        if len(price_df) < min_bars:
+            continue
+        
+        price_frames.append(price_df)
+        simulated_signals.append(signal)
+    
+    return price_frames, simulated_signals
+
+def build_price_matrices(price_frames):
+    """
+    Sinyal başına fiyat tablolarını NaN ile doldurulmuş matrislere dönüştür
+    
+    Args:
+        price_frames: Her biri giriş barından başlayan, tarihe göre sıralı
+            pandas.DataFrame listesi (date, high, low, close sütunları)
+            
+    Returns:
+        dict: (sinyal sayısı x bar sayısı) boyutunda 'date', 'high', 'low', 'close' matrisleri
+    """
+    n = len(price_frames)
+    horizon = max((len(df) for df in price_frames), default=0)
+    
+    highs = np.full((n, horizon), np.nan)
+    lows = np.full((n, horizon), np.nan)
+    closes = np.full((n, horizon), np.nan)
+    dates = np.empty((n, horizon), dtype=object)
+    
+    for i, df in enumerate(price_frames):
+        length = len(df)
+        highs[i, :length] = df['high'].to_numpy(dtype=float)
+        lows[i, :length] = df['low'].to_numpy(dtype=float)
+        closes[i, :length] = df['close'].to_numpy(dtype=float)
+        dates[i, :length] = df['date'].to_numpy()
+    
+    return {
+        'date': dates,
+        'high': highs,
+        'low': lows,
+        'close': closes
+    }
+
+def _first_true_index(mask, sentinel):
+    """Her satırda ilk True değerin indeksini döndür, yoksa sentinel"""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), sentinel)
+
+def simulate_exits(entry_prices, highs, lows, closes,
+                   target_pct=TARGET_PROFIT_PERCENTAGE,
+                   stop_pct=STOP_LOSS_PERCENTAGE,
+                   max_holding=None,
+                   same_bar_policy=SAME_BAR_EXIT_POLICY):
+    """
+    Sinyal grubunun ilk tetiklenen çıkışını vektörel olarak hesapla
+    
+    Giriş 0. bardadır; hedef ve stop 1. bardan itibaren aranır. Hedef, stop ve
+    maksimum bekleme barından hangisi önce gelirse pozisyon o barda kapanır.
+    Hedef ve stop aynı barda görülürse hangisinin önce olduğu günlük veriden
+    bilinemez; bu durumda same_bar_policy'e göre karar verilir.
+    
+    Args:
+        entry_prices: Giriş fiyatları (n,)
+        highs: Yüksek fiyat matrisi (n, h), eksik barlar NaN
+        lows: Düşük fiyat matrisi (n, h), eksik barlar NaN
+        closes: Kapanış fiyat matrisi (n, h), eksik barlar NaN
+        target_pct: Hedef kâr yüzdesi
+        stop_pct: Stop-loss yüzdesi
+        max_holding: Maksimum bekleme bar sayısı (int veya (n,) dizi, None ise son bar)
+        same_bar_policy: "stop_first" veya "target_first"
+        
+    Returns:
+        dict: exit_index, exit_price, exit_reason, ambiguous, profit_loss,
+            profit_loss_percentage dizileri
+    """
+    entry_prices = np.asarray(entry_prices, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    n, horizon = closes.shape
+    
+    # Her sinyal için kullanılabilecek son bar
+    last_valid = (~np.isnan(closes)).sum(axis=1) - 1
+    if max_holding is None:
+        max_index = last_valid
+    else:
+        max_index = np.minimum(np.broadcast_to(np.asarray(max_holding, dtype=int), (n,)), last_valid)
+    
+    target_prices = entry_prices * (1 + target_pct / 100)
+    stop_prices = entry_prices * (1 - stop_pct / 100)
+    
+    # Giriş barından sonraki ve maksimum bekleme barına kadar olan pencere
+    bars = np.arange(horizon)
+    window = (bars >= 1) & (bars <= max_index[:, None])
+    
+    # NaN karşılaştırmaları False döner, eksik barlar tetiklenmez
+    with np.errstate(invalid='ignore'):
+        target_hit = (highs >= target_prices[:, None]) & window
+        stop_hit = (lows <= stop_prices[:, None]) & window
+    
+    target_index = _first_true_index(target_hit, horizon)
+    stop_index = _first_true_index(stop_hit, horizon)
+    
+    ambiguous = (target_index == stop_index) & (target_index < horizon)
+    if same_bar_policy == 'target_first':
+        target_wins = target_index <= stop_index
+    else:
+        target_wins = target_index < stop_index
+    
+    first_hit = np.minimum(target_index, stop_index)
+    hit_before_max = first_hit <= max_index
+    
+    exit_index = np.where(hit_before_max, first_hit, max_index)
+    exit_reason = np.where(
+        hit_before_max,
+        np.where(target_wins, EXIT_TARGET, EXIT_STOP),
+        EXIT_MAX_HOLDING
+    )
+    
+    # Giriş barından sonra hiç bar yoksa pozisyon simüle edilemez
+    exit_reason = np.where(max_index >= 1, exit_reason, EXIT_NONE)
+    exit_index = np.where(max_index >= 1, exit_index, 0)
+    
+    safe_index = np.clip(exit_index, 0, max(horizon - 1, 0))
+    close_at_exit = closes[np.arange(n), safe_index] if horizon else np.full(n, np.nan)
+    exit_price = np.select(
+        [exit_reason == EXIT_TARGET, exit_reason == EXIT_STOP, exit_reason == EXIT_MAX_HOLDING],
+        [target_prices, stop_prices, close_at_exit],
+        default=np.nan
+    )
+    
+    profit_loss = exit_price - entry_prices
+    profit_loss_percentage = profit_loss / entry_prices * 100
+    
+    return {
+        'exit_index': exit_index,
+        'exit_price': exit_price,
+        'exit_reason': exit_reason,
+        'ambiguous': ambiguous & (exit_reason != EXIT_MAX_HOLDING),
+        'profit_loss': profit_loss,
+        'profit_loss_percentage': profit_loss_percentage
+    }
+
+def build_trade_records(symbols, buy_dates, matrices, exits, max_holding_scenario='max_holding'):
+    """
+    Vektörel çıkış sonuçlarını işlem detaylarına dönüştür
+    
+    Args:
+        symbols: Sinyal sembolleri
+        buy_dates: Sinyal tarihleri
+        matrices: build_price_matrices çıktısı
+        exits: simulate_exits çıktısı
+        max_holding_scenario: Maksimum bekleme çıkışı için kullanılacak senaryo adı
+        
+    Returns:
+        list: İşlem detayları (dict listesi)
+    """
+    scenarios = dict(EXIT_SCENARIOS)
+    scenarios[EXIT_MAX_HOLDING] = max_holding_scenario
+    
+    trades = []
+    for i in np.flatnonzero(exits['exit_reason'] != EXIT_NONE):
+        exit_index = int(exits['exit_index'][i])
+        trades.append({
+            'scenario': scenarios[int(exits['exit_reason'][i])],
+            'buy_date': buy_dates[i],
+            'buy_price': float(matrices['close'][i, 0]),
+            'sell_date': matrices['date'][i, exit_index],
+            'sell_price': float(exits['exit_price'][i]),
+            'profit_loss': float(exits['profit_loss'][i]),
+            'profit_loss_percentage': float(exits['profit_loss_percentage'][i]),
+            'holding_days': exit_index,
+            'same_bar_ambiguous': bool(exits['ambiguous'][i]),
+            'symbol': symbols[i]
+        })
+    
+    return trades
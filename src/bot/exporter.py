@@ -0,0 +1,262 @@
+"""
+BIST30 Alım-Satım Bot - Toplu Veri Dışa Aktarma Modülü
+
+stock_data, technical_indicators ve signals tablolarını NDJSON, CSV veya
+Arrow IPC (stream) biçiminde, isteğe bağlı anlık gzip sıkıştırmasıyla
+parça parça üretir. Satırlar hiçbir zaman DataFrame'e yüklenmez: her sayfa
+birincil anahtar sırasıyla (keyset) okunur, kodlanır ve gönderilir; bellek
+kullanımı toplam satır sayısından bağımsız olarak sayfa boyutuyla sınırlıdır.
+
+Her sayfa kendi kısa okuma sorgusuyla okunur. SQLite'ın varsayılan
+(rollback journal) kipinde tek bir uzun okuma, yavaş bir istemci indirirken
+dakikalarca paylaşımlı kilit tutup pipeline yazmalarını engellerdi; keyset
+sayfalama ile kilit yalnızca sayfa okunurken tutulur.
+"""
+
+import io
+import csv
+import json
+import zlib
+import logging
+import sqlite3
+from datetime import datetime
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Arrow biçimi isteğe bağlıdır; pyarrow yoksa yalnızca NDJSON ve CSV sunulur
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('TableExporter')
+
+# Dışa aktarılabilen tablolar: sütun adı -> Arrow tipi, sayfalama anahtarı (birincil anahtar)
+EXPORT_TABLES = {
+    'stock_data': {
+        'columns': {
+            'symbol': 'string', 'date': 'string', 'open': 'float64', 'high': 'float64',
+            'low': 'float64', 'close': 'float64', 'volume': 'int64'
+        },
+        'key': ['symbol', 'date']
+    },
+    'technical_indicators': {
+        'columns': {
+            'symbol': 'string', 'date': 'string', 'ma_short': 'float64', 'ma_long': 'float64',
+            'rsi': 'float64', 'macd': 'float64', 'macd_signal': 'float64',
+            'bollinger_upper': 'float64', 'bollinger_middle': 'float64', 'bollinger_lower': 'float64'
+        },
+        'key': ['symbol', 'date']
+    },
+    'signals': {
+        'columns': {
+            'id': 'int64', 'symbol': 'string', 'date': 'string', 'signal_type': 'string',
+            'price': 'float64', 'reason': 'string', 'created_at': 'string'
+        },
+        'key': ['id']
+    }
+}
+
+# Biçim -> (MIME tipi, dosya uzantısı)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows')
+}
+
+def gzip_chunks(chunks, level=EXPORT_GZIP_LEVEL):
+    """
+    Bayt parçalarını akış halinde gzip ile sıkıştır
+    
+    Args:
+        chunks: Bayt parçaları üreten iterable
+        level: Sıkıştırma seviyesi
+    
+    Yields:
+        bytes: Sıkıştırılmış parçalar
+    """
+    # wbits=31: zlib yerine gzip başlığı ve CRC
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+class _ChunkSink:
+    """Arrow yazıcısının çıktısını parça parça toplayan dosya benzeri nesne"""
+    
+    def __init__(self):
+        """_ChunkSink sınıfını başlat"""
+        self._parts = []
+        self.closed = False
+    
+    def write(self, data):
+        """Yazılan baytları tampona ekle"""
+        self._parts.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        """Tampon drain ile boşaltıldığı için işlem yapmaz"""
+        pass
+    
+    def close(self):
+        """Yazıcı kapandığında çağrılır"""
+        self.closed = True
+    
+    def drain(self):
+        """Birikmiş baytları döndür ve tamponu boşalt"""
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+class TableExporter:
+    """Veritabanı tablolarını sabit bellekle akış halinde dışa aktaran sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH, batch_size=EXPORT_BATCH_SIZE):
+        """
+        TableExporter sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            batch_size: Sayfa başına satır sayısı
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        logger.info("TableExporter başlatıldı")
+    
+    def _page_query(self, table, symbols, start_date, end_date, after):
+        """Filtreli ve anahtardan sonrası için tek sayfa sorgusunu oluştur"""
+        spec = EXPORT_TABLES[table]
+        query = f"SELECT {', '.join(spec['columns'])} FROM {table} WHERE 1 = 1"
+        params = []
+        if symbols:
+            query += f" AND symbol IN ({', '.join('?' for _ in symbols)})"
+            params.extend(symbols)
+        if start_date:
+            query += ' AND date >= ?'
+            params.append(start_date)
+        if end_date:
+            query += ' AND date <= ?'
+            params.append(end_date)
+        if after is not None:
+            # Satır değeri karşılaştırması birincil anahtar indeksini kullanır
+            query += f" AND ({', '.join(spec['key'])}) > ({', '.join('?' for _ in spec['key'])})"
+            params.extend(after)
+        query += f" ORDER BY {', '.join(spec['key'])} LIMIT ?"
+        params.append(self.batch_size)
+        return query, params
+    
+    def iter_batches(self, table, symbols=None, start_date=None, end_date=None):
+        """
+        Tabloyu birincil anahtar sırasıyla sayfa sayfa oku
+        
+        Args:
+            table: EXPORT_TABLES içindeki tablo adı
+            symbols: Sembol listesi (None ise tümü)
+            start_date: Başlangıç tarihi (YYYY-MM-DD, dahil)
+            end_date: Bitiş tarihi (YYYY-MM-DD, dahil)
+        
+        Yields:
+            list: En fazla batch_size satırlık tuple listesi
+        """
+        columns = list(EXPORT_TABLES[table]['columns'])
+        key_indexes = [columns.index(name) for name in EXPORT_TABLES[table]['key']]
+        after = None
+        rows_exported = 0
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                query, params = self._page_query(table, symbols, start_date, end_date, after)
+                rows = conn.execute(query, params).fetchall()
+                if not rows:
+                    break
+                rows_exported += len(rows)
+                yield rows
+                if len(rows) < self.batch_size:
+                    break
+                after = [rows[-1][index] for index in key_indexes]
+        finally:
+            conn.close()
+            logger.info(f"{table} dışa aktarıldı: {rows_exported} satır")
+    
+    def _ndjson_chunks(self, columns, batches):
+        """Sayfaları satır başına bir JSON nesnesi olarak kodla"""
+        for rows in batches:
+            yield ''.join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+    
+    def _csv_chunks(self, columns, batches):
+        """Sayfaları başlık satırlı CSV olarak kodla"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    def _arrow_chunks(self, table, batches):
+        """Sayfaları Arrow IPC stream kayıt grupları (record batch) olarak kodla"""
+        types = EXPORT_TABLES[table]['columns']
+        schema = pa.schema([(name, getattr(pa, arrow_type)()) for name, arrow_type in types.items()])
+        sink = _ChunkSink()
+        writer = pa.ipc.new_stream(sink, schema)
+        for rows in batches:
+            arrays = [pa.array(list(values), type=field.type) for field, values in zip(schema, zip(*rows))]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    
+    def export(self, table, export_format='ndjson', symbols=None, start_date=None, end_date=None, compress=False):
+        """
+        Dışa aktarma parametrelerini doğrula ve bayt parçaları üreten akışı döndür
+        
+        Doğrulama hemen yapılır; veritabanı yalnızca akış tüketilirken okunur.
+        
+        Args:
+            table: EXPORT_TABLES içindeki tablo adı
+            export_format: 'ndjson', 'csv' veya 'arrow'
+            symbols: Sembol listesi (None ise tümü)
+            start_date: Başlangıç tarihi (YYYY-MM-DD, dahil)
+            end_date: Bitiş tarihi (YYYY-MM-DD, dahil)
+            compress: True ise çıktı anlık gzip ile sıkıştırılır
+        
+        Returns:
+            iterator: Bayt parçaları
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Bilinmeyen tablo: {table} (geçerli: {', '.join(EXPORT_TABLES)})")
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Bilinmeyen biçim: {export_format} (geçerli: {', '.join(EXPORT_FORMATS)})")
+        if export_format == 'arrow' and pa is None:
+            raise ValueError("Arrow biçimi için pyarrow paketi kurulu olmalı")
+        for value in (start_date, end_date):
+            if value:
+                try:
+                    datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    raise ValueError(f"Geçersiz tarih: {value} (YYYY-MM-DD bekleniyor)")
+        
+        batches = self.iter_batches(table, symbols, start_date, end_date)
+        if export_format == 'ndjson':
+            chunks = self._ndjson_chunks(list(EXPORT_TABLES[table]['columns']), batches)
+        elif export_format == 'csv':
+            chunks = self._csv_chunks(list(EXPORT_TABLES[table]['columns']), batches)
+        else:
+            chunks = self._arrow_chunks(table, batches)
+        
+        return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,354 @@
+"""
+BIST30 Alım-Satım Bot - Arka Plan İş (Job) Modülü
+
+Uzun süren akışlar (ör. haftalık analiz, walk-forward doğrulaması) HTTP isteği içinde değil, arka plan
+işçisinde çalışır. İstek yalnızca iş kimliğini döndürür; durum, aşama
+ilerlemesi ve sonuç SQLite'taki jobs tablosundan sorgulanır. Tablo paylaşıldığı
+için durum, işi başlatan süreçten farklı bir gunicorn worker'ından da okunabilir.
+
+Aynı türden bekleyen/çalışan bir iş varken gelen yeni istekler o işe bağlanır
+(coalesce). Bu, yalnızca aktif işler üzerinde tanımlı kısmi UNIQUE indeks ile
+süreçler arasında da atomik olarak sağlanır. Süreci çöken ve uzun süredir
+ilerleme bildirmeyen işler terk edilmiş sayılıp başarısız olarak kapatılır.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import sqlite3
+import threading
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('JobManager')
+
+# İş durumları
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Aşama durumları
+STAGE_PENDING = 'pending'
+STAGE_RUNNING = 'running'
+STAGE_DONE = 'done'
+STAGE_FAILED = 'failed'
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def ensure_jobs_schema(conn):
+    """
+    İş tablosunu oluştur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT,
+        status TEXT,
+        stage TEXT,
+        progress REAL DEFAULT 0,
+        stages TEXT,
+        params TEXT,
+        result TEXT,
+        error TEXT,
+        owner TEXT,
+        created_at TEXT,
+        started_at TEXT,
+        heartbeat_at TEXT,
+        finished_at TEXT
+    )
+    ''')
+    # Tür başına en fazla bir aktif iş (yeni istekler mevcut işe bağlanır)
+    conn.execute(f'''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active ON jobs (kind)
+    WHERE status IN ('{JOB_QUEUED}', '{JOB_RUNNING}')
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at)')
+
+def _now_text():
+    """Şu anki zamanı tablo biçiminde döndür"""
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+class JobContext:
+    """Çalışan işin aşama ve ilerleme bilgisini kaydeden nesne"""
+    
+    def __init__(self, manager, job_id, stage_names, params):
+        """
+        JobContext sınıfını başlat
+        
+        Args:
+            manager: İşi çalıştıran JobManager
+            job_id: İş kimliği
+            stage_names: Sıralı aşama adları
+            params: İş parametreleri (dict)
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.params = params
+        self.stages = {name: {'status': STAGE_PENDING, 'duration': None} for name in stage_names}
+        self._current = None
+        self._started = None
+    
+    def stage(self, name):
+        """
+        Önceki aşamayı tamamla ve yeni aşamaya geç
+        
+        Args:
+            name: Aşama adı (kayıtlı aşamalardan biri)
+        """
+        self._finish_current(STAGE_DONE)
+        self._current = name
+        self._started = time.perf_counter()
+        self.stages.setdefault(name, {'status': STAGE_PENDING, 'duration': None})
+        self.stages[name]['status'] = STAGE_RUNNING
+        self._save()
+    
+    def step(self, completed, total):
+        """
+        Çalışan aşamanın alt adım ilerlemesini kaydet
+        
+        Tek aşaması uzun süren işler (ör. walk-forward pencereleri) her adımda
+        çağırır; kayıt aynı zamanda yaşam sinyalidir, böylece iş terk edilmiş
+        sayılmaz.
+        
+        Args:
+            completed: Tamamlanan adım sayısı
+            total: Toplam adım sayısı
+        """
+        if self._current is None:
+            return
+        self.stages[self._current]['completed'] = completed
+        self.stages[self._current]['total'] = total
+        self._save()
+    
+    def _finish_current(self, status):
+        """Çalışan aşamayı verilen durumla kapat"""
+        if self._current is not None:
+            self.stages[self._current]['status'] = status
+            self.stages[self._current]['duration'] = round(time.perf_counter() - self._started, 3)
+            self._current = None
+    
+    def _progress(self):
+        """Tamamlanan aşamaların (ve çalışan aşamanın tamamlanan kısmının) oranı"""
+        done = sum(1 for stage in self.stages.values() if stage['status'] == STAGE_DONE)
+        # Çalışan aşamanın alt adım ilerlemesi (step ile bildirildiyse)
+        if self._current is not None and self.stages[self._current].get('total'):
+            current = self.stages[self._current]
+            done += current['completed'] / current['total']
+        return done / len(self.stages) if self.stages else 0.0
+    
+    def _save(self):
+        """Aşama durumunu ve yaşam sinyalini (heartbeat) kaydet"""
+        self.manager._update(
+            self.job_id,
+            stage=self._current,
+            progress=self._progress(),
+            stages=json.dumps(self.stages),
+            heartbeat_at=_now_text()
+        )
+
+class JobManager:
+    """Arka plan işlerini başlatan, birleştiren ve durumlarını saklayan sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH, max_workers=JOB_WORKERS):
+        """
+        JobManager sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            max_workers: Aynı anda çalışabilecek iş sayısı (süreç başına)
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.handlers = {}
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+        
+        conn = self._get_connection()
+        try:
+            ensure_jobs_schema(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("JobManager başlatıldı")
+    
+    def _get_connection(self):
+        """Yazma kilidi için bekleyen SQLite bağlantısı aç"""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def init_app(self, app):
+        """
+        İşleri Flask uygulama bağlamında (current_app erişimi için) çalıştır
+        
+        Args:
+            app: Flask uygulaması
+        """
+        self.app = app
+    
+    def register(self, kind, handler, stages):
+        """
+        İş türünü kaydet
+        
+        Args:
+            kind: İş türü adı
+            handler: handler(context) fonksiyonu; dönüş değeri iş sonucudur (JSON'a çevrilebilir)
+            stages: Sıralı aşama adları
+        """
+        self.handlers[kind] = (handler, list(stages))
+    
+    def _get_executor(self):
+        """İşçi havuzunu ilk işte oluştur"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+            return self._executor
+    
+    def _reap_abandoned(self, conn):
+        """Uzun süredir yaşam sinyali vermeyen aktif işleri başarısız olarak kapat"""
+        cutoff = (datetime.now() - timedelta(seconds=JOB_HEARTBEAT_TIMEOUT)).strftime(TIMESTAMP_FORMAT)
+        abandoned = conn.execute(f'''
+        UPDATE jobs SET status = ?, error = ?, finished_at = ?
+        WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) AND heartbeat_at < ?
+        ''', (JOB_FAILED, 'İş terk edildi (süreç yanıt vermiyor)', _now_text(), *ACTIVE_STATUSES, cutoff)).rowcount
+        if abandoned:
+            logger.warning(f"{abandoned} terk edilmiş iş başarısız olarak işaretlendi")
+        
+        retention_cutoff = (datetime.now() - timedelta(days=JOB_RETENTION_DAYS)).strftime(TIMESTAMP_FORMAT)
+        conn.execute(f'''
+        DELETE FROM jobs WHERE status NOT IN ({','.join('?' * len(ACTIVE_STATUSES))}) AND created_at < ?
+        ''', (*ACTIVE_STATUSES, retention_cutoff))
+    
+    def submit(self, kind, params=None):
+        """
+        İşi başlat; aynı türden aktif bir iş varsa ona bağlan
+        
+        Args:
+            kind: Kayıtlı iş türü
+            params: İş parametreleri (dict)
+        
+        Returns:
+            tuple: (iş bilgisi (dict), yeni iş oluşturulduysa True / mevcut işe bağlandıysa False)
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Bilinmeyen iş türü: {kind}")
+        
+        _, stage_names = self.handlers[kind]
+        job_id = uuid.uuid4().hex
+        now = _now_text()
+        stages = {name: {'status': STAGE_PENDING, 'duration': None} for name in stage_names}
+        
+        conn = self._get_connection()
+        try:
+            self._reap_abandoned(conn)
+            # Aktif iş varsa kısmi UNIQUE indeks eklemeyi engeller
+            created = conn.execute('''
+            INSERT OR IGNORE INTO jobs
+            (id, kind, status, progress, stages, params, owner, created_at, heartbeat_at)
+            VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?)
+            ''', (job_id, kind, JOB_QUEUED, json.dumps(stages), json.dumps(params or {}, default=str),
+                  self.owner, now, now)).rowcount == 1
+            conn.commit()
+            
+            if not created:
+                job_id = conn.execute(f'''
+                SELECT id FROM jobs WHERE kind = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})
+                ''', (kind, *ACTIVE_STATUSES)).fetchone()[0]
+        finally:
+            conn.close()
+        
+        if created:
+            self._get_executor().submit(self._run, job_id, kind, params or {})
+            logger.info(f"İş başlatıldı: {kind} ({job_id})")
+        else:
+            logger.info(f"Çalışan {kind} işine bağlanıldı ({job_id})")
+        return self.get_job(job_id), created
+    
+    def _update(self, job_id, **fields):
+        """İş kaydının verilen alanlarını güncelle"""
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        conn = self._get_connection()
+        try:
+            conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _run(self, job_id, kind, params):
+        """İşi çalıştır ve sonucunu kaydet"""
+        handler, stage_names = self.handlers[kind]
+        context = JobContext(self, job_id, stage_names, params)
+        self._update(job_id, status=JOB_RUNNING, started_at=_now_text(), heartbeat_at=_now_text())
+        
+        try:
+            with self.app.app_context() if self.app is not None else nullcontext():
+                result = handler(context)
+        except Exception as e:
+            context._finish_current(STAGE_FAILED)
+            logger.error(f"İş başarısız: {kind} ({job_id}): {e}")
+            self._update(
+                job_id, status=JOB_FAILED, error=str(e), stages=json.dumps(context.stages),
+                finished_at=_now_text(), heartbeat_at=_now_text()
+            )
+            return
+        
+        context._finish_current(STAGE_DONE)
+        self._update(
+            job_id, status=JOB_SUCCEEDED, stage=None, progress=1.0,
+            stages=json.dumps(context.stages), result=json.dumps(result, default=str),
+            finished_at=_now_text(), heartbeat_at=_now_text()
+        )
+        logger.info(f"İş tamamlandı: {kind} ({job_id})")
+    
+    def get_job(self, job_id):
+        """
+        İş bilgisini getir
+        
+        Args:
+            job_id: İş kimliği
+        
+        Returns:
+            dict: Durum, aşamalar, ilerleme, sonuç ve hata (iş yoksa None)
+        """
+        conn = self._get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        
+        if row is None:
+            return None
+        
+        job = dict(row)
+        for field in ('stages', 'params', 'result'):
+            job[field] = json.loads(job[field]) if job[field] else None
+        job.pop('owner')
+        return job
+    
+    def shutdown(self, wait=True):
+        """İşçi havuzunu kapat"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -0,0 +1,98 @@
+"""
+BIST30 Alım-Satım Bot - Borsa İstanbul Takvim Modülü
+
+Borsa İstanbul pay piyasasının işlem günlerini ve seans saatlerini
+konfigürasyondaki tatil/yarım gün listelerine göre hesaplar. Tüm saatler
+MARKET_TIMEZONE (Europe/Istanbul) saat dilimindedir.
+"""
+
+from datetime import datetime, date, time, timedelta
+from zoneinfo import ZoneInfo
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+MARKET_TZ = ZoneInfo(MARKET_TIMEZONE)
+
+_HOLIDAYS = {date.fromisoformat(day) for day in MARKET_HOLIDAYS}
+_HALF_DAYS = {date.fromisoformat(day) for day in MARKET_HALF_DAYS}
+
+def parse_clock(text):
+    """'HH:MM' metnini datetime.time nesnesine çevir"""
+    hour, minute = text.split(':')
+    return time(int(hour), int(minute))
+
+def market_now():
+    """Borsa saat dilimindeki şu anki zaman"""
+    return datetime.now(MARKET_TZ)
+
+def is_holiday(day):
+    """
+    Günün resmi tatil olup olmadığını kontrol et
+    
+    Args:
+        day: datetime.date
+    
+    Returns:
+        bool: Tatilse True
+    """
+    return day in _HOLIDAYS or day.strftime('%m-%d') in MARKET_FIXED_HOLIDAYS
+
+def is_trading_day(day):
+    """
+    Günün işlem günü olup olmadığını kontrol et (hafta sonu ve tatiller hariç)
+    
+    Args:
+        day: datetime.date
+    
+    Returns:
+        bool: İşlem günüyse True
+    """
+    return day.weekday() < 5 and not is_holiday(day)
+
+def session_hours(day):
+    """
+    İşlem gününün seans başlangıç ve bitişini getir
+    
+    Args:
+        day: datetime.date
+    
+    Returns:
+        tuple: (açılış, kapanış) saat dilimli datetime, işlem günü değilse None
+    """
+    if not is_trading_day(day):
+        return None
+    close_time = MARKET_HALF_DAY_CLOSE_TIME if day in _HALF_DAYS else MARKET_CLOSE_TIME
+    return (
+        datetime.combine(day, parse_clock(MARKET_OPEN_TIME), MARKET_TZ),
+        datetime.combine(day, parse_clock(close_time), MARKET_TZ)
+    )
+
+def is_market_open(moment=None):
+    """
+    Piyasanın verilen anda açık olup olmadığını kontrol et
+    
+    Args:
+        moment: Saat dilimli datetime (None ise şu an)
+    
+    Returns:
+        bool: Seans içindeyse True
+    """
+    moment = (moment or market_now()).astimezone(MARKET_TZ)
+    hours = session_hours(moment.date())
+    return hours is not None and hours[0] <= moment < hours[1]
+
+def next_trading_day(day):
+    """
+    Verilen günden sonraki ilk işlem günü
+    
+    Args:
+        day: datetime.date
+    
+    Returns:
+        datetime.date: Sonraki işlem günü
+    """
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
@@ -0,0 +1,264 @@
+"""
+BIST30 Alım-Satım Bot - Monte Carlo Bootstrap Modülü
+
+Geçmiş işlem getirilerini blok bootstrap ile on binlerce kez yeniden
+örnekleyerek başarı oranı, beklenen getiri ve maksimum düşüş için güven
+aralıkları üretir. Sonuçlar strateji ve veri versiyonuna göre önbelleklenir.
+"""
+
+import json
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.data_version import get_data_version
+from src.bot.backtester import PortfolioBacktester, validate_backtest_request
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('MonteCarloSimulator')
+
+# Tek seferde işlenecek maksimum örnek sayısı (bellek sınırı)
+MAX_SAMPLES_PER_CHUNK = 2_000_000
+
+# Süreç genelinde paylaşılan sonuç önbelleği
+_RESULT_CACHE = OrderedDict()
+_RESULT_CACHE_SIZE = 32
+_RESULT_CACHE_LOCK = threading.Lock()
+
+def block_bootstrap_indices(n_trades, n_simulations, block_size, rng):
+    """
+    Dairesel blok bootstrap için örnek indekslerini üret
+    
+    Args:
+        n_trades: İşlem sayısı
+        n_simulations: Simülasyon sayısı
+        block_size: Blok uzunluğu
+        rng: numpy.random.Generator
+    
+    Returns:
+        numpy.ndarray: (n_simulations, n_trades) indeks matrisi
+    """
+    block_size = max(1, min(block_size, n_trades))
+    n_blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(n_simulations, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_size)) % n_trades
+    return indices.reshape(n_simulations, n_blocks * block_size)[:, :n_trades]
+
+def _interval(values, confidence):
+    """Dağılımın ortalama, medyan ve güven aralığı özetini çıkar"""
+    tail = (1 - confidence) / 2 * 100
+    lower, median, upper = np.percentile(values, [tail, 50, 100 - tail])
+    return {
+        'mean': float(values.mean()),
+        'median': float(median),
+        'lower': float(lower),
+        'upper': float(upper)
+    }
+
+def bootstrap_trade_statistics(returns_pct, n_simulations=MONTE_CARLO_SIMULATIONS,
+                               block_size=MONTE_CARLO_BLOCK_SIZE,
+                               confidence=MONTE_CARLO_CONFIDENCE,
+                               position_fraction=BACKTEST_POSITION_SIZE, seed=None):
+    """
+    İşlem getirilerinden güven aralıklarını hesapla
+    
+    Args:
+        returns_pct: İşlem başına getiri yüzdeleri (sıralı)
+        n_simulations: Bootstrap tekrar sayısı
+        block_size: Blok uzunluğu (ardışık işlemler arasındaki bağımlılığı korur)
+        confidence: Güven seviyesi (örn. 0.95)
+        position_fraction: Özsermaye eğrisinde her işleme ayrılan sermaye oranı
+        seed: Rastgele sayı üreteci tohumu
+    
+    Returns:
+        dict: Başarı oranı, beklenen getiri, toplam getiri ve maksimum düşüş için aralıklar
+    """
+    returns = np.asarray(returns_pct, dtype=float) / 100
+    returns = returns[~np.isnan(returns)]
+    n_trades = len(returns)
+    if n_trades == 0:
+        return None
+    
+    rng = np.random.default_rng(seed)
+    chunk = max(1, MAX_SAMPLES_PER_CHUNK // n_trades)
+    
+    win_rates = np.empty(n_simulations)
+    expected_returns = np.empty(n_simulations)
+    total_returns = np.empty(n_simulations)
+    max_drawdowns = np.empty(n_simulations)
+    
+    for start in range(0, n_simulations, chunk):
+        size = min(chunk, n_simulations - start)
+        samples = returns[block_bootstrap_indices(n_trades, size, block_size, rng)]
+        
+        equity = np.cumprod(1 + samples * position_fraction, axis=1)
+        running_max = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        
+        window = slice(start, start + size)
+        win_rates[window] = (samples > 0).mean(axis=1) * 100
+        expected_returns[window] = samples.mean(axis=1) * 100
+        total_returns[window] = (equity[:, -1] - 1) * 100
+        max_drawdowns[window] = (equity / running_max - 1).min(axis=1) * 100
+    
+    return {
+        'trade_count': n_trades,
+        'simulations': n_simulations,
+        'block_size': max(1, min(block_size, n_trades)),
+        'confidence': confidence,
+        'observed': {
+            'success_rate': float((returns > 0).mean() * 100),
+            'avg_profit_loss_percentage': float(returns.mean() * 100)
+        },
+        'success_rate': _interval(win_rates, confidence),
+        'expected_return_percentage': _interval(expected_returns, confidence),
+        'total_return_percentage': _interval(total_returns, confidence),
+        'max_drawdown_percentage': _interval(max_drawdowns, confidence)
+    }
+
+def _is_number(value):
+    """Değer bool olmayan sonlu bir sayı mı"""
+    return not isinstance(value, bool) and isinstance(value, (int, float)) and np.isfinite(value)
+
+def validate_monte_carlo_request(data):
+    """
+    Monte Carlo isteğinin parametrelerini hesaplamadan önce doğrula
+    
+    Args:
+        data: İstek gövdesi (params, simulations, block_size, confidence)
+    
+    Returns:
+        dict: MonteCarloSimulator.get_confidence_intervals() parametreleri
+    
+    Raises:
+        ValueError: Geçersiz parametre
+    """
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        raise ValueError("params bir nesne olmalı")
+    _, params = validate_backtest_request(params=params)
+    
+    simulations = data.get('simulations', MONTE_CARLO_SIMULATIONS)
+    if not _is_number(simulations) or simulations != int(simulations):
+        raise ValueError("simulations tam sayı olmalı")
+    if not 1 <= simulations <= MONTE_CARLO_MAX_SIMULATIONS:
+        raise ValueError(f"simulations [1, {MONTE_CARLO_MAX_SIMULATIONS}] aralığında olmalı: {simulations}")
+    
+    block_size = data.get('block_size', MONTE_CARLO_BLOCK_SIZE)
+    if not _is_number(block_size) or block_size != int(block_size):
+        raise ValueError("block_size tam sayı olmalı")
+    if block_size < 1:
+        raise ValueError(f"block_size en az 1 olmalı: {block_size}")
+    
+    confidence = data.get('confidence', MONTE_CARLO_CONFIDENCE)
+    if not _is_number(confidence):
+        raise ValueError("confidence sayısal olmalı")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence (0, 1) aralığında olmalı: {confidence}")
+    
+    return {
+        'params': params or None,
+        'n_simulations': int(simulations),
+        'block_size': int(block_size),
+        'confidence': float(confidence)
+    }
+
+class MonteCarloSimulator:
+    """Strateji işlem sonuçları için Monte Carlo güven aralıkları üreten sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        MonteCarloSimulator sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        self.backtester = PortfolioBacktester(db_path)
+        logger.info("MonteCarloSimulator başlatıldı")
+    
+    def get_confidence_intervals(self, params=None, n_simulations=MONTE_CARLO_SIMULATIONS,
+                                 block_size=MONTE_CARLO_BLOCK_SIZE,
+                                 confidence=MONTE_CARLO_CONFIDENCE):
+        """
+        Stratejinin geçmiş işlemlerinden güven aralıklarını hesapla
+        
+        Aynı strateji versiyonu, veri versiyonu ve parametrelerle yapılan
+        tekrar istekler önbellekten döner.
+        
+        Args:
+            params: Backtest parametreleri
+            n_simulations: Bootstrap tekrar sayısı
+            block_size: Blok uzunluğu
+            confidence: Güven seviyesi
+        
+        Returns:
+            dict: Güven aralıkları
+        """
+        try:
+            cache_key = (
+                STRATEGY_VERSION,
+                get_data_version(self.db_path),
+                json.dumps(params or {}, sort_keys=True),
+                n_simulations,
+                block_size,
+                confidence
+            )
+            
+            with _RESULT_CACHE_LOCK:
+                cached = _RESULT_CACHE.get(cache_key)
+                if cached is not None:
+                    _RESULT_CACHE.move_to_end(cache_key)
+                    return {**cached, 'cached': True}
+            
+            backtest = self.backtester.run(params=params)
+            if not backtest['success']:
+                return backtest
+            
+            # Seed veri versiyonundan türetilir: aynı veriyle sonuçlar tekrarlanabilir
+            statistics = bootstrap_trade_statistics(
+                [trade['profit_loss_percentage'] for trade in backtest['trades']],
+                n_simulations=n_simulations,
+                block_size=block_size,
+                confidence=confidence,
+                position_fraction=backtest['params']['position_size'],
+                seed=cache_key[1]
+            )
+            
+            if statistics is None:
+                return {
+                    'success': False,
+                    'message': 'Monte Carlo için işlem bulunamadı'
+                }
+            
+            result = {
+                'success': True,
+                'strategy_version': STRATEGY_VERSION,
+                'data_version': cache_key[1],
+                'start_date': backtest['start_date'],
+                'end_date': backtest['end_date'],
+                **statistics
+            }
+            
+            with _RESULT_CACHE_LOCK:
+                _RESULT_CACHE[cache_key] = result
+                while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                    _RESULT_CACHE.popitem(last=False)
+            
+            logger.info(f"Monte Carlo tamamlandı: {statistics['trade_count']} işlem, {n_simulations} simülasyon")
+            return {**result, 'cached': False}
+        except Exception as e:
+            logger.error(f"Monte Carlo hatası: {e}")
+            return {
+                'success': False,
+                'message': f"Monte Carlo hatası: {str(e)}"
+            }
@@ -0,0 +1,339 @@
+"""
+BIST30 Alım-Satım Bot - Giden Bildirim Kuyruğu Modülü
+
+Telegram'a giden mesajlar öncelik sıralı bir kuyruktan, sabit sayıda işçi
+(worker) tarafından gönderilir. Her gönderim önce sohbet başına, sonra bot
+genelindeki jeton kovasından (token bucket) jeton alır; böylece Telegram'ın
+sohbet başına ~1 mesaj/sn ve genel ~30 mesaj/sn sınırları aşılmaz.
+
+429 (RetryAfter) yanıtında ilgili sohbet retry_after süresince durdurulur ve
+mesaj yeniden kuyruğa alınır; ağ hataları üstel bekleme ile yeniden denenir.
+Kalıcı hatalar (400 geçersiz HTML/uzun metin, 403, geçersiz token) yeniden
+denenmez.
+Alım/satım sinyalleri özet mesajlarından önce gönderilir. Kuyruk sohbet içi
+sırayı garanti etmez; aynı sohbete sıralı gönderim için çağıran her mesajın
+sonucunu bekleyip sonrakini verir (TelegramNotifier.send_in_order).
+"""
+
+import asyncio
+import logging
+import itertools
+import numpy as np
+from collections import deque
+from telegram.error import RetryAfter, NetworkError, TelegramError, BadRequest, Forbidden, InvalidToken
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('NotificationQueue')
+
+# Mesaj öncelikleri (küçük değer önce gönderilir)
+PRIORITY_SIGNAL = 0    # Alım/satım sinyalleri
+PRIORITY_NORMAL = 5    # Test ve diğer tekil mesajlar
+PRIORITY_SUMMARY = 10  # Haftalık özet ve raporlar
+
+# Gecikme yüzdelikleri için saklanan son ölçüm sayısı
+LATENCY_SAMPLE_SIZE = 1000
+
+class TokenBucket:
+    """Rezervasyonlu jeton kovası: jeton yoksa ne kadar beklenmesi gerektiğini söyler"""
+    
+    def __init__(self, rate, capacity):
+        """
+        TokenBucket sınıfını başlat
+        
+        Args:
+            rate: Saniyede eklenen jeton sayısı
+            capacity: Kovanın alabileceği en fazla jeton (ani gönderim sınırı)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = None
+        self.blocked_until = 0.0
+    
+    def _refill(self, now):
+        """Geçen süre kadar jeton ekle"""
+        if self.updated is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def delay(self, now):
+        """
+        Jeton ayırmadan, bir jeton için beklenmesi gereken süreyi hesapla
+        
+        Args:
+            now: Şu anki zaman (olay döngüsü saati)
+        
+        Returns:
+            float: Bekleme süresi (saniye, jeton varsa 0)
+        """
+        self._refill(now)
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        return max(wait, self.blocked_until - now)
+    
+    def reserve(self, now):
+        """
+        Bir jeton ayır
+        
+        Jeton sayısı eksiye düşebilir; eksi değer ileride üretilecek jetonların
+        önceden ayrıldığını gösterir. Böylece eşzamanlı işçiler sıraya girer.
+        
+        Args:
+            now: Şu anki zaman (olay döngüsü saati)
+        
+        Returns:
+            float: Jetonun kullanılabilmesi için beklenmesi gereken süre (saniye)
+        """
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+    
+    def block(self, until):
+        """
+        Kovayı belirli bir zamana kadar durdur (429 retry_after)
+        
+        Args:
+            until: Gönderimin yeniden başlayabileceği zaman (olay döngüsü saati)
+        """
+        self.blocked_until = max(self.blocked_until, until)
+        # Bekleme sonrası ani gönderim olmasın diye biriken jetonlar sıfırlanır
+        self.tokens = min(self.tokens, 0.0)
+
+def _latency_summary(samples):
+    """Gecikme örneklerinin yüzdeliklerini milisaniye olarak hesapla"""
+    if not samples:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    values = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(values),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(values.max())
+    }
+
+class OutboundQueue:
+    """Öncelikli, hız sınırlı ve yeniden denemeli giden mesaj kuyruğu"""
+    
+    def __init__(self, deliver, workers=TELEGRAM_CONNECTION_POOL_SIZE,
+                 global_rate=TELEGRAM_GLOBAL_RATE, chat_rate=TELEGRAM_CHAT_RATE,
+                 chat_burst=TELEGRAM_CHAT_BURST, max_attempts=TELEGRAM_MAX_ATTEMPTS):
+        """
+        OutboundQueue sınıfını başlat
+        
+        Kuyruk ve işçiler ilk mesajda, çağrıldığı olay döngüsü içinde kurulur.
+        
+        Args:
+            deliver: async deliver(chat_id, message) gönderim fonksiyonu
+            workers: Eşzamanlı gönderim yapan işçi sayısı
+            global_rate: Bot genelinde saniyede mesaj
+            chat_rate: Sohbet başına saniyede mesaj
+            chat_burst: Sohbet başına beklemeden gönderilebilecek mesaj
+            max_attempts: Mesaj başına en fazla deneme
+        """
+        self.deliver = deliver
+        self.workers = workers
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+        self.global_bucket = TokenBucket(global_rate, max(1, int(global_rate)))
+        self.chat_buckets = {}
+        
+        self._queue = None
+        self._worker_tasks = []
+        self._sequence = itertools.count()
+        self._delayed = 0
+        self._in_flight = 0
+        
+        self.stats = {
+            'enqueued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retried': 0,
+            'throttled': 0,
+            'rate_limited': 0,
+            'cancelled': 0,
+            'throttle_wait_seconds': 0.0,
+            'max_queue_depth': 0
+        }
+        self._send_latency = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._delivery_latency = deque(maxlen=LATENCY_SAMPLE_SIZE)
+    
+    def _ensure_workers(self):
+        """Kuyruğu ve işçileri (olay döngüsü içinde) bir kez başlat"""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+        for _ in range(self.workers - len(self._worker_tasks)):
+            self._worker_tasks.append(asyncio.ensure_future(self._worker()))
+    
+    def _chat_bucket(self, chat_id):
+        """Sohbetin jeton kovasını getir (yoksa oluştur)"""
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+    
+    def _put(self, item):
+        """Öğeyi kuyruğa ekle ve derinlik metriğini güncelle"""
+        self._queue.put_nowait((item['priority'], next(self._sequence), item))
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.get_queue_depth())
+    
+    def _put_later(self, item, delay):
+        """Öğeyi belirli bir süre sonra yeniden kuyruğa ekle"""
+        self._delayed += 1
+        
+        def requeue():
+            self._delayed -= 1
+            self._put(item)
+        
+        asyncio.get_running_loop().call_later(delay, requeue)
+    
+    async def submit(self, chat_id, message, priority=PRIORITY_NORMAL):
+        """
+        Mesajı kuyruğa ekle ve gönderim sonucunu bekle
+        
+        Args:
+            chat_id: Hedef chat ID
+            message: Gönderilecek mesaj
+            priority: Mesaj önceliği (PRIORITY_*)
+        
+        Returns:
+            bool: Mesaj gönderildiyse True, denemeler tükendiyse False
+        """
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        item = {
+            'chat_id': chat_id,
+            'message': message,
+            'priority': priority,
+            'attempts': 0,
+            'enqueued_at': loop.time(),
+            'future': loop.create_future()
+        }
+        self.stats['enqueued'] += 1
+        self._put(item)
+        return await item['future']
+    
+    async def _wait_for_token(self, bucket):
+        """Kovadan jeton ayır, gerekirse jeton açılana kadar bekle"""
+        loop = asyncio.get_running_loop()
+        delay = bucket.reserve(loop.time())
+        if delay > 0:
+            self.stats['throttled'] += 1
+            self.stats['throttle_wait_seconds'] += delay
+            await asyncio.sleep(delay)
+    
+    def _finish(self, item, result):
+        """Öğenin sonucunu bildir ve teslim gecikmesini kaydet"""
+        if not item['future'].done():
+            item['future'].set_result(result)
+        self._delivery_latency.append(asyncio.get_running_loop().time() - item['enqueued_at'])
+    
+    async def _worker(self):
+        """Kuyruktan mesaj alıp hız sınırlarına uyarak gönderen işçi"""
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, item = await self._queue.get()
+            self._in_flight += 1
+            try:
+                # Bekleyeni iptal edilen (ör. süresi dolan outbox gönderimi) mesaj gönderilmez
+                if item['future'].cancelled():
+                    self.stats['cancelled'] += 1
+                    continue
+                # Sohbet sınırı dolmuşsa işçi beklemez; mesaj jeton açılınca
+                # yeniden kuyruğa girer ve işçi diğer sohbetlere geçer
+                chat_bucket = self._chat_bucket(item['chat_id'])
+                delay = chat_bucket.delay(loop.time())
+                if delay > 0:
+                    self.stats['throttled'] += 1
+                    self.stats['throttle_wait_seconds'] += delay
+                    self._put_later(item, delay)
+                    continue
+                chat_bucket.reserve(loop.time())
+                await self._wait_for_token(self.global_bucket)
+                
+                item['attempts'] += 1
+                started = loop.time()
+                await self.deliver(item['chat_id'], item['message'])
+                self._send_latency.append(loop.time() - started)
+                self.stats['sent'] += 1
+                self._finish(item, True)
+            except RetryAfter as e:
+                self.stats['rate_limited'] += 1
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else float(e.retry_after)
+                logger.warning(f"Telegram hız sınırı (429): {item['chat_id']} için {retry_after:.0f} sn bekleniyor")
+                self._chat_bucket(item['chat_id']).block(loop.time() + retry_after)
+                self._retry(item, 0)
+            except (BadRequest, Forbidden, InvalidToken) as e:
+                # BadRequest bir NetworkError alt sınıfıdır; kalıcı hatalar yeniden denenmez
+                logger.error(f"Telegram mesajı reddedildi ({item['chat_id']}): {e}")
+                self.stats['failed'] += 1
+                self._finish(item, False)
+            except NetworkError as e:
+                # Zaman aşımı ve bağlantı hataları geçicidir: üstel bekleme ile yeniden dene
+                logger.warning(f"Telegram ağ hatası (deneme {item['attempts']}): {e}")
+                self._retry(item, 2 ** item['attempts'])
+            except TelegramError as e:
+                logger.error(f"Telegram mesaj gönderme hatası: {e}")
+                self.stats['failed'] += 1
+                self._finish(item, False)
+            except Exception as e:
+                logger.error(f"Beklenmeyen gönderim hatası: {e}")
+                self.stats['failed'] += 1
+                self._finish(item, False)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+    
+    def _retry(self, item, delay):
+        """Deneme hakkı varsa öğeyi yeniden kuyruğa al, yoksa başarısız say"""
+        if item['attempts'] >= self.max_attempts:
+            logger.error(f"Telegram mesajı {item['attempts']} denemeden sonra gönderilemedi ({item['chat_id']})")
+            self.stats['failed'] += 1
+            self._finish(item, False)
+            return
+        self.stats['retried'] += 1
+        if delay > 0:
+            self._put_later(item, delay)
+        else:
+            self._put(item)
+    
+    async def close(self):
+        """İşçileri durdur (kuyrukta bekleyen mesajlar gönderilmez)"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+    
+    def get_queue_depth(self):
+        """Gönderilmeyi bekleyen (ertelenenler dahil) mesaj sayısı"""
+        return (self._queue.qsize() if self._queue is not None else 0) + self._delayed
+    
+    def get_stats(self):
+        """
+        Kuyruk metriklerini getir
+        
+        Returns:
+            dict: Kuyruk derinliği, gönderim/başarısız/yeniden deneme sayıları,
+                  kısıtlama sayıları ve gecikme yüzdelikleri
+        """
+        return {
+            **self.stats,
+            'queue_depth': self.get_queue_depth(),
+            'in_flight': self._in_flight,
+            'chats': len(self.chat_buckets),
+            'send_latency': _latency_summary(list(self._send_latency)),
+            'delivery_latency': _latency_summary(list(self._delivery_latency))
+        }
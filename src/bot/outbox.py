@@ -0,0 +1,495 @@
+"""
+BIST30 Alım-Satım Bot - Bildirim Outbox Modülü
+
+Bildirimler doğrudan Telegram'a gönderilmez; önce SQLite'taki outbox
+tablosuna, ürettikleri veriyle (ör. sinyal kaydı) aynı işlemde (transaction)
+yazılır. Arka plandaki OutboxDispatcher tabloyu toplu olarak boşaltır,
+başarısız gönderimleri artan beklemeyle yeniden dener.
+
+Her bildirimin benzersiz bir idempotency anahtarı vardır; aynı sinyal tekrar
+kaydedilse de bildirimi bir kez oluşur. Kayıtlar atomik bir UPDATE ile
+sahiplenildiği için birden fazla süreç (gunicorn worker) aynı bildirimi
+göndermez. Yalnızca Telegram'ın mesajı kabul ettiği an ile kaydın 'sent'
+olarak işaretlendiği an arasında süreç çökerse bildirim bir kez daha
+gönderilebilir.
+
+Telegram yapılandırılmamışsa (validate_telegram_config() False) varsayılan
+sohbete (TELEGRAM_CHAT_ID) gidecek bildirimler kuyruğa alınmaz.
+"""
+
+import os
+import json
+import uuid
+import logging
+import sqlite3
+import threading
+import concurrent.futures
+from datetime import datetime, timedelta
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.notification_queue import PRIORITY_SIGNAL, PRIORITY_NORMAL
+from src.bot.telegram_notifier import pack_blocks
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('OutboxDispatcher')
+
+# Bildirim türleri
+KIND_BUY_SIGNAL = 'buy_signal'
+KIND_SELL_SIGNAL = 'sell_signal'
+KIND_MESSAGE = 'message'
+
+# Bildirim durumları
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+STATUS_EXPIRED = 'expired'
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def ensure_outbox_schema(conn):
+    """
+    Bildirim outbox tablosunu oluştur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        idempotency_key TEXT UNIQUE,
+        chat_id TEXT,
+        kind TEXT,
+        priority INTEGER,
+        payload TEXT,
+        status TEXT,
+        attempts INTEGER DEFAULT 0,
+        next_attempt_at TEXT,
+        claimed_by TEXT,
+        claimed_at TEXT,
+        last_error TEXT,
+        created_at TEXT,
+        sent_at TEXT
+    )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, next_attempt_at)')
+
+def _dump_payload(payload):
+    """Bildirim içeriğini JSON metnine çevir"""
+    return json.dumps(payload, default=str, ensure_ascii=False)
+
+def _notification_row(idempotency_key, kind, payload_json, chat_id, priority, now):
+    """outbox tablosuna yazılacak satırı oluştur"""
+    return (
+        idempotency_key,
+        str(chat_id or TELEGRAM_CHAT_ID),
+        kind,
+        priority,
+        payload_json,
+        STATUS_PENDING,
+        now,
+        now
+    )
+
+def _insert_notifications(conn, rows):
+    """Satırları INSERT OR IGNORE ile ekle ve eklenen satır sayısını döndür"""
+    before = conn.total_changes
+    conn.executemany('''
+    INSERT OR IGNORE INTO outbox
+    (idempotency_key, chat_id, kind, priority, payload, status, attempts, next_attempt_at, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
+    ''', rows)
+    return conn.total_changes - before
+
+def enqueue_notification(conn, idempotency_key, kind, payload, chat_id=None, priority=PRIORITY_NORMAL):
+    """
+    Bildirimi outbox tablosuna ekle (commit çağıranın işlemine bırakılır)
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        idempotency_key: Bildirimin benzersiz anahtarı (aynı anahtar ikinci kez eklenmez)
+        kind: Bildirim türü (KIND_*)
+        payload: Bildirim içeriği (dict, JSON olarak saklanır)
+        chat_id: Hedef chat ID (None ise TELEGRAM_CHAT_ID)
+        priority: Gönderim önceliği (PRIORITY_*)
+    
+    Returns:
+        bool: Bildirim eklendiyse True; aynı anahtarla zaten varsa veya
+            varsayılan sohbet yapılandırılmamışsa False
+    """
+    if not chat_id and not validate_telegram_config(verbose=False):
+        return False
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    row = _notification_row(idempotency_key, kind, _dump_payload(payload), chat_id, priority, now)
+    return _insert_notifications(conn, [row]) == 1
+
+def _signal_notification(signal, signal_type):
+    """Sinyal için (anahtar öneki, tür, JSON içerik) üret"""
+    last_date = signal['last_date'].strftime('%Y-%m-%d') if isinstance(signal['last_date'], datetime) else str(signal['last_date'])[:10]
+    reason_key = 'buy_reason' if signal_type == 'BUY' else 'sell_reason'
+    payload = {
+        'symbol': signal['symbol'],
+        'current_price': float(signal['current_price']),
+        'last_date': last_date,
+        reason_key: signal[reason_key]
+    }
+    kind = KIND_BUY_SIGNAL if signal_type == 'BUY' else KIND_SELL_SIGNAL
+    return f"signal:{signal['symbol']}:{last_date}:{signal_type}", kind, _dump_payload(payload)
+
+def enqueue_signal_notification(conn, signal, signal_type, chat_id=None):
+    """
+    Alım/satım sinyali bildirimini outbox tablosuna ekle
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        signal: SignalGenerator.generate_signals çıktısı
+        signal_type: 'BUY' veya 'SELL'
+        chat_id: Hedef chat ID (None ise TELEGRAM_CHAT_ID)
+    
+    Returns:
+        bool: Bildirim eklendiyse True, daha önce eklenmişse False
+    """
+    return enqueue_signal_notifications(conn, [(chat_id, signal, signal_type)]) == 1
+
+def enqueue_signal_notifications(conn, deliveries):
+    """
+    Çok sayıda (sohbet, sinyal) bildirimini tek executemany ile ekle
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        deliveries: (chat_id, sinyal, 'BUY'/'SELL') demetleri
+    
+    Returns:
+        int: Eklenen bildirim sayısı (daha önce eklenenler hariç)
+    """
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    default_chat_ready = validate_telegram_config(verbose=False)
+    formatted = {}
+    rows = []
+    for chat_id, signal, signal_type in deliveries:
+        # Yapılandırılmamış varsayılan sohbet ('YOUR_CHAT_ID') için kayıt oluşturulmaz
+        if not chat_id and not default_chat_ready:
+            continue
+        # Aynı sinyalin içeriği tüm aboneler için bir kez hazırlanır
+        cache_key = (id(signal), signal_type)
+        if cache_key not in formatted:
+            formatted[cache_key] = _signal_notification(signal, signal_type)
+        key_prefix, kind, payload_json = formatted[cache_key]
+        chat_id = chat_id or TELEGRAM_CHAT_ID
+        rows.append(_notification_row(f"{key_prefix}:{chat_id}", kind, payload_json, chat_id, PRIORITY_SIGNAL, now))
+    return _insert_notifications(conn, rows)
+
+class OutboxDispatcher:
+    """Outbox tablosunu arka planda Telegram'a boşaltan sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH, notifier=None, batch_size=OUTBOX_BATCH_SIZE,
+                 poll_interval=OUTBOX_POLL_INTERVAL):
+        """
+        OutboxDispatcher sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            notifier: Gönderimde kullanılacak TelegramNotifier
+            batch_size: Tek seferde alınan bildirim sayısı
+            poll_interval: Yeni bildirim kontrolü aralığı (saniye)
+        """
+        self.db_path = db_path
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        # Kayıtları sahiplenirken kullanılan, süreç ve örnek başına benzersiz kimlik
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {
+            'batches': 0,
+            'delivered': 0,
+            'retried': 0,
+            'failed': 0,
+            'expired': 0,
+            'messages_sent': 0,
+            'last_dispatch_at': None,
+            'last_error': None
+        }
+        
+        conn = self._get_connection()
+        try:
+            ensure_outbox_schema(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("OutboxDispatcher başlatıldı")
+    
+    def _get_connection(self):
+        """Yazma kilidi için bekleyen SQLite bağlantısı aç"""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def start(self):
+        """Arka plan dağıtıcı thread'ini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='OutboxDispatcher', daemon=True)
+            self._thread.start()
+            logger.info("Outbox dağıtıcısı çalışıyor")
+    
+    def wake(self):
+        """Yeni bildirimler için dağıtıcıyı beklemeden uyandır"""
+        self.start()
+        self._wake_event.set()
+    
+    def stop(self, timeout=None):
+        """Dağıtıcıyı durdur"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        """Outbox boşalana kadar gönder, sonra yeni bildirim veya süre dolmasını bekle"""
+        while not self._stop_event.is_set():
+            try:
+                if self.dispatch_once():
+                    continue
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                logger.error(f"Outbox dağıtım hatası: {e}")
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+    
+    def _claim(self):
+        """
+        Gönderim zamanı gelmiş bildirimleri bu dağıtıcı adına sahiplen
+        
+        Returns:
+            list: Sahiplenilen outbox kayıtları (dict)
+        """
+        now = datetime.now()
+        now_text = now.strftime(TIMESTAMP_FORMAT)
+        claim_cutoff = (now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT)).strftime(TIMESTAMP_FORMAT)
+        age_cutoff = (now - timedelta(hours=OUTBOX_MAX_AGE_HOURS)).strftime(TIMESTAMP_FORMAT)
+        claim_id = f"{self.worker_id}-{uuid.uuid4().hex[:8]}"
+        
+        conn = self._get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            # Gönderim sırasında çöken süreçlerin kayıtları yeniden denenir
+            conn.execute('''
+            UPDATE outbox SET status = ?, claimed_by = NULL
+            WHERE status = ? AND claimed_at < ?
+            ''', (STATUS_PENDING, STATUS_SENDING, claim_cutoff))
+            
+            # Bayat sinyaller (ör. uzun kesinti sonrası) gönderilmez
+            expired = conn.execute('''
+            UPDATE outbox SET status = ?
+            WHERE status = ? AND created_at < ?
+            ''', (STATUS_EXPIRED, STATUS_PENDING, age_cutoff)).rowcount
+            self.stats['expired'] += expired
+            
+            # Tek UPDATE atomik olduğundan aynı kayıt iki dağıtıcıya verilmez
+            conn.execute('''
+            UPDATE outbox SET status = ?, claimed_by = ?, claimed_at = ?
+            WHERE id IN (
+                SELECT id FROM outbox
+                WHERE status = ? AND next_attempt_at <= ?
+                ORDER BY priority, id
+                LIMIT ?
+            )
+            ''', (STATUS_SENDING, claim_id, now_text, STATUS_PENDING, now_text, self.batch_size))
+            conn.commit()
+            
+            rows = conn.execute('''
+            SELECT id, chat_id, kind, priority, payload, attempts, claimed_by FROM outbox
+            WHERE claimed_by = ? AND status = ?
+            ORDER BY priority, id
+            ''', (claim_id, STATUS_SENDING)).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+    
+    def _format(self, row):
+        """Outbox kaydını Telegram mesaj metnine çevir"""
+        payload = json.loads(row['payload'])
+        if row['kind'] in (KIND_BUY_SIGNAL, KIND_SELL_SIGNAL) and payload.get('last_date'):
+            # Tarih JSON'da YYYY-MM-DD olarak saklanır; mesajda GG.AA.YYYY gösterilir
+            payload['last_date'] = datetime.strptime(payload['last_date'], '%Y-%m-%d')
+        if row['kind'] == KIND_BUY_SIGNAL:
+            return self.notifier.format_buy_signal(payload)
+        if row['kind'] == KIND_SELL_SIGNAL:
+            return self.notifier.format_sell_signal(payload)
+        return payload.get('text', '')
+    
+    def _renew_claim(self, claim_id):
+        """Gönderim sürerken kayıtların sahiplenme zamanını yenile"""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+            UPDATE outbox SET claimed_at = ?
+            WHERE claimed_by = ? AND status = ?
+            ''', (datetime.now().strftime(TIMESTAMP_FORMAT), claim_id, STATUS_SENDING))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _wait_for_sends(self, futures, claim_id):
+        """
+        Gönderimleri en fazla OUTBOX_SEND_TIMEOUT kadar bekle
+        
+        Bekleme sırasında sahiplenme zamanı düzenli olarak yenilenir; böylece
+        uzun süren (ör. hız sınırına takılan) bir grubun kayıtları başka bir
+        dağıtıcı tarafından yeniden sahiplenilip tekrar gönderilmez. Süre
+        dolduğunda bitmeyen gönderimler iptal edilir; iptal anında Telegram'a
+        iletilmekte olan mesaj gönderilmemiş sayılır ve bir kez daha gönderilebilir.
+        
+        Args:
+            futures: send_sequence future'ları
+            claim_id: Kayıtları sahiplenirken kullanılan kimlik
+        """
+        deadline = datetime.now() + timedelta(seconds=OUTBOX_SEND_TIMEOUT)
+        not_done = set(futures)
+        while not_done:
+            remaining = (deadline - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            _, not_done = concurrent.futures.wait(not_done, timeout=min(OUTBOX_CLAIM_RENEW_INTERVAL, remaining))
+            if not_done:
+                self._renew_claim(claim_id)
+        
+        if not_done:
+            logger.warning(f"Outbox: {len(not_done)} sohbetin gönderimi {OUTBOX_SEND_TIMEOUT} sn içinde bitmedi, iptal edildi")
+            for future in not_done:
+                future.cancel()
+    
+    def _deliver(self, rows):
+        """
+        Kayıtları sohbet ve önceliğe göre paketleyip gönder
+        
+        Bir sohbetin paketleri sırayla (her biri bir öncekini bekleyerek)
+        gönderilir; farklı sohbetler eşzamanlı ilerler. OUTBOX_SEND_TIMEOUT
+        içinde gönderilemeyen paketlerin kayıtları başarısız sayılır.
+        
+        Returns:
+            dict: Kayıt id -> gönderim başarılı mı (bool)
+        """
+        # Kayıtlar öncelik ve id sırasıyla geldiği için gruplar da bu sırayı korur
+        groups = {}
+        for row in rows:
+            groups.setdefault(row['chat_id'], {}).setdefault(row['priority'], []).append(row)
+        
+        pending = []
+        results = {row['id']: True for row in rows}
+        for chat_id, priority_groups in groups.items():
+            packs = []
+            pack_row_ids = []
+            for priority, group in priority_groups.items():
+                for message, members in pack_blocks([self._format(row) for row in group]):
+                    packs.append((message, priority))
+                    pack_row_ids.append([group[index]['id'] for index in members])
+            # Sonuçlar her paketten sonra listeye eklenir; iptalde de o ana kadarki sonuçlar kalır
+            sent_packs = []
+            future = self.notifier.send_sequence(packs, chat_id=chat_id, results=sent_packs)
+            pending.append((future, sent_packs, pack_row_ids))
+        
+        self._wait_for_sends([future for future, _, _ in pending], rows[0]['claimed_by'])
+        
+        # Bir kayıt ancak içinde yer aldığı tüm mesajlar gönderildiyse teslim edilmiş sayılır;
+        # sonucu gelmeyen (iptal edilen) paketler gönderilmemiş sayılır
+        for future, sent_packs, pack_row_ids in pending:
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(f"Outbox mesajı gönderilemedi: {future.exception()}")
+            sent_packs = list(sent_packs) + [False] * (len(pack_row_ids) - len(sent_packs))
+            for sent, row_ids in zip(sent_packs, pack_row_ids):
+                if sent:
+                    self.stats['messages_sent'] += 1
+                for row_id in row_ids:
+                    results[row_id] = results[row_id] and sent
+        return results
+    
+    def _record(self, rows, results):
+        """Gönderim sonuçlarını outbox tablosuna yaz"""
+        now = datetime.now()
+        now_text = now.strftime(TIMESTAMP_FORMAT)
+        conn = self._get_connection()
+        try:
+            for row in rows:
+                attempts = row['attempts'] + 1
+                if results[row['id']]:
+                    conn.execute('''
+                    UPDATE outbox SET status = ?, attempts = ?, sent_at = ?, claimed_by = NULL, last_error = NULL
+                    WHERE id = ?
+                    ''', (STATUS_SENT, attempts, now_text, row['id']))
+                    self.stats['delivered'] += 1
+                elif attempts >= OUTBOX_MAX_ATTEMPTS:
+                    conn.execute('''
+                    UPDATE outbox SET status = ?, attempts = ?, claimed_by = NULL, last_error = ?
+                    WHERE id = ?
+                    ''', (STATUS_FAILED, attempts, 'Gönderim denemeleri tükendi', row['id']))
+                    self.stats['failed'] += 1
+                else:
+                    next_attempt = now + timedelta(seconds=OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+                    conn.execute('''
+                    UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, claimed_by = NULL, last_error = ?
+                    WHERE id = ?
+                    ''', (STATUS_PENDING, attempts, next_attempt.strftime(TIMESTAMP_FORMAT), 'Telegram gönderimi başarısız', row['id']))
+                    self.stats['retried'] += 1
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def dispatch_once(self):
+        """
+        Bir grup bildirimi sahiplen, gönder ve sonuçlarını kaydet
+        
+        Returns:
+            int: İşlenen bildirim sayısı
+        """
+        if self.notifier is None:
+            return 0
+        
+        rows = self._claim()
+        if not rows:
+            return 0
+        
+        results = self._deliver(rows)
+        self._record(rows, results)
+        
+        self.stats['batches'] += 1
+        self.stats['last_dispatch_at'] = datetime.now().strftime(TIMESTAMP_FORMAT)
+        delivered = sum(1 for sent in results.values() if sent)
+        logger.info(f"Outbox: {len(rows)} bildirimden {delivered} tanesi gönderildi")
+        return len(rows)
+    
+    def get_stats(self):
+        """
+        Outbox durum sayılarını ve dağıtıcı metriklerini getir
+        
+        Returns:
+            dict: Durum başına kayıt sayısı, en eski bekleyen bildirim ve sayaçlar
+        """
+        conn = self._get_connection()
+        try:
+            counts = dict(conn.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+            oldest_pending = conn.execute(
+                'SELECT MIN(created_at) FROM outbox WHERE status = ?', (STATUS_PENDING,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        
+        return {
+            **self.stats,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'status_counts': counts,
+            'oldest_pending_at': oldest_pending
+        }
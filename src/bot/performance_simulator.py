@@ -12,6 +12,12 @@ import sys
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.risk_metrics import summarize_trades
+from src.bot.exit_engine import (
+    load_signal_price_frames, build_price_matrices, simulate_exits, build_trade_records
+)
+from src.bot.monte_carlo import MonteCarloSimulator
+from src.bot.data_version import get_data_version
 
 # Loglama ayarları
 log_handlers = [logging.StreamHandler()]
@@ -34,6 +40,8 @@ class PerformanceSimulator:
             db_path: Veritabanı dosya yolu
         """
         self.db_path = db_path
+        self.monte_carlo = MonteCarloSimulator(db_path)
+        self._prediction_cache = {}
         logger.info("PerformanceSimulator başlatıldı")
     
     def _get_connection(self):
@@ -68,12 +76,13 @@ class PerformanceSimulator:
         
         try:
             # O gün için üretilen sinyalleri al
-            signals_query = f"""
-            SELECT * FROM signals 
-            WHERE date(signal_date) = date('{date}')
+            signals_query = """
+            SELECT id, symbol, date AS signal_date, signal_type, price, reason, created_at
+            FROM signals
+            WHERE date = ?
             """
             
-            signals_df = pd.read_sql_query(signals_query, conn)
+            signals_df = pd.read_sql_query(signals_query, conn, params=(date,))
             
             if signals_df.empty:
                 logger.warning(f"{date} tarihi için sinyal bulunamadı")
@@ -82,136 +91,40 @@ class PerformanceSimulator:
                     'message': f"{date} tarihi için sinyal bulunamadı",
                     'buy_signals': [],
                     'sell_signals': [],
-                    'performance': {
-                        'total_profit_loss': 0,
-                        'total_profit_loss_percentage': 0,
-                        'successful_trades': 0,
-                        'total_trades': 0,
-                        'success_rate': 0
-                    }
+                    'performance': summarize_trades([])[0],
+                    'equity_curve': []
                 }
             
             # Sinyalleri alım ve satım olarak ayır
-            buy_signals = signals_df[signals_df['buy_signal'] == 1].to_dict('records')
-            sell_signals = signals_df[signals_df['sell_signal'] == 1].to_dict('records')
+            buy_signals = signals_df[signals_df['signal_type'] == 'BUY'].to_dict('records')
+            sell_signals = signals_df[signals_df['signal_type'] == 'SELL'].to_dict('records')
             
-            # Her sinyal için performans hesapla
-            performance_results = []
+            # Tüm alım sinyallerinin fiyat verisini tek sorguda topla
+            price_frames, simulated_signals = load_signal_price_frames(conn, buy_signals)
             
-            # Alım sinyalleri için performans hesapla
-            for signal in buy_signals:
-                symbol = signal['symbol']
-                signal_date = signal['signal_date']
-                
-                # Sinyal sonrası fiyat verilerini al
-                price_query = f"""
-                SELECT * FROM stock_prices 
-                WHERE symbol = '{symbol}' 
-                AND date(date) >= date('{signal_date}')
-                ORDER BY date ASC
-                """
-                
-                price_df = pd.read_sql_query(price_query, conn)
-                
-                if price_df.empty or len(price_df) < 2:
-                    logger.warning(f"{symbol} için yeterli fiyat verisi bulunamadı")
-                    continue
-                
-                # Alım fiyatı (sinyal günü kapanış)
-                buy_price = price_df.iloc[0]['close']
-                
-                # Satış senaryoları
-                scenarios = []
-                
-                # 1. Hedef kâra ulaşma
-                target_price = buy_price * (1 + TARGET_PROFIT_PERCENTAGE/100)
-                for i in range(1, len(price_df)):
-                    if price_df.iloc[i]['high'] >= target_price:
-                        sell_date = price_df.iloc[i]['date']
-                        sell_price = target_price
-                        profit_loss = sell_price - buy_price
-                        profit_loss_percentage = (profit_loss / buy_price) * 100
-                        
-                        scenarios.append({
-                            'scenario': 'target_profit',
-                            'buy_date': signal_date,
-                            'buy_price': buy_price,
-                            'sell_date': sell_date,
-                            'sell_price': sell_price,
-                            'profit_loss': profit_loss,
-                            'profit_loss_percentage': profit_loss_percentage,
-                            'holding_days': i
-                        })
-                        break
-                
-                # 2. Stop-loss'a düşme
-                stop_price = buy_price * (1 - STOP_LOSS_PERCENTAGE/100)
-                for i in range(1, len(price_df)):
-                    if price_df.iloc[i]['low'] <= stop_price:
-                        sell_date = price_df.iloc[i]['date']
-                        sell_price = stop_price
-                        profit_loss = sell_price - buy_price
-                        profit_loss_percentage = (profit_loss / buy_price) * 100
-                        
-                        scenarios.append({
-                            'scenario': 'stop_loss',
-                            'buy_date': signal_date,
-                            'buy_price': buy_price,
-                            'sell_date': sell_date,
-                            'sell_price': sell_price,
-                            'profit_loss': profit_loss,
-                            'profit_loss_percentage': profit_loss_percentage,
-                            'holding_days': i
-                        })
-                        break
-                
-                # 3. Maksimum bekleme süresi
-                max_holding_days = min(MAX_HOLDING_WEEKS * 5, len(price_df) - 1)
-                if max_holding_days > 0:
-                    sell_date = price_df.iloc[max_holding_days]['date']
-                    sell_price = price_df.iloc[max_holding_days]['close']
-                    profit_loss = sell_price - buy_price
-                    profit_loss_percentage = (profit_loss / buy_price) * 100
-                    
-                    scenarios.append({
-                        'scenario': 'max_holding',
-                        'buy_date': signal_date,
-                        'buy_price': buy_price,
-                        'sell_date': sell_date,
-                        'sell_price': sell_price,
-                        'profit_loss': profit_loss,
-                        'profit_loss_percentage': profit_loss_percentage,
-                        'holding_days': max_holding_days
-                    })
-                
-                # En iyi senaryoyu seç (en yüksek kâr veya en düşük zarar)
-                if scenarios:
-                    best_scenario = max(scenarios, key=lambda x: x['profit_loss_percentage'])
-                    best_scenario['symbol'] = symbol
-                    performance_results.append(best_scenario)
+            if len(simulated_signals) < len(buy_signals):
+                logger.warning(f"{len(buy_signals) - len(simulated_signals)} alım sinyali için yeterli fiyat verisi bulunamadı")
             
-            # Performans özeti
-            if performance_results:
-                total_profit_loss = sum(result['profit_loss'] for result in performance_results)
-                avg_profit_loss_percentage = sum(result['profit_loss_percentage'] for result in performance_results) / len(performance_results)
-                successful_trades = sum(1 for result in performance_results if result['profit_loss'] > 0)
-                success_rate = (successful_trades / len(performance_results)) * 100 if performance_results else 0
-                
-                performance_summary = {
-                    'total_profit_loss': total_profit_loss,
-                    'avg_profit_loss_percentage': avg_profit_loss_percentage,
-                    'successful_trades': successful_trades,
-                    'total_trades': len(performance_results),
-                    'success_rate': success_rate
-                }
-            else:
-                performance_summary = {
-                    'total_profit_loss': 0,
-                    'avg_profit_loss_percentage': 0,
-                    'successful_trades': 0,
-                    'total_trades': 0,
-                    'success_rate': 0
-                }
+            # Tüm sinyallerin çıkışlarını tek seferde hesapla (alım fiyatı: sinyal günü kapanış)
+            performance_results = []
+            if price_frames:
+                matrices = build_price_matrices(price_frames)
+                exits = simulate_exits(
+                    matrices['close'][:, 0],
+                    matrices['high'],
+                    matrices['low'],
+                    matrices['close'],
+                    max_holding=BACKTEST_MAX_HOLDING_BARS
+                )
+                performance_results = build_trade_records(
+                    [signal['symbol'] for signal in simulated_signals],
+                    [signal['signal_date'] for signal in simulated_signals],
+                    matrices,
+                    exits
+                )
+            
+            # Performans özeti ve özsermaye eğrisi (vektörel risk metrikleri)
+            performance_summary, equity_curve = summarize_trades(performance_results)
             
             return {
                 'success': True,
@@ -219,6 +132,7 @@ class PerformanceSimulator:
                 'buy_signals': buy_signals,
                 'sell_signals': sell_signals,
                 'performance': performance_summary,
+                'equity_curve': equity_curve,
                 'trade_details': performance_results
             }
             
@@ -231,13 +145,14 @@ class PerformanceSimulator:
         finally:
             conn.close()
     
-    def get_daily_report(self, date=None, time_of_day="close"):
+    def get_daily_report(self, date=None, time_of_day="close", include_confidence_intervals=False):
         """
         Günlük rapor oluştur (öğlen veya kapanış)
         
         Args:
             date: Rapor tarihi (None ise bugün)
             time_of_day: "noon" (öğlen) veya "close" (kapanış)
+            include_confidence_intervals: True ise Monte Carlo güven aralıkları eklenir
             
         Returns:
             dict: Günlük rapor
@@ -260,12 +175,20 @@ class PerformanceSimulator:
             'trade_details': performance.get('trade_details', [])
         }
         
+        # Bootstrap güven aralıkları pahalı olduğundan yalnızca istendiğinde hesaplanır
+        if include_confidence_intervals:
+            report['confidence_intervals'] = self.monte_carlo.get_confidence_intervals()
+        
         return report
     
     def get_next_day_prediction(self, date=None):
         """
         Ertesi gün için tahmin ve tavsiye oluştur
         
+        Göstergeler yeniden hesaplanmaz; technical_indicators tablosundaki son
+        anlık görüntü tek sorguda okunur ve tüm hisseler vektörel olarak
+        puanlanır. Sonuç bir sonraki veri güncellemesine kadar önbellekte tutulur.
+        
         Args:
             date: Baz alınacak tarih (None ise bugün)
             
@@ -275,6 +198,12 @@ class PerformanceSimulator:
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
         
+        # Veri versiyonu değişmediyse önceki sonucu döndür
+        cache_key = (date, get_data_version(self.db_path))
+        cached = self._prediction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Bir sonraki iş gününü hesapla (basit yaklaşım)
         date_obj = datetime.strptime(date, '%Y-%m-%d')
         next_day = date_obj + timedelta(days=1)
@@ -295,155 +224,91 @@ class PerformanceSimulator:
             }
         
         try:
-            # BIST30 hisseleri için teknik göstergeleri hesapla
-            predictions = []
+            # Her hisse için tarihe kadarki son gösterge satırını tek sorguda al
+            query = f"""
+            SELECT t.symbol, t.date, s.close, t.ma_short, t.ma_long, t.rsi,
+                   t.bollinger_upper, t.bollinger_lower
+            FROM technical_indicators t
+            JOIN stock_data s ON s.symbol = t.symbol AND s.date = t.date
+            WHERE t.symbol IN ({', '.join('?' for _ in BIST30_SYMBOLS)})
+            AND t.date = (
+                SELECT MAX(t2.date) FROM technical_indicators t2
+                WHERE t2.symbol = t.symbol AND t2.date <= ?
+            )
+            """
             
-            for symbol in BIST30_SYMBOLS:
-                # Son 30 günlük veriyi al
-                query = f"""
-                SELECT * FROM stock_prices 
-                WHERE symbol = '{symbol}' 
-                ORDER BY date DESC
-                LIMIT 30
-                """
-                
-                df = pd.read_sql_query(query, conn)
-                
-                if df.empty or len(df) < 20:
-                    logger.warning(f"{symbol} için yeterli veri bulunamadı")
-                    continue
-                
-                # Veriyi tarih sırasına göre sırala
-                df = df.sort_values('date')
-                
-                # Teknik göstergeleri hesapla
-                if len(df) >= 5:
-                    df['ma_short'] = df['close'].rolling(window=MA_SHORT).mean()
-                
-                if len(df) >= 20:
-                    df['ma_long'] = df['close'].rolling(window=MA_LONG).mean()
-                    df['std'] = df['close'].rolling(window=BOLLINGER_PERIOD).std()
-                    df['upper_band'] = df['ma_long'] + (df['std'] * BOLLINGER_STD)
-                    df['lower_band'] = df['ma_long'] - (df['std'] * BOLLINGER_STD)
-                
-                if len(df) >= 14:
-                    # RSI hesapla (basit yaklaşım)
-                    delta = df['close'].diff()
-                    gain = delta.where(delta > 0, 0)
-                    loss = -delta.where(delta < 0, 0)
-                    avg_gain = gain.rolling(window=RSI_PERIOD).mean()
-                    avg_loss = loss.rolling(window=RSI_PERIOD).mean()
-                    rs = avg_gain / avg_loss
-                    df['rsi'] = 100 - (100 / (1 + rs))
-                
-                # Son satırı al
-                last_row = df.iloc[-1]
-                
-                # Tahmin ve tavsiye oluştur
-                prediction = {
-                    'symbol': symbol,
-                    'current_price': last_row['close'],
-                    'last_date': last_row['date'],
-                    'prediction': {}
-                }
-                
-                # Trend analizi
-                if 'ma_short' in df.columns and 'ma_long' in df.columns:
-                    last_ma_short = last_row['ma_short']
-                    last_ma_long = last_row['ma_long']
-                    
-                    if last_ma_short > last_ma_long:
-                        trend = "yükseliş"
-                    elif last_ma_short < last_ma_long:
-                        trend = "düşüş"
-                    else:
-                        trend = "yatay"
-                    
-                    prediction['prediction']['trend'] = trend
-                
-                # RSI analizi
-                if 'rsi' in df.columns:
-                    last_rsi = last_row['rsi']
-                    
-                    if last_rsi < RSI_OVERSOLD:
-                        rsi_signal = "aşırı satım"
-                    elif last_rsi > RSI_OVERBOUGHT:
-                        rsi_signal = "aşırı alım"
-                    else:
-                        rsi_signal = "nötr"
-                    
-                    prediction['prediction']['rsi'] = {
-                        'value': last_rsi,
-                        'signal': rsi_signal
-                    }
-                
-                # Bollinger Bantları analizi
-                if 'upper_band' in df.columns and 'lower_band' in df.columns:
-                    last_upper = last_row['upper_band']
-                    last_lower = last_row['lower_band']
-                    last_price = last_row['close']
-                    
-                    if last_price > last_upper:
-                        bb_signal = "aşırı alım"
-                    elif last_price < last_lower:
-                        bb_signal = "aşırı satım"
-                    else:
-                        bb_signal = "nötr"
-                    
-                    prediction['prediction']['bollinger'] = {
-                        'upper': last_upper,
-                        'lower': last_lower,
-                        'signal': bb_signal
-                    }
-                
-                # Tavsiye oluştur
-                buy_signals = 0
-                sell_signals = 0
-                
-                # Trend sinyali
-                if prediction['prediction'].get('trend') == "yükseliş":
-                    buy_signals += 1
-                elif prediction['prediction'].get('trend') == "düşüş":
-                    sell_signals += 1
-                
-                # RSI sinyali
-                if 'rsi' in prediction['prediction']:
-                    if prediction['prediction']['rsi']['signal'] == "aşırı satım":
-                        buy_signals += 1
-                    elif prediction['prediction']['rsi']['signal'] == "aşırı alım":
-                        sell_signals += 1
-                
-                # Bollinger sinyali
-                if 'bollinger' in prediction['prediction']:
-                    if prediction['prediction']['bollinger']['signal'] == "aşırı satım":
-                        buy_signals += 1
-                    elif prediction['prediction']['bollinger']['signal'] == "aşırı alım":
-                        sell_signals += 1
+            snapshot = pd.read_sql_query(query, conn, params=[*BIST30_SYMBOLS, date])
+            
+            missing = set(BIST30_SYMBOLS) - set(snapshot['symbol'])
+            if missing:
+                logger.warning(f"{len(missing)} hisse için gösterge verisi bulunamadı: {', '.join(sorted(missing))}")
+            
+            close = snapshot['close'].to_numpy(dtype=float)
+            ma_short = snapshot['ma_short'].to_numpy(dtype=float)
+            ma_long = snapshot['ma_long'].to_numpy(dtype=float)
+            rsi = snapshot['rsi'].to_numpy(dtype=float)
+            upper = snapshot['bollinger_upper'].to_numpy(dtype=float)
+            lower = snapshot['bollinger_lower'].to_numpy(dtype=float)
+            
+            # Tüm hisseleri vektörel olarak puanla
+            with np.errstate(invalid='ignore'):
+                trend_up = ma_short > ma_long
+                trend_down = ma_short < ma_long
+                rsi_oversold = rsi < RSI_OVERSOLD
+                rsi_overbought = rsi > RSI_OVERBOUGHT
+                bb_overbought = close > upper
+                bb_oversold = close < lower
+            
+            trend = np.select([trend_up, trend_down], ["yükseliş", "düşüş"], "yatay")
+            rsi_signal = np.select([rsi_oversold, rsi_overbought], ["aşırı satım", "aşırı alım"], "nötr")
+            bb_signal = np.select([bb_overbought, bb_oversold], ["aşırı alım", "aşırı satım"], "nötr")
+            
+            buy_counts = trend_up.astype(int) + rsi_oversold + bb_oversold
+            sell_counts = trend_down.astype(int) + rsi_overbought + bb_overbought
+            actions = np.select([buy_counts > sell_counts, sell_counts > buy_counts], ["AL", "SAT"], "BEKLE")
+            confidences = np.maximum(buy_counts, sell_counts) / 3 * 100  # 3 gösterge var
+            target_prices = close * (1 + TARGET_PROFIT_PERCENTAGE/100)
+            stop_losses = close * (1 - STOP_LOSS_PERCENTAGE/100)
+            
+            predictions = []
+            for i, symbol in enumerate(snapshot['symbol']):
+                buy_signals = int(buy_counts[i])
+                sell_signals = int(sell_counts[i])
                 
-                # Nihai tavsiye
-                if buy_signals > sell_signals:
-                    recommendation = "AL"
+                if actions[i] == "AL":
                     reason = f"Teknik göstergeler alım sinyali veriyor: {buy_signals} alım, {sell_signals} satım sinyali"
-                elif sell_signals > buy_signals:
-                    recommendation = "SAT"
+                elif actions[i] == "SAT":
                     reason = f"Teknik göstergeler satım sinyali veriyor: {sell_signals} satım, {buy_signals} alım sinyali"
                 else:
-                    recommendation = "BEKLE"
                     reason = "Teknik göstergeler karışık sinyaller veriyor"
                 
-                prediction['recommendation'] = {
-                    'action': recommendation,
-                    'reason': reason,
-                    'confidence': max(buy_signals, sell_signals) / 3 * 100  # 3 gösterge var
+                prediction = {
+                    'symbol': symbol,
+                    'current_price': float(close[i]),
+                    'last_date': snapshot['date'].iloc[i],
+                    'prediction': {
+                        'trend': str(trend[i]),
+                        'rsi': {
+                            'value': float(rsi[i]),
+                            'signal': str(rsi_signal[i])
+                        },
+                        'bollinger': {
+                            'upper': float(upper[i]),
+                            'lower': float(lower[i]),
+                            'signal': str(bb_signal[i])
+                        }
+                    },
+                    'recommendation': {
+                        'action': str(actions[i]),
+                        'reason': reason,
+                        'confidence': float(confidences[i])
+                    }
                 }
                 
                 # Hedef fiyat
-                if recommendation == "AL":
-                    target_price = last_row['close'] * (1 + TARGET_PROFIT_PERCENTAGE/100)
-                    stop_loss = last_row['close'] * (1 - STOP_LOSS_PERCENTAGE/100)
-                    
-                    prediction['recommendation']['target_price'] = target_price
-                    prediction['recommendation']['stop_loss'] = stop_loss
+                if actions[i] == "AL":
+                    prediction['recommendation']['target_price'] = float(target_prices[i])
+                    prediction['recommendation']['stop_loss'] = float(stop_losses[i])
                 
                 predictions.append(prediction)
             
@@ -456,7 +321,7 @@ class PerformanceSimulator:
             buy_recommendations = sorted(buy_recommendations, key=lambda x: x['recommendation']['confidence'], reverse=True)
             sell_recommendations = sorted(sell_recommendations, key=lambda x: x['recommendation']['confidence'], reverse=True)
             
-            return {
+            result = {
                 'success': True,
                 'current_date': date,
                 'next_trading_day': next_day_str,
@@ -467,6 +332,15 @@ class PerformanceSimulator:
                 'all_predictions': predictions
             }
             
+            # Eski versiyonlara ait kayıtları at, yenisini önbelleğe al
+            self._prediction_cache = {
+                key: value for key, value in self._prediction_cache.items()
+                if key[1] == cache_key[1]
+            }
+            self._prediction_cache[cache_key] = result
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Ertesi gün tahmini hatası: {e}")
             return {
@@ -0,0 +1,329 @@
+"""
+BIST30 Alım-Satım Bot - Tarih Aralığı Raporu Modülü
+
+4 haftalık, çeyrek başından bugüne (QTD) veya serbest tarih aralıkları için
+rapor üretir. Hisse getirileri, en iyi/en kötü performanslar, kayan pencere
+istatistikleri ve sinyal kâr/zararı tek bir (tarih x sembol) fiyat paneli
+üzerinde vektörel olarak hesaplanır; haftalık raporun döngüyle çağrılmasına
+gerek kalmaz.
+"""
+
+import re
+import logging
+import sqlite3
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.backtester import PortfolioBacktester
+from src.bot.benchmark import BenchmarkSeries
+from src.bot.risk_metrics import periods_per_year, summarize_trades
+from src.bot.weekly_aggregation import PREVIOUS_CLOSE_LOOKBACK_DAYS, week_start_of
+from src.bot.exit_engine import (
+    load_signal_price_frames, build_price_matrices, simulate_exits, build_trade_records
+)
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('RangeReportGenerator')
+
+# Varsayılan ve en fazla kayan pencere uzunluğu (hafta)
+DEFAULT_ROLLING_WEEKS = 4
+MAX_ROLLING_WEEKS = 52
+
+def validate_rolling_weeks(value):
+    """
+    Kayan pencere uzunluğunu doğrula
+    
+    Args:
+        value: İstekteki rolling_weeks değeri
+    
+    Returns:
+        int: Hafta sayısı
+    
+    Raises:
+        ValueError: Değer 1 ile MAX_ROLLING_WEEKS arasında tam sayı değilse
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"rolling_weeks tam sayı olmalı: {value}")
+    if not 1 <= value <= MAX_ROLLING_WEEKS:
+        raise ValueError(f"rolling_weeks [1, {MAX_ROLLING_WEEKS}] aralığında olmalı: {value}")
+    return value
+
+def resolve_report_range(period=None, from_date=None, to_date=None, reference_date=None):
+    """
+    Rapor periyodunu (from, to) tarih aralığına çevir
+    
+    Args:
+        period: '4w' gibi hafta sayısı, 'qtd' (çeyrek başından bugüne) veya None
+        from_date: Serbest aralık başlangıcı (YYYY-MM-DD)
+        to_date: Serbest aralık bitişi (YYYY-MM-DD, None ise bugün)
+        reference_date: Periyotların hesaplandığı referans tarihi (None ise bugün)
+    
+    Returns:
+        tuple: (from_date, to_date) YYYY-MM-DD formatında
+    
+    Raises:
+        ValueError: Periyot veya tarihler geçersizse
+    """
+    for name, value in (('from', from_date), ('to', to_date)):
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"'{name}' YYYY-MM-DD biçiminde olmalı: {value}")
+    
+    reference = datetime.strptime(reference_date or to_date or datetime.now().strftime('%Y-%m-%d'), '%Y-%m-%d')
+    
+    if period:
+        if not isinstance(period, str):
+            raise ValueError(f"Geçersiz rapor periyodu: {period} ('4w', 'qtd' gibi olmalı)")
+        period = period.lower()
+        weeks = re.fullmatch(r'(\d+)w', period)
+        if weeks:
+            # Referans haftasıyla biten N tam hafta (Pazartesi - Pazar)
+            end = reference + timedelta(days=6 - reference.weekday())
+            start = end - timedelta(weeks=int(weeks.group(1))) + timedelta(days=1)
+        elif period == 'qtd':
+            start = reference.replace(month=(reference.month - 1) // 3 * 3 + 1, day=1)
+            end = reference
+        else:
+            raise ValueError(f"Geçersiz rapor periyodu: {period} ('4w', 'qtd' gibi olmalı)")
+        return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+    
+    if not from_date:
+        raise ValueError("'from' tarihi veya 'period' belirtilmeli")
+    
+    start = datetime.strptime(from_date, '%Y-%m-%d')
+    end = reference
+    if start > end:
+        raise ValueError(f"Başlangıç tarihi bitiş tarihinden sonra: {from_date} > {end.strftime('%Y-%m-%d')}")
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+class RangeReportGenerator:
+    """Serbest tarih aralıkları için vektörel rapor üreten sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        RangeReportGenerator sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        self.backtester = PortfolioBacktester(db_path)
+        self.benchmark = BenchmarkSeries(db_path)
+        logger.info("RangeReportGenerator başlatıldı")
+    
+    def _get_stock_performance(self, from_date, to_date, rolling_weeks):
+        """
+        Hisse getirilerini ve kayan pencere istatistiklerini panel üzerinde hesapla
+        
+        Args:
+            from_date: Aralık başlangıcı
+            to_date: Aralık bitişi
+            rolling_weeks: Kayan pencere uzunluğu (hafta)
+        
+        Returns:
+            dict: Hisse performansları ve kayan pencere serisi
+        """
+        # Referans kapanışı ve kayan pencerenin ilk değerleri için aralık öncesi de yüklenir
+        lookback_start = (
+            datetime.strptime(from_date, '%Y-%m-%d')
+            - timedelta(weeks=rolling_weeks, days=PREVIOUS_CLOSE_LOOKBACK_DAYS)
+        ).strftime('%Y-%m-%d')
+        panel = self.backtester.load_price_panel(BIST30_SYMBOLS, lookback_start, to_date)
+        
+        dates = np.asarray(panel['dates'], dtype=str)
+        in_range = dates >= from_date
+        if not in_range.any():
+            return None
+        
+        symbols = np.asarray(panel['symbols'])
+        closes = pd.DataFrame(panel['close']).ffill().to_numpy()
+        first = int(np.argmax(in_range))
+        reference = closes[first - 1] if first > 0 else closes[first]
+        last = closes[-1]
+        
+        # Aralık toplam getirisi, en yüksek/en düşük, hacim ve maksimum düşüş
+        change = last - reference
+        change_percentage = change / reference * 100
+        range_closes = closes[first:]
+        running_max = np.fmax.accumulate(np.vstack([reference, range_closes]), axis=0)[1:]
+        max_drawdown = np.nanmin(range_closes / running_max - 1, axis=0) * 100
+        
+        performances = pd.DataFrame({
+            'symbol': symbols,
+            'first_price': reference,
+            'last_price': last,
+            'change': change,
+            'change_percentage': change_percentage,
+            'high': np.nanmax(panel['high'][first:], axis=0),
+            'low': np.nanmin(panel['low'][first:], axis=0),
+            'volume': np.nansum(panel['volume'][first:], axis=0),
+            'max_drawdown_percentage': max_drawdown
+        }).dropna(subset=['change_percentage']).sort_values('change_percentage', ascending=False)
+        
+        # Kayan pencere getirileri: her bar için son N haftalık getiri
+        window = max(1, int(round(rolling_weeks * periods_per_year(dates) / 52)))
+        shifted = np.full_like(closes, np.nan)
+        shifted[window:] = closes[:-window]
+        rolling = (closes / shifted - 1)[first:] * 100
+        
+        # Hiç değeri olmayan barlar (pencere dolmadan) atlanır
+        valid = ~np.all(np.isnan(rolling), axis=1)
+        rolling = rolling[valid]
+        best_index = np.nanargmax(rolling, axis=1)
+        worst_index = np.nanargmin(rolling, axis=1)
+        rows = np.arange(len(rolling))
+        
+        rolling_stats = pd.DataFrame({
+            'date': dates[first:][valid],
+            'avg_return_percentage': np.nanmean(rolling, axis=1),
+            'best_symbol': symbols[best_index],
+            'best_return_percentage': rolling[rows, best_index],
+            'worst_symbol': symbols[worst_index],
+            'worst_return_percentage': rolling[rows, worst_index]
+        })
+        
+        records = performances.to_dict('records')
+        return {
+            'bar_count': int(in_range.sum()),
+            'rolling_window_bars': window,
+            'avg_change_percentage': float(performances['change_percentage'].mean()),
+            'stock_count': len(records),
+            'positive_count': int((performances['change'] > 0).sum()),
+            'negative_count': int((performances['change'] < 0).sum()),
+            'neutral_count': int((performances['change'] == 0).sum()),
+            'best_performers': records[:3],
+            'worst_performers': records[::-1][:3],
+            'all_performances': records,
+            'rolling': rolling_stats.to_dict('records')
+        }
+    
+    def _get_signals_performance(self, from_date, to_date):
+        """
+        Aralıktaki alım sinyallerini aralık sonuna kadar simüle et
+        
+        Args:
+            from_date: Aralık başlangıcı
+            to_date: Aralık bitişi
+        
+        Returns:
+            dict: Sinyal sayıları, performans özeti, haftalık kâr/zarar ve işlemler
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            signals_df = pd.read_sql_query('''
+            SELECT id, symbol, date AS signal_date, signal_type, price, reason, created_at
+            FROM signals
+            WHERE date >= ? AND date <= ?
+            ''', conn, params=(from_date, to_date))
+            
+            buy_signals = signals_df[signals_df['signal_type'] == 'BUY'].to_dict('records')
+            sell_count = int((signals_df['signal_type'] == 'SELL').sum())
+            
+            # Hedef/stop tetiklenmezse pozisyon aralığın son işlem gününde kapanır
+            performance_results = []
+            price_frames, simulated_signals = load_signal_price_frames(conn, buy_signals, end_date=to_date)
+            if price_frames:
+                matrices = build_price_matrices(price_frames)
+                exits = simulate_exits(
+                    matrices['close'][:, 0],
+                    matrices['high'],
+                    matrices['low'],
+                    matrices['close']
+                )
+                performance_results = build_trade_records(
+                    [signal['symbol'] for signal in simulated_signals],
+                    [signal['signal_date'] for signal in simulated_signals],
+                    matrices,
+                    exits,
+                    max_holding_scenario='range_end'
+                )
+        finally:
+            conn.close()
+        
+        performance_summary, equity_curve = summarize_trades(performance_results)
+        
+        # Çıkış haftasına göre gerçekleşen kâr/zarar
+        weekly_profit_loss = []
+        if performance_results:
+            trades = pd.DataFrame({
+                'week_start': week_start_of([trade['sell_date'] for trade in performance_results]),
+                'profit_loss': [trade['profit_loss'] for trade in performance_results]
+            })
+            weekly_profit_loss = (
+                trades.groupby('week_start')['profit_loss']
+                .agg(profit_loss='sum', trades='count')
+                .reset_index()
+                .to_dict('records')
+            )
+        
+        return {
+            'buy_signals_count': len(buy_signals),
+            'sell_signals_count': sell_count,
+            'performance': performance_summary,
+            'equity_curve': equity_curve,
+            'weekly_profit_loss': weekly_profit_loss,
+            'trade_details': performance_results
+        }
+    
+    def get_range_report(self, from_date, to_date, rolling_weeks=DEFAULT_ROLLING_WEEKS):
+        """
+        Tarih aralığı raporu oluştur
+        
+        Args:
+            from_date: Aralık başlangıcı (YYYY-MM-DD)
+            to_date: Aralık bitişi (YYYY-MM-DD)
+            rolling_weeks: Kayan pencere uzunluğu (hafta)
+        
+        Returns:
+            dict: Aralık raporu
+        """
+        try:
+            stock_performance = self._get_stock_performance(from_date, to_date, rolling_weeks)
+            if stock_performance is None:
+                return {
+                    'success': False,
+                    'message': f"{from_date} - {to_date} aralığında fiyat verisi bulunamadı"
+                }
+            
+            signals_performance = self._get_signals_performance(from_date, to_date)
+            rolling = stock_performance.pop('rolling')
+            
+            report = {
+                'success': True,
+                'from_date': from_date,
+                'to_date': to_date,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'rolling_weeks': rolling_weeks,
+                'bist30_performance': stock_performance,
+                'rolling': rolling,
+                'signals_performance': signals_performance,
+                'benchmark_performance': {
+                    index_symbol: {
+                        'return_percentage': self.benchmark.get_window_return(index_symbol, from_date, to_date)
+                    } for index_symbol in BENCHMARK_INDICES
+                },
+                'comparison': {
+                    'bot_vs_market': signals_performance['performance']['avg_profit_loss_percentage'] - stock_performance['avg_change_percentage']
+                }
+            }
+            
+            index_return = report['benchmark_performance'].get(BENCHMARK_INDEX, {}).get('return_percentage')
+            if index_return is not None:
+                report['comparison']['bot_vs_benchmark'] = signals_performance['performance']['avg_profit_loss_percentage'] - index_return
+            
+            return report
+        except Exception as e:
+            logger.error(f"Aralık raporu hatası: {e}")
+            return {
+                'success': False,
+                'message': f"Aralık raporu hatası: {str(e)}"
+            }
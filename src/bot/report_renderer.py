@@ -0,0 +1,332 @@
+"""
+BIST30 Alım-Satım Bot - HTML Rapor Üretim Modülü
+
+Haftalık raporu her haftalık çalıştırmadan sonra bir kez statik HTML olarak
+üretir. Özsermaye eğrisi ve sektör ısı haritası satır içi SVG olarak gömülür;
+sayfa dış kaynak (CSS/JS/görsel) yüklemez. Şablon süreç başına bir kez
+derlenir ve önbellekte tutulur.
+
+Dosya adları içerik özetini (hash) içerdiği için içerikleri hiç değişmez;
+/reports/<ad> uç noktası dosyaları her istekte diskten "immutable" ve uzak
+gelecek önbellek başlıklarıyla sunar. Dosya listesi süreç belleğinde
+tutulmadığından bir worker'ın ürettiği rapor diğer worker'larda da hemen
+görünür ve raporun görüntülenmesi hiçbir hesaplama gerektirmez. Diskte
+yalnızca en son REPORT_KEEP_COUNT rapor tutulur.
+"""
+
+import os
+import re
+import gzip
+import time
+import hashlib
+import logging
+import numpy as np
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('ReportRenderer')
+
+# Raporların sunulduğu URL öneki
+REPORT_URL_PREFIX = 'reports/'
+
+# İçerik özetli rapor dosyası adı: weekly-<hafta başı>-<sha256 ilk 12 hane>.html
+REPORT_FILE_PATTERN = re.compile(r'^weekly-(\d{4}-\d{2}-\d{2})-([0-9a-f]{12})\.html$')
+
+# SVG grafik boyutları (piksel)
+EQUITY_CHART_WIDTH = 720
+EQUITY_CHART_HEIGHT = 240
+EQUITY_CHART_PADDING = 40
+HEATMAP_LABEL_WIDTH = 170
+HEATMAP_CELL_WIDTH = 84
+HEATMAP_CELL_HEIGHT = 40
+
+def format_percentage(value):
+    """Yüzde değerini rapordaki biçime çevir (None ise '-')"""
+    if value is None:
+        return '-'
+    return f"%{value:.2f}"
+
+def sign_class(value):
+    """Değerin işaretine göre CSS sınıfı"""
+    if value is None or value == 0:
+        return ''
+    return 'positive' if value > 0 else 'negative'
+
+# Şablon ortamı süreç başına bir kez kurulur; auto_reload kapalı olduğundan
+# derlenmiş şablon her çizimde dosya sisteminden kontrol edilmez
+_environment = Environment(
+    loader=FileSystemLoader(os.path.dirname(os.path.abspath(__file__))),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False
+)
+_environment.filters['percentage'] = format_percentage
+_environment.filters['sign_class'] = sign_class
+
+@lru_cache(maxsize=None)
+def get_report_template(template_path=REPORT_TEMPLATE_PATH):
+    """
+    Derlenmiş rapor şablonunu getir (ilk çağrıdan sonra önbellekten)
+    
+    Args:
+        template_path: src/bot klasörüne göre şablon yolu
+    
+    Returns:
+        jinja2.Template: Derlenmiş şablon
+    """
+    return _environment.get_template(template_path)
+
+def is_report_file(file_name):
+    """
+    Dosya adının içerik özetli bir rapor dosyası olup olmadığını kontrol et
+    
+    Args:
+        file_name: Dosya adı (klasör içermeden)
+    
+    Returns:
+        bool: Ad weekly-<hafta başı>-<özet>.html biçimindeyse True
+    """
+    return REPORT_FILE_PATTERN.match(file_name) is not None
+
+def _heat_color(value, clip):
+    """Yüzde değişimi beyazdan yeşile/kırmızıya giden renge çevir"""
+    if value is None or not np.isfinite(value):
+        return '#e9ecef'
+    intensity = min(abs(value) / clip, 1.0)
+    target = (25, 135, 84) if value >= 0 else (220, 53, 69)
+    red, green, blue = (int(round(255 + (channel - 255) * intensity)) for channel in target)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+def render_equity_svg(equity_curve, width=EQUITY_CHART_WIDTH, height=EQUITY_CHART_HEIGHT):
+    """
+    Özsermaye eğrisini satır içi SVG çizgi grafiğine çevir
+    
+    Args:
+        equity_curve: [{'date', 'equity'}] listesi
+        width: Grafik genişliği
+        height: Grafik yüksekliği
+    
+    Returns:
+        markupsafe.Markup: <svg> elemanı
+    """
+    if len(equity_curve) < 2:
+        return Markup(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="60" viewBox="0 0 {width} 60">'
+            f'<text x="{width / 2:.0f}" y="35" text-anchor="middle" fill="#6c757d">Bu dönemde kapanan işlem yok</text>'
+            '</svg>'
+        )
+    
+    equity = np.array([point['equity'] for point in equity_curve], dtype=float)
+    padding = EQUITY_CHART_PADDING
+    low, high = equity.min(), equity.max()
+    span = high - low if high > low else 1.0
+    
+    xs = padding + np.arange(len(equity)) * (width - 2 * padding) / (len(equity) - 1)
+    ys = height - padding - (equity - low) / span * (height - 2 * padding)
+    baseline = height - padding - (equity[0] - low) / span * (height - 2 * padding)
+    points = ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    color = '#198754' if equity[-1] >= equity[0] else '#dc3545'
+    
+    return Markup(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<line x1="{padding}" y1="{baseline:.1f}" x2="{width - padding}" y2="{baseline:.1f}" stroke="#adb5bd" stroke-dasharray="4 4"/>'
+        f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/>'
+        f'<text x="{padding}" y="{padding - 12}" font-size="12" fill="#6c757d">{high:,.2f}</text>'
+        f'<text x="{padding}" y="{height - padding + 16}" font-size="12" fill="#6c757d">{low:,.2f}</text>'
+        f'<text x="{padding}" y="{height - 6}" font-size="12" fill="#6c757d">{escape(equity_curve[0]["date"])}</text>'
+        f'<text x="{width - padding}" y="{height - 6}" font-size="12" fill="#6c757d" text-anchor="end">{escape(equity_curve[-1]["date"])}</text>'
+        '</svg>'
+    )
+
+def render_sector_heatmap(performances, sector_map=SECTOR_MAP, clip=REPORT_HEATMAP_CLIP_PERCENTAGE):
+    """
+    Hisse değişimlerini sektör satırlarına gruplanmış SVG ısı haritasına çevir
+    
+    Sektörler ortalama değişime göre büyükten küçüğe sıralanır; SECTOR_MAP'te
+    olmayan hisseler "Diğer" satırında gösterilir.
+    
+    Args:
+        performances: [{'symbol', 'weekly_change_percentage'}] listesi
+        sector_map: Sembol -> sektör sözlüğü
+        clip: Renk skalasının doygunlaştığı yüzde değişim
+    
+    Returns:
+        markupsafe.Markup: <svg> elemanı
+    """
+    sectors = {}
+    for performance in performances:
+        sector = sector_map.get(performance['symbol'], 'Diğer')
+        sectors.setdefault(sector, []).append((performance['symbol'], performance.get('weekly_change_percentage')))
+    
+    if not sectors:
+        return Markup(
+            '<svg xmlns="http://www.w3.org/2000/svg" width="400" height="60" viewBox="0 0 400 60">'
+            '<text x="200" y="35" text-anchor="middle" fill="#6c757d">Haftalık performans verisi yok</text>'
+            '</svg>'
+        )
+    
+    def sector_average(item):
+        values = [value for _, value in item[1] if value is not None]
+        return np.mean(values) if values else -np.inf
+    
+    rows = sorted(sectors.items(), key=sector_average, reverse=True)
+    columns = max(len(stocks) for _, stocks in rows)
+    width = HEATMAP_LABEL_WIDTH + columns * HEATMAP_CELL_WIDTH
+    height = len(rows) * HEATMAP_CELL_HEIGHT
+    
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" font-size="12">']
+    for row, (sector, stocks) in enumerate(rows):
+        y = row * HEATMAP_CELL_HEIGHT
+        parts.append(f'<text x="0" y="{y + HEATMAP_CELL_HEIGHT / 2 + 4:.0f}" fill="#212529">{escape(sector)}</text>')
+        for column, (symbol, value) in enumerate(sorted(stocks, key=lambda stock: stock[0])):
+            x = HEATMAP_LABEL_WIDTH + column * HEATMAP_CELL_WIDTH
+            parts.append(
+                f'<rect x="{x + 1}" y="{y + 1}" width="{HEATMAP_CELL_WIDTH - 2}" height="{HEATMAP_CELL_HEIGHT - 2}" rx="4" fill="{_heat_color(value, clip)}">'
+                f'<title>{escape(symbol)}: {format_percentage(value)}</title></rect>'
+                f'<text x="{x + HEATMAP_CELL_WIDTH / 2:.0f}" y="{y + 17}" text-anchor="middle" font-weight="bold">{escape(symbol)}</text>'
+                f'<text x="{x + HEATMAP_CELL_WIDTH / 2:.0f}" y="{y + 32}" text-anchor="middle">{format_percentage(value)}</text>'
+            )
+    parts.append('</svg>')
+    return Markup(''.join(parts))
+
+class ReportRenderer:
+    """Haftalık raporu statik HTML dosyasına çeviren sınıf"""
+    
+    def __init__(self, output_dir=REPORT_OUTPUT_DIR):
+        """
+        ReportRenderer sınıfını başlat
+        
+        Args:
+            output_dir: HTML raporların yazılacağı klasör
+        """
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        logger.info("ReportRenderer başlatıldı")
+    
+    def _write_atomic(self, path, content):
+        """Dosyayı geçici adla yazıp tek adımda yerine taşı"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    
+    def render_weekly_report(self, report):
+        """
+        Haftalık raporu HTML olarak üret ve diske yaz
+        
+        Aynı içerik tekrar üretilirse mevcut dosya olduğu gibi kullanılır.
+        Sıkıştırılmış (.gz) kopya da yazılır; /reports/<ad> bunu istemci
+        destekliyorsa doğrudan sunar. Yeni dosya yazıldığında eski raporlar
+        temizlenir.
+        
+        Args:
+            report: WeeklyReportGenerator.get_weekly_report çıktısı
+        
+        Returns:
+            dict: Dosya adı, disk yolu, URL ve boyut bilgisi
+        """
+        start_time = time.perf_counter()
+        signals = report.get('signals_performance', {})
+        
+        html = get_report_template().render(
+            report=report,
+            signals=signals,
+            sectors=SECTOR_MAP,
+            equity_chart=render_equity_svg(signals.get('equity_curve', [])),
+            sector_heatmap=render_sector_heatmap(report.get('bist30_performance', {}).get('all_performances', []))
+        )
+        content = html.encode('utf-8')
+        
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        file_name = f"weekly-{report.get('week_start')}-{digest}.html"
+        path = os.path.join(self.output_dir, file_name)
+        
+        if not os.path.exists(path):
+            self._write_atomic(f"{path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+            self._write_atomic(path, content)
+            self.prune_reports()
+        
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(f"Haftalık HTML rapor üretildi: {file_name} ({len(content)} bayt, {elapsed:.1f} ms)")
+        
+        return {
+            'file_name': file_name,
+            'path': path,
+            'url': '/' + REPORT_URL_PREFIX + file_name,
+            'week_start': report.get('week_start'),
+            'size': len(content)
+        }
+    
+    def _list_reports(self):
+        """Rapor dosyalarını (hafta başı, değişiklik zamanı, os.DirEntry) olarak listele"""
+        reports = []
+        for entry in os.scandir(self.output_dir):
+            match = REPORT_FILE_PATTERN.match(entry.name)
+            if match:
+                try:
+                    reports.append((match.group(1), entry.stat().st_mtime, entry))
+                except FileNotFoundError:
+                    # Başka bir worker aynı anda silmiş olabilir
+                    continue
+        return reports
+    
+    def prune_reports(self, keep=REPORT_KEEP_COUNT):
+        """
+        En son keep rapor dışındaki rapor dosyalarını (ve .gz kopyalarını) sil
+        
+        Args:
+            keep: Tutulacak rapor sayısı
+        
+        Returns:
+            int: Silinen rapor sayısı
+        """
+        reports = sorted(self._list_reports(), key=lambda report: report[:2], reverse=True)
+        removed = 0
+        for _, _, entry in reports[keep:]:
+            for path in (entry.path, f"{entry.path}.gz"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            removed += 1
+        
+        if removed:
+            logger.info(f"{removed} eski HTML rapor silindi")
+        return removed
+    
+    def get_latest_report(self, week_start=None):
+        """
+        En son üretilen rapor dosyasını bul
+        
+        Args:
+            week_start: Belirli bir hafta (YYYY-MM-DD, None ise en son hafta)
+        
+        Returns:
+            dict: Dosya adı, disk yolu, URL ve hafta başlangıcı (rapor yoksa None)
+        """
+        candidates = [
+            candidate for candidate in self._list_reports()
+            if week_start is None or candidate[0] == week_start
+        ]
+        
+        if not candidates:
+            return None
+        
+        report_week, _, entry = max(candidates, key=lambda candidate: candidate[:2])
+        return {
+            'file_name': entry.name,
+            'path': entry.path,
+            'url': '/' + REPORT_URL_PREFIX + entry.name,
+            'week_start': report_week
+        }
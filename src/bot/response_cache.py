@@ -0,0 +1,188 @@
+"""
+BIST30 Alım-Satım Bot - HTTP Yanıt Önbelleği Modülü
+
+Yalnızca pipeline çalıştığında değişen verileri döndüren GET uç noktalarının
+serileştirilmiş yanıt gövdelerini (uç nokta, parametreler, strateji versiyonu,
+veri versiyonu) anahtarıyla bellekte LRU olarak saklar.
+
+ETag bu anahtardan üretildiği için If-None-Match eşleşmesi gövde
+hesaplanmadan 304 ile yanıtlanır. Last-Modified veri versiyonunun son
+değiştiği zamandır; If-Modified-Since yalnızca If-None-Match yoksa dikkate
+alınır. Cache-Control tarayıcıyı her istekte yeniden doğrulamaya (veya
+RESPONSE_CACHE_MAX_AGE kadar önbellekten okumaya) yönlendirir.
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from functools import wraps
+from collections import OrderedDict
+from email.utils import formatdate
+from flask import request, make_response
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.data_version import get_data_version_info
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('ResponseCache')
+
+class ResponseCache:
+    """Veri versiyonuna bağlı ETag'li HTTP yanıt önbelleği"""
+    
+    def __init__(self, db_path=DATABASE_PATH, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 max_age=RESPONSE_CACHE_MAX_AGE):
+        """
+        ResponseCache sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            max_entries: Bellekte tutulacak maksimum yanıt sayısı
+            max_age: Tarayıcının yeniden doğrulamadan kullanabileceği süre (saniye, 0 ise her istekte doğrulanır)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0}
+        logger.info("ResponseCache başlatıldı")
+    
+    def _invalidate_stale(self, data_version):
+        """Veri versiyonu değiştiyse eski yanıtları bellekten sil"""
+        with self._lock:
+            if self._data_version == data_version:
+                return
+            if self._data_version is not None:
+                self._stats['invalidations'] += 1
+            self._data_version = data_version
+            stale = [key for key, entry in self._entries.items() if entry['data_version'] != data_version]
+            for key in stale:
+                del self._entries[key]
+    
+    def _cache_headers(self, response, etag, updated_at):
+        """ETag, Last-Modified ve Cache-Control başlıklarını ekle"""
+        response.set_etag(etag)
+        if updated_at is not None:
+            response.headers['Last-Modified'] = formatdate(updated_at, usegmt=True)
+        response.headers['Cache-Control'] = f"public, max-age={self.max_age}" if self.max_age else 'no-cache'
+        return response
+    
+    def _is_not_modified(self, etag, updated_at):
+        """İstemcinin elindeki yanıtın güncel olup olmadığını kontrol et"""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(etag) or request.if_none_match.star_tag
+        if request.if_modified_since is not None and updated_at is not None:
+            return updated_at <= request.if_modified_since.timestamp()
+        return False
+    
+    def serve(self, endpoint, view_args, compute):
+        """
+        Yanıtı önbellekten veya koşullu olarak (304) döndür, yoksa hesapla
+        
+        Args:
+            endpoint: Uç nokta adı
+            view_args: Yol parametreleri (dict)
+            compute: Flask yanıtı döndüren parametresiz fonksiyon
+        
+        Returns:
+            flask.Response: Önbellek başlıklı yanıt
+        """
+        data_version, updated_at = get_data_version_info(self.db_path)
+        self._invalidate_stale(data_version)
+        
+        cache_key = json.dumps([
+            endpoint,
+            sorted(view_args.items()),
+            sorted(request.args.items(multi=True)),
+            STRATEGY_VERSION,
+            data_version
+        ], default=str)
+        etag = f"{data_version}-{hashlib.sha1(cache_key.encode('utf-8')).hexdigest()[:16]}"
+        
+        if self._is_not_modified(etag, updated_at):
+            with self._lock:
+                self._stats['not_modified'] += 1
+            response = make_response('', 304)
+            return self._cache_headers(response, etag, updated_at)
+        
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._stats['hits'] += 1
+        
+        if entry is not None:
+            response = make_response(entry['body'], 200)
+            response.mimetype = entry['mimetype']
+            response.headers['X-Cache'] = 'HIT'
+            return self._cache_headers(response, etag, updated_at)
+        
+        with self._lock:
+            self._stats['misses'] += 1
+        
+        response = make_response(compute())
+        # Hata ve boş sonuç yanıtları önbelleğe alınmaz
+        if response.status_code != 200:
+            return response
+        
+        with self._lock:
+            self._entries[cache_key] = {
+                'data_version': data_version,
+                'body': response.get_data(),
+                'mimetype': response.mimetype
+            }
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        response.headers['X-Cache'] = 'MISS'
+        return self._cache_headers(response, etag, updated_at)
+    
+    def cached(self, view):
+        """
+        GET uç noktasını önbelleğe alan dekoratör
+        
+        Args:
+            view: Flask görünüm fonksiyonu
+        
+        Returns:
+            function: Önbellekli görünüm fonksiyonu
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return self.serve(view.__name__, kwargs, lambda: view(*args, **kwargs))
+        return wrapper
+    
+    def get_stats(self):
+        """
+        Yanıt önbelleği metriklerini getir
+        
+        Returns:
+            dict: İsabet, ıska ve 304 sayıları, isabet oranı ve kayıt sayısı
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+            body_bytes = sum(len(entry['body']) for entry in self._entries.values())
+            data_version = self._data_version
+        
+        requests_served = stats['hits'] + stats['misses'] + stats['not_modified']
+        return {
+            **stats,
+            'requests': requests_served,
+            # 304 yanıtları da gövde hesaplanmadan karşılanır
+            'hit_rate': (stats['hits'] + stats['not_modified']) / requests_served if requests_served else 0.0,
+            'entries': entries,
+            'body_bytes': body_bytes,
+            'data_version': data_version
+        }
@@ -0,0 +1,209 @@
+"""
+BIST30 Alım-Satım Bot - Sonuç Önbelleği Modülü
+
+Rapor ve performans uç noktalarının sonuçlarını (uç nokta, tarih, strateji
+versiyonu, veri versiyonu) anahtarıyla saklar. Bellekte LRU olarak tutulan
+sonuçlar SQLite'taki result_cache tablosuna da yazılır, böylece yeniden
+başlatmalardan sonra da geçerlidir. Veri versiyonu tetikleyicilerle
+arttığından stock_data, technical_indicators veya signals tablolarına
+yapılan her yazma eski sonuçları kendiliğinden geçersiz kılar.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import numpy as np
+from datetime import datetime, date
+from collections import OrderedDict
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.data_version import get_data_version
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('ResultCache')
+
+def _json_default(value):
+    """numpy ve tarih tiplerini JSON'a uygun hale getir"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d %H:%M:%S') if isinstance(value, datetime) else value.isoformat()
+    return str(value)
+
+class ResultCache:
+    """Rapor ve performans sonuçları için iki katmanlı (bellek + SQLite) önbellek"""
+    
+    def __init__(self, db_path=DATABASE_PATH, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        """
+        ResultCache sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            max_entries: Bellekte tutulacak maksimum sonuç sayısı
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'invalidations': 0}
+        self._ensure_table_exists()
+        logger.info("ResultCache başlatıldı")
+    
+    def _ensure_table_exists(self):
+        """Önbellek tablosunu oluştur"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS result_cache (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT,
+                date TEXT,
+                strategy_version TEXT,
+                data_version INTEGER,
+                payload TEXT,
+                created_at TEXT
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _invalidate_stale(self, data_version):
+        """Veri versiyonu değiştiyse eski sonuçları bellekten ve tablodan sil"""
+        with self._lock:
+            if self._data_version == data_version:
+                return
+            if self._data_version is not None:
+                self._stats['invalidations'] += 1
+            self._data_version = data_version
+            stale = [key for key, entry in self._entries.items() if entry['data_version'] != data_version]
+            for key in stale:
+                del self._entries[key]
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+            DELETE FROM result_cache
+            WHERE data_version != ? OR strategy_version != ?
+            ''', (data_version, STRATEGY_VERSION))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def get_or_compute(self, endpoint, date, compute, variant=None):
+        """
+        Sonucu önbellekten getir, yoksa hesapla ve sakla
+        
+        Dönen nesne önbellekte paylaşıldığı için değiştirilmemelidir.
+        
+        Args:
+            endpoint: Uç nokta adı
+            date: Rapor tarihi
+            compute: Sonucu hesaplayan parametresiz fonksiyon
+            variant: Aynı uç nokta ve tarih için ek ayırt edici (örn. öğlen/kapanış)
+            
+        Returns:
+            dict: Sonuç
+        """
+        data_version = get_data_version(self.db_path)
+        self._invalidate_stale(data_version)
+        
+        cache_key = json.dumps([endpoint, date, variant, STRATEGY_VERSION, data_version])
+        
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._stats['memory_hits'] += 1
+                return entry['result']
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                'SELECT payload FROM result_cache WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        
+        if row is not None:
+            result = json.loads(row[0])
+            self._remember(cache_key, data_version, result)
+            with self._lock:
+                self._stats['disk_hits'] += 1
+            return result
+        
+        with self._lock:
+            self._stats['misses'] += 1
+        
+        # Hesapla; isabet ve ıska durumunda aynı tipleri döndürmek için JSON'dan geçir
+        payload = json.dumps(compute(), default=_json_default)
+        result = json.loads(payload)
+        
+        # Başarısız veya boş sonuçlar önbelleğe alınmaz
+        if isinstance(result, dict) and result.get('success', True):
+            self._remember(cache_key, data_version, result)
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute('''
+                INSERT OR REPLACE INTO result_cache
+                (cache_key, endpoint, date, strategy_version, data_version, payload, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (cache_key, endpoint, date, STRATEGY_VERSION, data_version, payload,
+                      datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                conn.commit()
+            finally:
+                conn.close()
+        
+        return result
+    
+    def _remember(self, cache_key, data_version, result):
+        """Sonucu bellekteki LRU'ya ekle"""
+        with self._lock:
+            self._entries[cache_key] = {'data_version': data_version, 'result': result}
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_stats(self):
+        """
+        Önbellek isabet metriklerini getir
+        
+        Returns:
+            dict: İsabet/ıska sayıları, isabet oranı ve kayıt sayıları
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            disk_entries = conn.execute('SELECT COUNT(*) FROM result_cache').fetchone()[0]
+        finally:
+            conn.close()
+        
+        with self._lock:
+            stats = dict(self._stats)
+            memory_entries = len(self._entries)
+            data_version = self._data_version
+        
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        hits = stats['memory_hits'] + stats['disk_hits']
+        
+        return {
+            **stats,
+            'lookups': lookups,
+            'hit_ratio': hits / lookups if lookups else 0,
+            'memory_entries': memory_entries,
+            'max_entries': self.max_entries,
+            'disk_entries': disk_entries,
+            'data_version': data_version,
+            'strategy_version': STRATEGY_VERSION
+        }
@@ -0,0 +1,296 @@
+"""
+BIST30 Alım-Satım Bot - Risk Metrikleri Modülü
+
+İşlem listelerini günlük özsermaye eğrisine dönüştürür ve özsermaye
+eğrisinden maksimum düşüş, düşüş süresi, Sharpe, Sortino, Calmar, piyasada
+kalma oranı (exposure) ve devir hızı (turnover) metriklerini NumPy dizi
+işlemleriyle hesaplar. PerformanceSimulator, WeeklyReportGenerator ve
+backtest özetleri bu modülü ortak kullanır.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+def periods_per_year(dates):
+    """Tarih dizisinin bar sıklığından yıllık periyot sayısını tahmin et"""
+    if len(dates) < 2:
+        return 252.0
+    gaps = np.diff(pd.to_datetime(pd.Series(dates)).to_numpy()).astype('timedelta64[D]').astype(float)
+    median_gap = float(np.median(gaps)) if len(gaps) else 1.0
+    if median_gap >= 5:
+        return 365.25 / median_gap
+    return 252.0
+
+def _to_days(dates):
+    """Tarih dizisini gün çözünürlüklü datetime64 dizisine çevir"""
+    return pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+
+def drawdown_series(equity):
+    """
+    Özsermaye eğrisinin düşüş ve düşüş süresi serilerini hesapla
+    
+    Args:
+        equity: Bar başına özsermaye dizisi
+    
+    Returns:
+        tuple: (düşüş oranları, son zirveden bu yana geçen bar sayısı)
+    """
+    equity = np.asarray(equity, dtype=float)
+    running_max = np.maximum.accumulate(equity)
+    drawdown = equity / running_max - 1
+    
+    # Her bar için son zirvenin indeksi; süre = bar - son zirve
+    bars = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(equity >= running_max, bars, 0))
+    return drawdown, bars - last_peak
+
+def equity_metrics(equity, dates=None, periods=None, exposure=None, traded_value=None,
+                   initial_capital=None, risk_free_rate=RISK_FREE_RATE):
+    """
+    Özsermaye eğrisinden risk ve getiri metriklerini hesapla
+    
+    Args:
+        equity: Bar başına özsermaye dizisi
+        dates: Bar tarihleri (yıllık periyot sayısını tahmin etmek için)
+        periods: Yıllık periyot sayısı (verilirse dates yerine kullanılır)
+        exposure: Bar başına piyasadaki sermaye oranı (0-1)
+        traded_value: Dönem boyunca alınıp satılan toplam tutar
+        initial_capital: Başlangıç sermayesi (verilmezse ilk bar özsermayesi)
+        risk_free_rate: Yıllık risksiz faiz oranı
+    
+    Returns:
+        dict: Getiri, düşüş, oran ve exposure/turnover metrikleri
+    """
+    equity = np.asarray(equity, dtype=float)
+    if len(equity) == 0:
+        return {
+            'total_return_percentage': 0,
+            'cagr_percentage': 0,
+            'volatility_percentage': 0,
+            'sharpe_ratio': None,
+            'sortino_ratio': None,
+            'calmar_ratio': None,
+            'max_drawdown_percentage': 0,
+            'max_drawdown_duration': 0,
+            'exposure_percentage': 0,
+            'turnover': 0
+        }
+    
+    if periods is None:
+        periods = periods_per_year(dates) if dates is not None else 252.0
+    
+    # Başlangıç sermayesi eğrinin ilk noktası olarak eklenir
+    if initial_capital is not None:
+        equity = np.concatenate([[float(initial_capital)], equity])
+    
+    drawdown, duration = drawdown_series(equity)
+    max_drawdown = float(drawdown.min())
+    
+    growth = equity[-1] / equity[0]
+    years = max(len(equity) - 1, 1) / periods
+    cagr = growth ** (1 / years) - 1 if growth > 0 else -1
+    
+    # Periyot getirileri ve yıllıklandırılmış oranlar
+    returns = np.diff(equity) / equity[:-1]
+    excess = returns - ((1 + risk_free_rate) ** (1 / periods) - 1)
+    volatility = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+    downside = float(np.sqrt(np.mean(np.minimum(excess, 0) ** 2))) if len(returns) else 0.0
+    
+    metrics = {
+        'total_return_percentage': float(growth - 1) * 100,
+        'cagr_percentage': float(cagr) * 100,
+        'volatility_percentage': float(volatility * np.sqrt(periods)) * 100,
+        'sharpe_ratio': float(excess.mean() / volatility * np.sqrt(periods)) if volatility > 0 else None,
+        'sortino_ratio': float(excess.mean() / downside * np.sqrt(periods)) if downside > 0 else None,
+        'calmar_ratio': float(cagr / -max_drawdown) if max_drawdown < 0 else None,
+        'max_drawdown_percentage': max_drawdown * 100,
+        'max_drawdown_duration': int(duration.max()),
+        'exposure_percentage': float(np.mean(exposure)) * 100 if exposure is not None else 0,
+        'turnover': 0
+    }
+    
+    # Devir hızı: (alış + satış) / 2, ortalama özsermayeye ve yıla oranlanır
+    if traded_value is not None:
+        metrics['turnover'] = float(traded_value / 2 / equity.mean() / years)
+    
+    return metrics
+
+def relative_metrics(returns, benchmark_returns, periods=252.0):
+    """
+    Strateji getirilerinin endekse göre alfa, beta ve takip hatasını hesapla
+    
+    Args:
+        returns: Periyot başına strateji getirileri (oran)
+        benchmark_returns: Aynı periyotlar için endeks getirileri (oran)
+        periods: Yıllık periyot sayısı
+    
+    Returns:
+        dict: Yıllık alfa, beta, korelasyon, takip hatası ve bilgi oranı
+    """
+    returns = np.asarray(returns, dtype=float)
+    benchmark_returns = np.asarray(benchmark_returns, dtype=float)
+    valid = np.isfinite(returns) & np.isfinite(benchmark_returns)
+    returns = returns[valid]
+    benchmark_returns = benchmark_returns[valid]
+    
+    metrics = {
+        'periods': int(len(returns)),
+        'alpha_percentage': None,
+        'beta': None,
+        'correlation': None,
+        'tracking_error_percentage': None,
+        'information_ratio': None
+    }
+    if len(returns) < 3:
+        return metrics
+    
+    # Kovaryans matrisi tek geçişte: [[var(r), cov(r,b)], [cov(r,b), var(b)]]
+    covariance = np.cov(np.vstack([returns, benchmark_returns]), ddof=1)
+    active = returns - benchmark_returns
+    tracking_error = float(active.std(ddof=1) * np.sqrt(periods))
+    
+    if covariance[1, 1] > 0:
+        beta = covariance[0, 1] / covariance[1, 1]
+        metrics['beta'] = float(beta)
+        metrics['alpha_percentage'] = float((returns.mean() - beta * benchmark_returns.mean()) * periods) * 100
+        if covariance[0, 0] > 0:
+            metrics['correlation'] = float(covariance[0, 1] / np.sqrt(covariance[0, 0] * covariance[1, 1]))
+    
+    metrics['tracking_error_percentage'] = tracking_error * 100
+    if tracking_error > 0:
+        metrics['information_ratio'] = float(active.mean() * periods / tracking_error)
+    
+    return metrics
+
+def trade_metrics(profit_loss, profit_loss_percentage):
+    """
+    İşlem bazlı özet metrikleri hesapla
+    
+    Args:
+        profit_loss: İşlem başına kâr/zarar tutarları
+        profit_loss_percentage: İşlem başına kâr/zarar yüzdeleri
+    
+    Returns:
+        dict: Toplam/ortalama kâr-zarar, başarı oranı ve kâr faktörü
+    """
+    pnl = np.asarray(profit_loss, dtype=float)
+    returns = np.asarray(profit_loss_percentage, dtype=float)
+    if len(pnl) == 0:
+        return {
+            'total_profit_loss': 0,
+            'avg_profit_loss_percentage': 0,
+            'successful_trades': 0,
+            'total_trades': 0,
+            'success_rate': 0,
+            'profit_factor': None
+        }
+    
+    successful = int((pnl > 0).sum())
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
+    
+    return {
+        'total_profit_loss': float(pnl.sum()),
+        'avg_profit_loss_percentage': float(returns.mean()),
+        'successful_trades': successful,
+        'total_trades': len(pnl),
+        'success_rate': successful / len(pnl) * 100,
+        'profit_factor': float(gross_profit / gross_loss) if gross_loss > 0 else None
+    }
+
+def trade_equity_curve(entry_dates, exit_dates, entry_prices, profit_loss, initial_capital=None):
+    """
+    İşlem listesini iş günü takvimli özsermaye eğrisine dönüştür
+    
+    Kâr/zarar çıkış gününde gerçekleşmiş sayılır. Her işlem giriş fiyatı
+    kadar sermaye bağlar; başlangıç sermayesi verilmezse tüm sinyalleri
+    almak için gereken en yüksek eş zamanlı sermaye kullanılır.
+    
+    Args:
+        entry_dates: Giriş tarihleri
+        exit_dates: Çıkış tarihleri
+        entry_prices: Giriş fiyatları (işlem başına bağlanan sermaye)
+        profit_loss: İşlem başına kâr/zarar tutarları
+        initial_capital: Başlangıç sermayesi
+    
+    Returns:
+        dict: 'dates', 'equity', 'exposure' dizileri ve 'traded_value' toplamı
+    """
+    entry = _to_days(entry_dates)
+    exit = _to_days(exit_dates)
+    entry_prices = np.asarray(entry_prices, dtype=float)
+    profit_loss = np.asarray(profit_loss, dtype=float)
+    
+    # İş günü takvimi (hafta sonuna düşen işlem tarihleri de dahil edilir)
+    span = np.arange(entry.min(), max(entry.max(), exit.max()) + 1)
+    calendar = np.union1d(span[np.is_busday(span)], np.concatenate([entry, exit]))
+    n_days = len(calendar)
+    
+    entry_index = np.searchsorted(calendar, entry)
+    exit_index = np.searchsorted(calendar, exit)
+    
+    daily_pnl = np.bincount(exit_index, weights=profit_loss, minlength=n_days)
+    deployed = np.cumsum(
+        np.bincount(entry_index, weights=entry_prices, minlength=n_days)
+        - np.bincount(exit_index, weights=entry_prices, minlength=n_days)
+    )
+    
+    if initial_capital is None:
+        initial_capital = float(deployed.max()) or float(entry_prices.max())
+    
+    equity = initial_capital + np.cumsum(daily_pnl)
+    exposure = np.clip(np.divide(deployed, equity, out=np.zeros(n_days), where=equity > 0), 0, 1)
+    
+    return {
+        'dates': calendar,
+        'equity': equity,
+        'exposure': exposure,
+        'traded_value': float(2 * entry_prices.sum() + profit_loss.sum()),
+        'initial_capital': initial_capital
+    }
+
+def summarize_trades(trades, initial_capital=None):
+    """
+    İşlem detaylarından performans özeti ve özsermaye eğrisi üret
+    
+    Args:
+        trades: 'buy_date', 'sell_date', 'buy_price', 'profit_loss' ve
+            'profit_loss_percentage' alanlı işlem listesi
+        initial_capital: Başlangıç sermayesi
+    
+    Returns:
+        tuple: (performans özeti, [{'date', 'equity'}] özsermaye eğrisi)
+    """
+    profit_loss = np.fromiter((trade['profit_loss'] for trade in trades), dtype=float, count=len(trades))
+    summary = trade_metrics(
+        profit_loss,
+        np.fromiter((trade['profit_loss_percentage'] for trade in trades), dtype=float, count=len(trades))
+    )
+    if not trades:
+        summary.update(equity_metrics([]))
+        return summary, []
+    
+    curve = trade_equity_curve(
+        [trade['buy_date'] for trade in trades],
+        [trade['sell_date'] for trade in trades],
+        np.fromiter((trade['buy_price'] for trade in trades), dtype=float, count=len(trades)),
+        profit_loss,
+        initial_capital
+    )
+    
+    # Takvim iş günü olduğundan yıllık periyot sayısı 252
+    summary.update(equity_metrics(
+        curve['equity'],
+        periods=252.0,
+        exposure=curve['exposure'],
+        traded_value=curve['traded_value'],
+        initial_capital=curve['initial_capital']
+    ))
+    summary['initial_capital'] = curve['initial_capital']
+    
+    dates = np.datetime_as_string(curve['dates'], unit='D')
+    equity_curve = [{'date': date, 'equity': value} for date, value in zip(dates.tolist(), curve['equity'].tolist())]
+    return summary, equity_curve
@@ -0,0 +1,432 @@
+"""
+BIST30 Alım-Satım Bot - Uygulama İçi Zamanlayıcı Modülü
+
+Konfigürasyondaki zamanlamaları (SCHEDULES) Borsa İstanbul takvimine göre
+çalıştırır; hafta sonu ve tatillerde işlem yapılmaz. Her zamanlama bir arka
+plan işi (jobs.JobManager) başlatır, böylece aynı akışın elle tetiklenen
+çalıştırmasıyla birleşir ve ilerlemesi /jobs/<id> üzerinden izlenebilir.
+
+Birden fazla gunicorn worker'ı zamanlayıcıyı başlatsa da SQLite'taki lider
+kilidi (lease) yalnızca birinin zamanlama kontrolü yapmasını sağlar; lider
+süreç ölürse kilit süresi dolunca başka bir worker devralır. Her zamanlama
+dilimi scheduler_runs tablosuna birincil anahtarla yazıldığından aynı dilim
+iki kez çalıştırılmaz. Tamamlanan çalıştırmaların toplam ve aşama süreleri
+aynı tabloda saklanır ve eğilim analizi için raporlanır.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import sqlite3
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.jobs import JOB_SUCCEEDED, JOB_FAILED
+from src.bot.market_calendar import MARKET_TZ, market_now, parse_clock, is_trading_day, session_hours
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('MarketScheduler')
+
+LEASE_NAME = 'market-scheduler'
+
+# Çalıştırma durumları
+RUN_RUNNING = 'running'
+RUN_SUCCEEDED = 'succeeded'
+RUN_FAILED = 'failed'
+
+SLOT_FORMAT = '%Y-%m-%d %H:%M'
+
+# Sonraki çalıştırma aranırken bakılan en fazla gün
+NEXT_RUN_LOOKAHEAD_DAYS = 14
+
+def ensure_scheduler_schema(conn):
+    """
+    Lider kilidi ve çalıştırma geçmişi tablolarını oluştur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS scheduler_lease (
+        name TEXT PRIMARY KEY,
+        owner TEXT,
+        expires_at REAL
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS scheduler_runs (
+        schedule TEXT,
+        slot TEXT,
+        job_kind TEXT,
+        job_id TEXT,
+        owner TEXT,
+        status TEXT,
+        coalesced INTEGER DEFAULT 0,
+        submitted_at TEXT,
+        finished_at TEXT,
+        duration REAL,
+        stage_durations TEXT,
+        error TEXT,
+        PRIMARY KEY (schedule, slot)
+    )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_scheduler_runs_status ON scheduler_runs (status)')
+
+def schedule_slots(schedule, day):
+    """
+    Zamanlamanın verilen gündeki çalıştırma anları
+    
+    Args:
+        schedule: SCHEDULES öğesi
+        day: datetime.date
+    
+    Returns:
+        list: Saat dilimli datetime listesi (gün uygun değilse boş)
+    """
+    if schedule.get('trading_days_only', True) and not is_trading_day(day):
+        return []
+    if 'weekdays' in schedule and day.weekday() not in schedule['weekdays']:
+        return []
+    
+    if 'time' in schedule:
+        return [datetime.combine(day, parse_clock(schedule['time']), MARKET_TZ)]
+    
+    # Seans içinde her N dakikada bir
+    hours = session_hours(day)
+    if hours is None:
+        return []
+    step = timedelta(minutes=schedule['every'])
+    slots = []
+    moment = hours[0]
+    while moment < hours[1]:
+        slots.append(moment)
+        moment += step
+    return slots
+
+def due_slots(schedule, now, grace=SCHEDULER_MISFIRE_GRACE):
+    """
+    Çalıştırma zamanı gelmiş (ve kaçırma toleransı geçmemiş) dilimler
+    
+    Args:
+        schedule: SCHEDULES öğesi
+        now: Saat dilimli şu anki zaman
+        grace: Geç çalıştırma toleransı (saniye)
+    
+    Returns:
+        list: Saat dilimli datetime listesi
+    """
+    window_start = now - timedelta(seconds=grace)
+    slots = []
+    for day in sorted({window_start.date(), now.date()}):
+        slots.extend(slot for slot in schedule_slots(schedule, day) if window_start < slot <= now)
+    return slots
+
+def next_slot(schedule, now):
+    """
+    Zamanlamanın bir sonraki çalıştırma anı
+    
+    Args:
+        schedule: SCHEDULES öğesi
+        now: Saat dilimli şu anki zaman
+    
+    Returns:
+        datetime: Sonraki çalıştırma (bulunamazsa None)
+    """
+    for offset in range(NEXT_RUN_LOOKAHEAD_DAYS):
+        for slot in schedule_slots(schedule, now.date() + timedelta(days=offset)):
+            if slot > now:
+                return slot
+    return None
+
+def _timestamp():
+    """Kayıt zaman damgası"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+class MarketScheduler:
+    """Borsa takvimine göre arka plan işlerini başlatan tek lider zamanlayıcı"""
+    
+    def __init__(self, db_path=DATABASE_PATH, job_manager=None, schedules=SCHEDULES,
+                 tick_seconds=SCHEDULER_TICK_SECONDS, lease_ttl=SCHEDULER_LEASE_TTL):
+        """
+        MarketScheduler sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+            job_manager: İşleri çalıştıracak JobManager
+            schedules: Zamanlama listesi (SCHEDULES biçiminde)
+            tick_seconds: Zamanlamaların kontrol aralığı
+            lease_ttl: Lider kilidinin geçerlilik süresi (saniye)
+        """
+        self.db_path = db_path
+        self.job_manager = job_manager
+        self.schedules = schedules
+        self.tick_seconds = tick_seconds
+        self.lease_ttl = lease_ttl
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        
+        conn = self._get_connection()
+        try:
+            ensure_scheduler_schema(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info("MarketScheduler başlatıldı")
+    
+    def _get_connection(self):
+        """Yazma kilidi için bekleyen SQLite bağlantısı aç"""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def start(self):
+        """Zamanlayıcı thread'ini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='MarketScheduler', daemon=True)
+            self._thread.start()
+            logger.info("Zamanlayıcı çalışıyor")
+    
+    def stop(self, timeout=None):
+        """Zamanlayıcıyı durdur ve lider kilidini bırak"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        
+        conn = self._get_connection()
+        try:
+            conn.execute('DELETE FROM scheduler_lease WHERE name = ? AND owner = ?', (LEASE_NAME, self.owner))
+            conn.commit()
+        finally:
+            conn.close()
+        self.is_leader = False
+    
+    def _run(self):
+        """Her aralıkta zamanlamaları kontrol et"""
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Zamanlayıcı hatası: {e}")
+            self._stop_event.wait(self.tick_seconds)
+    
+    def _acquire_lease(self, conn):
+        """
+        Lider kilidini al veya yenile
+        
+        Kilit boşsa, süresi dolmuşsa ya da zaten bu zamanlayıcıdaysa tek
+        UPSERT ile alınır; işlem atomik olduğundan aynı anda tek lider olur.
+        
+        Returns:
+            bool: Kilit bu zamanlayıcıdaysa True
+        """
+        now = time.time()
+        conn.execute('''
+        INSERT INTO scheduler_lease (name, owner, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+        WHERE scheduler_lease.owner = excluded.owner OR scheduler_lease.expires_at < ?
+        ''', (LEASE_NAME, self.owner, now + self.lease_ttl, now))
+        conn.commit()
+        owner = conn.execute('SELECT owner FROM scheduler_lease WHERE name = ?', (LEASE_NAME,)).fetchone()[0]
+        return owner == self.owner
+    
+    def tick(self, now=None):
+        """
+        Lider ise zamanı gelen dilimleri çalıştır ve biten çalıştırmaları kaydet
+        
+        Args:
+            now: Saat dilimli şu anki zaman (None ise borsa saati)
+        
+        Returns:
+            list: Bu kontrolde başlatılan (zamanlama, dilim) çiftleri
+        """
+        now = now or market_now()
+        conn = self._get_connection()
+        try:
+            leader = self._acquire_lease(conn)
+            if leader != self.is_leader:
+                logger.info("Zamanlayıcı liderliği alındı" if leader else "Zamanlayıcı liderliği başka bir sürece geçti")
+            self.is_leader = leader
+            if not leader:
+                return []
+            
+            self._finalize_runs(conn)
+            
+            started = []
+            for schedule in self.schedules:
+                for slot in due_slots(schedule, now):
+                    if self._start_run(conn, schedule, slot.strftime(SLOT_FORMAT)):
+                        started.append((schedule['name'], slot.strftime(SLOT_FORMAT)))
+            return started
+        finally:
+            conn.close()
+    
+    def _start_run(self, conn, schedule, slot):
+        """
+        Dilimi sahiplen ve işini başlat
+        
+        Returns:
+            bool: Dilim bu çağrıda başlatıldıysa True (daha önce çalıştıysa False)
+        """
+        claimed = conn.execute('''
+        INSERT OR IGNORE INTO scheduler_runs (schedule, slot, job_kind, owner, status, submitted_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (schedule['name'], slot, schedule['job'], self.owner, RUN_RUNNING, _timestamp())).rowcount == 1
+        conn.commit()
+        if not claimed:
+            return False
+        
+        try:
+            job, created = self.job_manager.submit(schedule['job'], {'schedule': schedule['name'], 'slot': slot})
+        except Exception as e:
+            logger.error(f"Zamanlanmış iş başlatılamadı: {schedule['name']} {slot}: {e}")
+            conn.execute('''
+            UPDATE scheduler_runs SET status = ?, error = ?, finished_at = ?
+            WHERE schedule = ? AND slot = ?
+            ''', (RUN_FAILED, str(e), _timestamp(), schedule['name'], slot))
+            conn.commit()
+            return True
+        
+        conn.execute('''
+        UPDATE scheduler_runs SET job_id = ?, coalesced = ? WHERE schedule = ? AND slot = ?
+        ''', (job['id'], int(not created), schedule['name'], slot))
+        conn.commit()
+        logger.info(f"Zamanlanmış iş başlatıldı: {schedule['name']} {slot} -> {schedule['job']} ({job['id']})")
+        return True
+    
+    def _finalize_runs(self, conn):
+        """Biten işlerin durumunu ve sürelerini çalıştırma geçmişine yaz"""
+        running = conn.execute('''
+        SELECT schedule, slot, job_id FROM scheduler_runs WHERE status = ? AND job_id IS NOT NULL
+        ''', (RUN_RUNNING,)).fetchall()
+        
+        for schedule, slot, job_id in running:
+            job = self.job_manager.get_job(job_id)
+            if job is not None and job['status'] not in (JOB_SUCCEEDED, JOB_FAILED):
+                continue
+            
+            if job is None:
+                status, error, stage_durations, duration = RUN_FAILED, 'İş kaydı bulunamadı', {}, None
+            else:
+                status = RUN_SUCCEEDED if job['status'] == JOB_SUCCEEDED else RUN_FAILED
+                error = job['error']
+                stage_durations = {
+                    name: stage['duration'] for name, stage in (job['stages'] or {}).items()
+                    if stage['duration'] is not None
+                }
+                duration = round(sum(stage_durations.values()), 3)
+            
+            conn.execute('''
+            UPDATE scheduler_runs SET status = ?, error = ?, duration = ?, stage_durations = ?, finished_at = ?
+            WHERE schedule = ? AND slot = ?
+            ''', (status, error, duration, json.dumps(stage_durations), _timestamp(), schedule, slot))
+        conn.commit()
+    
+    def get_duration_trends(self, limit=30):
+        """
+        Zamanlama başına son başarılı çalıştırmaların süre eğilimi
+        
+        Args:
+            limit: Zamanlama başına bakılan en fazla çalıştırma
+        
+        Returns:
+            dict: Zamanlama adı -> çalıştırma sayısı, son/ortalama/p95 süre,
+                  çalıştırma başına süre değişimi (eğim) ve aşama ortalamaları
+        """
+        conn = self._get_connection()
+        try:
+            rows = conn.execute('''
+            SELECT schedule, duration, stage_durations FROM (
+                SELECT schedule, slot, duration, stage_durations,
+                       ROW_NUMBER() OVER (PARTITION BY schedule ORDER BY slot DESC) AS position
+                FROM scheduler_runs
+                WHERE status = ? AND duration IS NOT NULL
+            )
+            WHERE position <= ?
+            ORDER BY schedule, slot
+            ''', (RUN_SUCCEEDED, limit)).fetchall()
+        finally:
+            conn.close()
+        
+        grouped = {}
+        for schedule, duration, stage_durations in rows:
+            grouped.setdefault(schedule, []).append((duration, json.loads(stage_durations or '{}')))
+        
+        trends = {}
+        for schedule, runs in grouped.items():
+            durations = np.array([duration for duration, _ in runs], dtype=float)
+            stage_names = sorted({name for _, stages in runs for name in stages})
+            trends[schedule] = {
+                'runs': len(durations),
+                'last_seconds': float(durations[-1]),
+                'mean_seconds': float(durations.mean()),
+                'p95_seconds': float(np.percentile(durations, 95)),
+                # Pozitif eğim: çalıştırmalar giderek yavaşlıyor
+                'slope_seconds_per_run': float(np.polyfit(np.arange(len(durations)), durations, 1)[0]) if len(durations) > 1 else 0.0,
+                'stage_mean_seconds': {
+                    name: float(np.mean([stages[name] for _, stages in runs if name in stages]))
+                    for name in stage_names
+                }
+            }
+        return trends
+    
+    def get_status(self, recent=20):
+        """
+        Zamanlayıcı durumunu getir
+        
+        Args:
+            recent: Döndürülecek son çalıştırma sayısı
+        
+        Returns:
+            dict: Lider bilgisi, zamanlamaların sonraki çalıştırmaları, son
+                  çalıştırmalar ve süre eğilimleri
+        """
+        now = market_now()
+        conn = self._get_connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            lease = conn.execute('SELECT owner, expires_at FROM scheduler_lease WHERE name = ?', (LEASE_NAME,)).fetchone()
+            runs = [dict(row) for row in conn.execute('''
+            SELECT * FROM scheduler_runs ORDER BY submitted_at DESC LIMIT ?
+            ''', (recent,))]
+        finally:
+            conn.close()
+        
+        for run in runs:
+            run['stage_durations'] = json.loads(run['stage_durations']) if run['stage_durations'] else None
+            run['coalesced'] = bool(run['coalesced'])
+        
+        schedules = []
+        for schedule in self.schedules:
+            upcoming = next_slot(schedule, now)
+            schedules.append({
+                **schedule,
+                'next_run': upcoming.strftime(SLOT_FORMAT) if upcoming else None
+            })
+        
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'is_leader': self.is_leader,
+            'leader': lease['owner'] if lease and lease['expires_at'] > time.time() else None,
+            'market_time': now.strftime(SLOT_FORMAT),
+            'trading_day': is_trading_day(now.date()),
+            'schedules': schedules,
+            'recent_runs': runs,
+            'duration_trends': self.get_duration_trends()
+        }
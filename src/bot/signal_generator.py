@@ -12,6 +12,9 @@ import sys
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.change_tracker import ChangeTracker, STAGE_SIGNALS
+from src.bot.weekly_aggregation import refresh_weekly_summary, week_start_of
+from src.bot.outbox import ensure_outbox_schema, enqueue_signal_notification
 
 # Loglama ayarları
 log_handlers = [logging.StreamHandler()]
@@ -34,6 +37,15 @@ class SignalGenerator:
             db_path: Veritabanı dosya yolu
         """
         self.db_path = db_path
+        self.change_tracker = ChangeTracker(db_path)
+        
+        # Sinyal bildirimleri sinyal kaydıyla aynı işlemde outbox tablosuna yazılır
+        conn = sqlite3.connect(self.db_path)
+        try:
+            ensure_outbox_schema(conn)
+            conn.commit()
+        finally:
+            conn.close()
         logger.info("SignalGenerator başlatıldı")
     
     def get_latest_data_with_indicators(self, symbol, limit=10):
@@ -274,6 +286,9 @@ class SignalGenerator:
         """
         Üretilen sinyali veritabanına kaydet
         
+        Aynı bar için önceki değerlendirmelerden kalan satırlar silinir; bar
+        başına yalnızca en son değerlendirmenin sonucu tutulur.
+        
         Args:
             signal: Sinyal bilgileri (dict)
             
@@ -286,6 +301,15 @@ class SignalGenerator:
         
         try:
             conn = sqlite3.connect(self.db_path)
+            bar_date = signal['last_date'].strftime('%Y-%m-%d') if isinstance(signal['last_date'], datetime) else signal['last_date']
+            # Aynı kayıttaki alım ve satım satırları tek değerlendirme olarak okunur
+            created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Bar yeniden değerlendirildiğinde önceki değerlendirmenin sinyalleri geçersizdir
+            superseded = conn.execute(
+                'DELETE FROM signals WHERE symbol = ? AND date(date) = date(?)',
+                (signal['symbol'], bar_date)
+            ).rowcount
             
             # Alım sinyali varsa kaydet
             if signal['buy_signal']:
@@ -295,12 +319,13 @@ class SignalGenerator:
                 VALUES (?, ?, ?, ?, ?, ?)
                 ''', (
                     signal['symbol'],
-                    signal['last_date'].strftime('%Y-%m-%d') if isinstance(signal['last_date'], datetime) else signal['last_date'],
+                    bar_date,
                     'BUY',
                     float(signal['current_price']),
                     signal['buy_reason'],
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    created_at
                 ))
+                enqueue_signal_notification(conn, signal, 'BUY')
             
             # Satım sinyali varsa kaydet
             if signal['sell_signal']:
@@ -310,12 +335,17 @@ class SignalGenerator:
                 VALUES (?, ?, ?, ?, ?, ?)
                 ''', (
                     signal['symbol'],
-                    signal['last_date'].strftime('%Y-%m-%d') if isinstance(signal['last_date'], datetime) else signal['last_date'],
+                    bar_date,
                     'SELL',
                     float(signal['current_price']),
                     signal['sell_reason'],
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    created_at
                 ))
+                enqueue_signal_notification(conn, signal, 'SELL')
+            
+            # Sinyalin düştüğü haftanın özetindeki sinyal sayılarını güncelle
+            if signal['buy_signal'] or signal['sell_signal'] or superseded:
+                refresh_weekly_summary(conn, signal['symbol'], week_start_of([signal['last_date']]))
             
             conn.commit()
             conn.close()
@@ -330,21 +360,87 @@ class SignalGenerator:
             logger.error(f"{signal['symbol']} için sinyal kaydetme hatası: {e}")
             return False
     
-    def generate_all_signals(self):
+    def get_stored_signal(self, symbol, last_date):
+        """
+        Belirtilen bar için daha önce kaydedilmiş sinyali getir
+        
+        Args:
+            symbol: Hisse sembolü
+            last_date: Sinyalin üretildiği son bar tarihi
+            
+        Returns:
+            dict: generate_signals biçiminde sinyal, kayıtlı sinyal yoksa None
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # Yalnızca barın en son değerlendirmesinde kaydedilen satırlar okunur
+            rows = conn.execute('''
+            SELECT signal_type, price, reason, date FROM signals
+            WHERE symbol = ? AND date(date) = date(?)
+            AND created_at = (
+                SELECT MAX(created_at) FROM signals WHERE symbol = ? AND date(date) = date(?)
+            )
+            ORDER BY id
+            ''', (symbol, last_date, symbol, last_date)).fetchall()
+        finally:
+            conn.close()
+        
+        if not rows:
+            return None
+        
+        signal = {
+            'symbol': symbol,
+            'buy_signal': False,
+            'sell_signal': False,
+            'buy_reason': "Yeterli sinyal yok",
+            'sell_reason': "Yeterli sinyal yok",
+            'current_price': None,
+            'last_date': rows[-1][3]
+        }
+        for signal_type, price, reason, _ in rows:
+            prefix = 'buy' if signal_type == 'BUY' else 'sell'
+            signal[f'{prefix}_signal'] = True
+            signal[f'{prefix}_reason'] = reason
+            signal['current_price'] = price
+        return signal
+    
+    def generate_all_signals(self, skip_unchanged=False):
         """
         Tüm BIST30 hisseleri için sinyal üret ve veritabanına kaydet
         
+        Args:
+            skip_unchanged: True ise fiyat ve göstergeleri son sinyal üretiminden
+                bu yana değişmeyen hisseler yeniden hesaplanmaz; kayıtlı sinyalleri
+                sonuca aynen eklenir
+            
         Returns:
-            dict: Alım ve satım sinyalleri olan hisseler
+            dict: Alım ve satım sinyalleri olan hisseler ve atlanan hisseler
         """
         buy_signals = []
         sell_signals = []
+        skipped_symbols = []
         
         for symbol in BIST30_SYMBOLS:
             try:
+                changed, last_date, fingerprint = self.change_tracker.check_changed(
+                    symbol, STAGE_SIGNALS, include_indicators=True
+                )
+                if skip_unchanged and not changed:
+                    skipped_symbols.append(symbol)
+                    # Değişmeyen hissenin son kayıtlı sinyali raporlarda ve bildirim sayılarında yer alır
+                    signal = self.get_stored_signal(symbol, last_date)
+                    if signal is not None and signal['buy_signal']:
+                        buy_signals.append(signal)
+                    if signal is not None and signal['sell_signal']:
+                        sell_signals.append(signal)
+                    continue
+                
                 signal = self.generate_signals(symbol)
                 self.save_signal_to_db(signal)
                 
+                if signal['current_price'] is not None:
+                    self.change_tracker.save_fingerprint(symbol, STAGE_SIGNALS, last_date, fingerprint)
+                
                 if signal['buy_signal']:
                     buy_signals.append(signal)
                 
@@ -354,11 +450,12 @@ class SignalGenerator:
             except Exception as e:
                 logger.error(f"{symbol} için sinyal işleme hatası: {e}")
         
-        logger.info(f"Toplam {len(buy_signals)} alım ve {len(sell_signals)} satım sinyali üretildi")
+        logger.info(f"Toplam {len(buy_signals)} alım ve {len(sell_signals)} satım sinyali üretildi ({len(skipped_symbols)} hisse değişmediği için atlandı)")
         
         return {
             'buy_signals': buy_signals,
-            'sell_signals': sell_signals
+            'sell_signals': sell_signals,
+            'skipped_symbols': skipped_symbols
         }
 
 # Test fonksiyonu
@@ -0,0 +1,181 @@
+"""
+BIST30 Alım-Satım Bot - Abonelik Dağıtım (Fan-out) Modülü
+
+Her çalıştırmanın sinyallerini kullanıcı aboneliklerine (User/Subscription
+modelleri) göre eşleştirir. Abonelikler bir kez okunup ters indekse
+(sembol -> sinyal tipi -> chat ID kümesi) çevrilir; her sinyal yalnızca
+kendi sembolünün ve tüm hisselere abone olanların kümesine bakar, kullanıcı
+başına tarama yapılmaz.
+
+Eşleşen bildirimler outbox tablosuna tek işlemde yazılır; OutboxDispatcher
+bunları sohbet başına paketleyip bildirim kuyruğu üzerinden eşzamanlı
+gönderir.
+"""
+
+import time
+import logging
+import sqlite3
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.outbox import ensure_outbox_schema, enqueue_signal_notifications
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('SubscriptionFanOut')
+
+# Tüm hisseleri kapsayan abonelik sembolü (src/models/subscription.py ile aynı)
+ALL_SYMBOLS = '*'
+
+SIGNAL_TYPES = ('BUY', 'SELL')
+
+ACTIVE_SUBSCRIPTIONS_QUERY = '''
+SELECT u.telegram_chat_id, s.symbol, s.notify_buy, s.notify_sell
+FROM subscription s
+JOIN "user" u ON u.id = s.user_id
+WHERE s.active = 1 AND u.telegram_chat_id IS NOT NULL AND u.telegram_chat_id != ''
+'''
+
+class SubscriptionIndex:
+    """Sembol -> sinyal tipi -> abone chat ID kümesi ters indeksi"""
+    
+    def __init__(self, rows=()):
+        """
+        SubscriptionIndex sınıfını başlat
+        
+        Args:
+            rows: (chat_id, symbol, notify_buy, notify_sell) satırları
+        """
+        self.by_symbol = {}
+        self.subscribers = set()
+        self.subscription_count = 0
+        for chat_id, symbol, notify_buy, notify_sell in rows:
+            chat_id = str(chat_id)
+            entry = self.by_symbol.setdefault(symbol, ({}, {}))
+            if notify_buy:
+                entry[0][chat_id] = None
+            if notify_sell:
+                entry[1][chat_id] = None
+            self.subscribers.add(chat_id)
+            self.subscription_count += 1
+    
+    def recipients(self, symbol, signal_type):
+        """
+        Sinyali alması gereken chat ID'ler
+        
+        Sembole özel ve tüm hisselere abone olanlar birleştirilir; aynı
+        kullanıcı iki yoldan da eşleşse bir kez döner.
+        
+        Args:
+            symbol: Hisse sembolü
+            signal_type: 'BUY' veya 'SELL'
+        
+        Returns:
+            set: Chat ID kümesi
+        """
+        position = SIGNAL_TYPES.index(signal_type)
+        specific = self.by_symbol.get(symbol)
+        wildcard = self.by_symbol.get(ALL_SYMBOLS)
+        if specific is None:
+            return set(wildcard[position]) if wildcard else set()
+        if wildcard is None:
+            return set(specific[position])
+        return specific[position].keys() | wildcard[position].keys()
+
+class SubscriptionFanOut:
+    """Sinyalleri abonelere eşleştirip outbox'a yazan sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        SubscriptionFanOut sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu (User/Subscription tablolarını içerir)
+        """
+        self.db_path = db_path
+        self.last_run_stats = {}
+        logger.info("SubscriptionFanOut başlatıldı")
+    
+    def load_index(self, conn):
+        """
+        Aktif abonelikleri okuyup ters indeksi oluştur
+        
+        Args:
+            conn: Açık SQLite bağlantısı
+        
+        Returns:
+            SubscriptionIndex: Abonelik indeksi (tablolar yoksa boş)
+        """
+        try:
+            return SubscriptionIndex(conn.execute(ACTIVE_SUBSCRIPTIONS_QUERY))
+        except sqlite3.OperationalError as e:
+            # Kullanıcı tabloları uygulama ilk açıldığında oluşturulur
+            logger.warning(f"Abonelik tabloları okunamadı: {e}")
+            return SubscriptionIndex()
+    
+    def match(self, signals, index):
+        """
+        Sinyalleri abonelere eşleştir
+        
+        Args:
+            signals: {'buy_signals': [...], 'sell_signals': [...]}
+            index: SubscriptionIndex
+        
+        Returns:
+            list: (chat_id, sinyal, 'BUY'/'SELL') demetleri
+        """
+        deliveries = []
+        for signal_type, key in (('BUY', 'buy_signals'), ('SELL', 'sell_signals')):
+            for signal in signals.get(key, []):
+                for chat_id in index.recipients(signal['symbol'], signal_type):
+                    deliveries.append((chat_id, signal, signal_type))
+        return deliveries
+    
+    def fan_out(self, signals):
+        """
+        Çalıştırmanın sinyallerini abonelere dağıt
+        
+        Args:
+            signals: {'buy_signals': [...], 'sell_signals': [...]}
+        
+        Returns:
+            dict: Abone sayısı, eşleşen bildirim sayısı, outbox'a eklenen
+                  bildirim sayısı ve eşleştirme süresi
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            ensure_outbox_schema(conn)
+            
+            start_time = time.perf_counter()
+            index = self.load_index(conn)
+            load_ms = (time.perf_counter() - start_time) * 1000
+            
+            start_time = time.perf_counter()
+            deliveries = self.match(signals, index)
+            match_ms = (time.perf_counter() - start_time) * 1000
+            
+            queued = enqueue_signal_notifications(conn, deliveries) if deliveries else 0
+            conn.commit()
+        finally:
+            conn.close()
+        
+        self.last_run_stats = {
+            'subscribers': len(index.subscribers),
+            'subscriptions': index.subscription_count,
+            'matched': len(deliveries),
+            'recipients': len({chat_id for chat_id, _, _ in deliveries}),
+            'queued': queued,
+            'load_ms': load_ms,
+            'match_ms': match_ms
+        }
+        logger.info(
+            f"Fan-out: {len(index.subscribers)} abone, {len(deliveries)} eşleşme, "
+            f"{queued} bildirim kuyruğa eklendi (eşleştirme {match_ms:.1f} ms)"
+        )
+        return self.last_run_stats
@@ -13,6 +13,7 @@ import sys
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.change_tracker import ChangeTracker, STAGE_ANALYZE
 
 # Loglama ayarları
 # LOG_FILE_PATH config.py'den None olarak gelecek, bu yüzden FileHandler kullanmayacağız.
@@ -42,6 +43,8 @@ class TechnicalAnalyzer:
             db_path: Veritabanı dosya yolu
         """
         self.db_path = db_path
+        self.change_tracker = ChangeTracker(db_path)
+        self.last_run_stats = {'processed': [], 'skipped': []}
         logger.info("TechnicalAnalyzer başlatıldı")
     
     def get_stock_data(self, symbol, limit=52):
@@ -287,26 +290,44 @@ class TechnicalAnalyzer:
             logger.error(f"{symbol} için gösterge kaydetme hatası: {e}")
             return False
     
-    def analyze_all_stocks(self):
+    def analyze_all_stocks(self, skip_unchanged=False):
         """
         Tüm BIST30 hisseleri için teknik analiz yap ve veritabanına kaydet
         
+        Args:
+            skip_unchanged: True ise son analizden bu yana verisi değişmeyen hisseler atlanır
+            
         Returns:
             dict: Her sembol için başarı durumu
         """
         results = {}
+        processed_symbols = []
+        skipped_symbols = []
         
         for symbol in BIST30_SYMBOLS:
             try:
+                changed, last_date, fingerprint = self.change_tracker.check_changed(symbol, STAGE_ANALYZE)
+                if skip_unchanged and not changed:
+                    # Göstergeler son analizden beri geçerli
+                    results[symbol] = True
+                    skipped_symbols.append(symbol)
+                    continue
+                
                 data = self.calculate_all_indicators(symbol)
                 success = self.save_indicators_to_db(symbol, data)
                 results[symbol] = success
+                processed_symbols.append(symbol)
+                
+                if success:
+                    self.change_tracker.save_fingerprint(symbol, STAGE_ANALYZE, last_date, fingerprint)
             except Exception as e:
                 logger.error(f"{symbol} için analiz hatası: {e}")
                 results[symbol] = False
         
+        self.last_run_stats = {'processed': processed_symbols, 'skipped': skipped_symbols}
+        
         success_count = sum(1 for success in results.values() if success)
-        logger.info(f"Toplam {len(results)} hisseden {success_count} tanesi başarıyla analiz edildi")
+        logger.info(f"Toplam {len(results)} hisseden {success_count} tanesi başarıyla analiz edildi ({len(skipped_symbols)} tanesi değişmediği için atlandı)")
         
         return results
 
@@ -1,19 +1,31 @@
 """
 BIST30 Alım-Satım Bot - Telegram Bildirim Modülü
+
+Tüm gönderimler süreç başına tek bir arka plan olay döngüsü (event loop)
+thread'inde çalışır. Bot nesnesi ve HTTP bağlantı havuzu bu döngüde bir kez
+kurulur ve mesajlar arasında yeniden kullanılır; her mesaj için yeni döngü
+ve yeni TLS bağlantısı açılmaz.
+
+Mesajlar doğrudan değil, öncelikli ve hız sınırlı giden kuyruk
+(notification_queue.OutboundQueue) üzerinden gönderilir.
 """
 
 import os
+import re
 import logging
 import sys
 import json
+import threading
 from datetime import datetime
 import asyncio
 from telegram import Bot
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.notification_queue import OutboundQueue, PRIORITY_SIGNAL, PRIORITY_NORMAL, PRIORITY_SUMMARY
 
 # Loglama ayarları
 log_handlers = [logging.StreamHandler()]
@@ -25,61 +37,364 @@ logging.basicConfig(
 )
 logger = logging.getLogger('TelegramNotifier')
 
+class EventLoopThread:
+    """Arka plan thread'inde sürekli çalışan tek bir asyncio olay döngüsü"""
+    
+    def __init__(self, name='TelegramEventLoop'):
+        """
+        EventLoopThread sınıfını başlat (döngü ilk kullanımda açılır)
+        
+        Args:
+            name: Thread adı
+        """
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def _ensure_started(self):
+        """Döngü çalışmıyorsa thread'i başlat"""
+        with self._lock:
+            if self._loop is not None and self._thread.is_alive():
+                return self._loop
+            
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+            
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            return loop
+    
+    def submit(self, coroutine):
+        """
+        Coroutine'i arka plan döngüsünde çalıştır
+        
+        Args:
+            coroutine: Çalıştırılacak coroutine
+        
+        Returns:
+            concurrent.futures.Future: Coroutine sonucunu taşıyan future
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_started())
+    
+    def stop(self):
+        """Döngüyü durdur ve thread'in bitmesini bekle"""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+# Tüm TelegramNotifier örneklerinin paylaştığı olay döngüsü
+_event_loop_thread = EventLoopThread()
+
+# Açılış/kapanış HTML etiketleri (<b>, </b>, <a href="...">)
+_TAG_PATTERN = re.compile(r'<(/?)[a-zA-Z][a-zA-Z0-9-]*(?:\s[^>]*)?>')
+
+# Birleştirilen sinyal blokları arasındaki ayraç
+SIGNAL_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+def _balanced_units(block):
+    """
+    Bloğu, içinde açık HTML etiketi kalmayan satır gruplarına ayır
+    
+    Mesajlar yalnızca bu grupların arasından bölünür; böylece bir etiket
+    hiçbir zaman iki mesaja dağılmaz.
+    """
+    units = []
+    current = []
+    depth = 0
+    for line in block.split('\n'):
+        current.append(line)
+        for closing in _TAG_PATTERN.findall(line):
+            depth += -1 if closing else 1
+        if depth <= 0:
+            units.append('\n'.join(current))
+            current = []
+            depth = 0
+    if current:
+        units.append('\n'.join(current))
+    return units
+
+def _split_block(block, limit):
+    """Sınırı aşan bloğu etiket sınırlarına dikkat ederek parçalara böl"""
+    if len(block) <= limit:
+        return [block]
+    
+    pieces = []
+    current = ''
+    for unit in _balanced_units(block):
+        # Tek başına sınırı aşan grup etiketlerinden arındırılıp düz metin olarak bölünür
+        chunks = [unit]
+        if len(unit) > limit:
+            text = _TAG_PATTERN.sub('', unit)
+            chunks = [text[i:i + limit] for i in range(0, len(text), limit)]
+        for chunk in chunks:
+            candidate = f"{current}\n{chunk}" if current else chunk
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                pieces.append(current)
+                current = chunk
+    if current:
+        pieces.append(current)
+    return pieces
+
+def pack_blocks(blocks, limit=TELEGRAM_MESSAGE_LIMIT, separator=SIGNAL_SEPARATOR):
+    """
+    Mesaj bloklarını paketle ve her mesajın hangi bloklardan oluştuğunu döndür
+    
+    Bloklar sırası korunarak açgözlü biçimde birleştirilir; bir blok ancak
+    kendisi sınırı aşıyorsa (ör. yüzlerce hisselik özet) birden fazla
+    mesaja bölünür.
+    
+    Args:
+        blocks: Mesaj blokları
+        limit: Mesaj başına en fazla karakter
+        separator: Bloklar arasına konan ayraç
+    
+    Returns:
+        list: (mesaj, blok indeksleri kümesi) demetleri
+    """
+    packs = []
+    current = ''
+    members = set()
+    for index, block in enumerate(blocks):
+        block = block.strip()
+        if not block:
+            continue
+        for piece in _split_block(block, limit):
+            candidate = f"{current}{separator}{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+                members.add(index)
+            else:
+                packs.append((current, members))
+                current = piece
+                members = {index}
+    if current:
+        packs.append((current, members))
+    return packs
+
+def coalesce_messages(blocks, limit=TELEGRAM_MESSAGE_LIMIT, separator=SIGNAL_SEPARATOR):
+    """
+    Mesaj bloklarını Telegram karakter sınırını aşmadan en az sayıda mesaja paketle
+    
+    Args:
+        blocks: format_buy_signal/format_sell_signal/format_weekly_report çıktıları
+        limit: Mesaj başına en fazla karakter
+        separator: Bloklar arasına konan ayraç
+    
+    Returns:
+        list: Gönderilecek mesajlar
+    """
+    return [message for message, _ in pack_blocks(blocks, limit, separator)]
+
 class TelegramNotifier:
     """Telegram üzerinden bildirim gönderen sınıf"""
     
-    def __init__(self, token=TELEGRAM_TOKEN, chat_id=TELEGRAM_CHAT_ID):
+    def __init__(self, token=TELEGRAM_TOKEN, chat_id=TELEGRAM_CHAT_ID,
+                 connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE,
+                 base_url=TELEGRAM_API_BASE_URL, global_rate=TELEGRAM_GLOBAL_RATE,
+                 chat_rate=TELEGRAM_CHAT_RATE):
         """
         TelegramNotifier sınıfını başlat
         
         Args:
             token: Telegram Bot API token
             chat_id: Mesaj gönderilecek chat ID
+            connection_pool_size: Kalıcı HTTP bağlantı havuzu boyutu (kuyruk işçi sayısı)
+            base_url: Bot API adresi (yük testlerinde sahte sunucu adresi)
+            global_rate: Bot genelinde saniyede mesaj sınırı
+            chat_rate: Sohbet başına saniyede mesaj sınırı
         """
         self.token = token
         self.chat_id = chat_id
-        self.bot = Bot(token=token)
+        self.connection_pool_size = connection_pool_size
+        self.bot = Bot(
+            token=token,
+            base_url=base_url,
+            request=HTTPXRequest(
+                connection_pool_size=connection_pool_size,
+                pool_timeout=TELEGRAM_SEND_TIMEOUT
+            )
+        )
+        self._event_loop = _event_loop_thread
+        # Bot ilk gönderimde olay döngüsü içinde bir kez başlatılır
+        self._bot_ready = None
+        # Her işçi bir HTTP bağlantısı kullanır
+        self.queue = OutboundQueue(
+            self._deliver, workers=connection_pool_size,
+            global_rate=global_rate, chat_rate=chat_rate
+        )
         logger.info("TelegramNotifier başlatıldı")
     
-    async def send_message(self, message):
+    async def _ensure_bot(self):
+        """Bot'u ve bağlantı havuzunu (olay döngüsü içinde) bir kez başlat"""
+        if self._bot_ready is None:
+            self._bot_ready = asyncio.ensure_future(self.bot.initialize())
+        try:
+            await asyncio.shield(self._bot_ready)
+        except Exception:
+            # Başarısız başlatma bir sonraki gönderimde yeniden denenir
+            self._bot_ready = None
+            raise
+    
+    async def _deliver(self, chat_id, message):
+        """
+        Mesajı Telegram'a gönder (hataları kuyruğa iletir)
+        
+        Args:
+            chat_id: Hedef chat ID
+            message: Gönderilecek mesaj
+        """
+        await self._ensure_bot()
+        await self.bot.send_message(
+            chat_id=chat_id,
+            text=message,
+            parse_mode=ParseMode.HTML
+        )
+        logger.info("Telegram mesajı gönderildi")
+    
+    async def send_message(self, message, chat_id=None, priority=PRIORITY_NORMAL):
         """
         Telegram üzerinden mesaj gönder
         
         Args:
             message: Gönderilecek mesaj
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            priority: Kuyruk önceliği (PRIORITY_*)
             
         Returns:
             bool: İşlem başarılı ise True, değilse False
         """
-        try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=ParseMode.HTML
-            )
-            logger.info("Telegram mesajı gönderildi")
-            return True
-        except TelegramError as e:
-            logger.error(f"Telegram mesaj gönderme hatası: {e}")
-            return False
+        return await self.queue.submit(chat_id or self.chat_id, message, priority)
     
-    def send_message_sync(self, message):
+    async def send_in_order(self, packs, chat_id=None, results=None):
+        """
+        Mesajları aynı sohbete sırayla gönder
+        
+        Her mesaj bir öncekinin sonucu beklendikten sonra kuyruğa verilir;
+        kuyruk işçileri eşzamanlı çalıştığı için aynı anda kuyruğa verilen
+        mesajlar sohbete farklı sırayla ulaşabilirdi. Farklı sohbetlerin
+        mesajları birbirini beklemez.
+        
+        Args:
+            packs: (mesaj, öncelik) listesi (gönderim sırasıyla)
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            results: Sonuçların her mesajdan hemen sonra ekleneceği liste
+                (gönderim iptal edilse de o ana kadarki sonuçlar okunabilir)
+        
+        Returns:
+            list: Her mesaj için gönderim sonucu (bool)
+        """
+        if results is None:
+            results = []
+        for message, priority in packs:
+            results.append(await self.send_message(message, chat_id, priority))
+        return results
+    
+    async def send_messages(self, messages, chat_id=None, priority=PRIORITY_NORMAL):
+        """
+        Birden fazla bağımsız mesajı kuyruk üzerinden eşzamanlı gönder
+        
+        Mesajlar aynı anda kuyruğa verilir ve işçiler tarafından paralel
+        gönderilir; sohbete ulaşma sırası garanti edilmez. Sıranın önemli
+        olduğu mesajlar (ör. bölünmüş paketler) için send_in_order kullanılır.
+        
+        Args:
+            messages: Gönderilecek mesaj listesi
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            priority: Kuyruk önceliği (PRIORITY_*)
+        
+        Returns:
+            list: Her mesaj için gönderim sonucu (bool)
+        """
+        return list(await asyncio.gather(*(self.send_message(message, chat_id, priority) for message in messages)))
+    
+    def send(self, message, chat_id=None, priority=PRIORITY_NORMAL):
+        """
+        Mesajı beklemeden gönder
+        
+        Args:
+            message: Gönderilecek mesaj
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            priority: Kuyruk önceliği (PRIORITY_*)
+        
+        Returns:
+            concurrent.futures.Future: Sonucu bool olan future
+        """
+        return self._event_loop.submit(self.send_message(message, chat_id, priority))
+    
+    def send_batch(self, messages, chat_id=None, priority=PRIORITY_NORMAL):
+        """
+        Bağımsız mesaj listesini beklemeden, eşzamanlı olarak gönder
+        
+        Sohbete ulaşma sırası garanti edilmez; sıralı gönderim için
+        send_sequence kullanılır.
+        
+        Args:
+            messages: Gönderilecek mesaj listesi
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            priority: Kuyruk önceliği (PRIORITY_*)
+        
+        Returns:
+            concurrent.futures.Future: Sonucu bool listesi olan future
+        """
+        return self._event_loop.submit(self.send_messages(messages, chat_id, priority))
+    
+    def send_sequence(self, packs, chat_id=None, results=None):
+        """
+        Mesajları beklemeden, sırası korunarak aynı sohbete gönder
+        
+        Sıra garantisi veren tek toplu gönderimdir: her mesaj bir öncekinin
+        sonucu beklendikten sonra kuyruğa verilir. Future iptal edilirse
+        henüz gönderilmemiş mesajlar gönderilmez.
+        
+        Args:
+            packs: (mesaj, öncelik) listesi (gönderim sırasıyla)
+            chat_id: Hedef chat ID (None ise varsayılan chat)
+            results: Sonuçların her mesajdan hemen sonra ekleneceği liste
+        
+        Returns:
+            concurrent.futures.Future: Sonucu bool listesi olan future
+        """
+        return self._event_loop.submit(self.send_in_order(packs, chat_id, results))
+    
+    def send_message_sync(self, message, timeout=TELEGRAM_SEND_TIMEOUT, priority=PRIORITY_NORMAL):
         """
         Telegram üzerinden mesaj gönder (senkron)
         
         Args:
             message: Gönderilecek mesaj
+            timeout: Beklenecek en uzun süre (saniye)
+            priority: Kuyruk önceliği (PRIORITY_*)
             
         Returns:
             bool: İşlem başarılı ise True, değilse False
         """
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(self.send_message(message))
-            return result
-        finally:
-            loop.close()
+        return self.send(message, priority=priority).result(timeout)
+    
+    def get_queue_stats(self):
+        """Giden kuyruk metriklerini getir (bkz. OutboundQueue.get_stats)"""
+        return self.queue.get_stats()
+    
+    def close(self, timeout=TELEGRAM_SEND_TIMEOUT):
+        """Kuyruk işçilerini durdur ve bağlantı havuzunu kapat"""
+        self._event_loop.submit(self.queue.close()).result(timeout)
+        if self._bot_ready is not None:
+            self._event_loop.submit(self.bot.shutdown()).result(timeout)
+            self._bot_ready = None
     
     def format_buy_signal(self, signal):
         """
@@ -166,12 +481,29 @@ class TelegramNotifier:
             message += "<b>🔴 SATIM SİNYALİ YOK</b>\n\n"
         
         message += """
-<i>Detaylı bilgiler için her sinyal ayrıca gönderilecektir.</i>
+<i>Her sinyalin detayı toplu mesajlarda #hisse etiketiyle gönderilecektir.</i>
 
 #BIST30 #HaftalıkRapor
 """
         return message
     
+    def format_signal_messages(self, signals):
+        """
+        Alım ve satım sinyallerini detaylarıyla birlikte az sayıda mesaja paketle
+        
+        Her sinyal bloğu (neden, hedef, stop ve #hisse etiketi) olduğu gibi
+        korunur; yalnızca aynı mesajda birleştirilir.
+        
+        Args:
+            signals: Tüm sinyaller (dict)
+        
+        Returns:
+            list: Gönderilecek mesajlar
+        """
+        blocks = [self.format_buy_signal(signal) for signal in signals.get('buy_signals', [])]
+        blocks += [self.format_sell_signal(signal) for signal in signals.get('sell_signals', [])]
+        return coalesce_messages(blocks)
+    
     def send_signals(self, signals):
         """
         Tüm sinyalleri Telegram üzerinden gönder
@@ -186,21 +518,21 @@ class TelegramNotifier:
             buy_signals = signals.get('buy_signals', [])
             sell_signals = signals.get('sell_signals', [])
             
-            # Haftalık rapor gönder
-            weekly_report = self.format_weekly_report(signals)
-            self.send_message_sync(weekly_report)
-            
-            # Alım sinyallerini gönder
-            for signal in buy_signals:
-                message = self.format_buy_signal(signal)
-                self.send_message_sync(message)
+            # Paketler sohbete sırayla gönderilir: önce alım/satım sinyalleri,
+            # sonra haftalık özet; bölünmüş mesajların parçaları karışmaz
+            signal_messages = self.format_signal_messages(signals)
+            summary_messages = coalesce_messages([self.format_weekly_report(signals)])
+            packs = [(message, PRIORITY_SIGNAL) for message in signal_messages]
+            packs += [(message, PRIORITY_SUMMARY) for message in summary_messages]
             
-            # Satım sinyallerini gönder
-            for signal in sell_signals:
-                message = self.format_sell_signal(signal)
-                self.send_message_sync(message)
+            # Hız sınırı nedeniyle toplam süre mesaj sayısına bağlıdır; kuyruk
+            # her denemeyi zaman aşımı ve deneme sınırıyla bitirdiği için beklenir
+            self.send_sequence(packs).result()
             
-            logger.info(f"Toplam {len(buy_signals)} alım ve {len(sell_signals)} satım sinyali gönderildi")
+            logger.info(
+                f"Toplam {len(buy_signals)} alım ve {len(sell_signals)} satım sinyali "
+                f"{len(signal_messages) + len(summary_messages)} mesajda gönderildi"
+            )
             return True
         
         except Exception as e:
@@ -0,0 +1,356 @@
+"""
+BIST30 Alım-Satım Bot - Walk-Forward Doğrulama Modülü
+
+Fiyat geçmişini kayan eğitim/test pencerelerine böler, her eğitim
+penceresinde strateji parametrelerini optimize eder ve seçilen
+parametreleri hemen ardından gelen test penceresinde örnek dışı olarak
+değerlendirir. Pencereler süreç havuzunda paralel çalıştırılır.
+
+Doğrulama HTTP isteği içinde değil, JobManager'da 'walk-forward' iş türü
+olarak çalışır; durum ve sonuç jobs tablosundan okunur.
+"""
+
+import os
+import logging
+import itertools
+import threading
+import multiprocessing
+import numpy as np
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+from src.bot.backtester import (
+    PortfolioBacktester, compute_indicator_panel, compute_signal_panel, run_backtest,
+    validate_backtest_request
+)
+
+# Loglama ayarları
+log_handlers = [logging.StreamHandler()]
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=log_handlers
+)
+logger = logging.getLogger('WalkForwardRunner')
+
+# Eğitimde maksimize edilebilecek (büyük değeri iyi olan) özet metrikleri
+WALK_FORWARD_OBJECTIVES = (
+    'total_return_percentage', 'cagr_percentage', 'sharpe_ratio', 'sortino_ratio',
+    'calmar_ratio', 'success_rate', 'avg_return_percentage', 'profit_factor'
+)
+
+def validate_walk_forward_request(data):
+    """
+    Walk-forward isteğinin parametrelerini doğrula
+    
+    Args:
+        data: İstek gövdesi (train_bars, test_bars, workers, symbols, param_grid, objective)
+    
+    Returns:
+        dict: WalkForwardRunner.run() parametreleri
+    
+    Raises:
+        ValueError: Geçersiz parametre
+    """
+    options = {}
+    for name in ('train_bars', 'test_bars', 'workers'):
+        value = data.get(name)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value) or value != int(value):
+            raise ValueError(f"{name} tam sayı olmalı")
+        if value < 1:
+            raise ValueError(f"{name} en az 1 olmalı: {value}")
+        options[name] = int(value)
+    if options.get('workers', 0) > (os.cpu_count() or 1):
+        raise ValueError(f"workers en fazla {os.cpu_count() or 1} olabilir")
+    
+    if data.get('symbols'):
+        options['symbols'], _ = validate_backtest_request(symbols=data['symbols'])
+    
+    if data.get('param_grid'):
+        param_grid = data['param_grid']
+        if not isinstance(param_grid, dict):
+            raise ValueError("param_grid parametre adı -> değer listesi nesnesi olmalı")
+        combinations = 1
+        for name, values in param_grid.items():
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"param_grid.{name} boş olmayan bir liste olmalı")
+            for value in values:
+                validate_backtest_request(params={name: value})
+            combinations *= len(values)
+        if combinations > WALK_FORWARD_MAX_COMBINATIONS:
+            raise ValueError(f"param_grid en fazla {WALK_FORWARD_MAX_COMBINATIONS} kombinasyon içerebilir: {combinations}")
+        options['param_grid'] = param_grid
+    
+    if data.get('objective'):
+        if data['objective'] not in WALK_FORWARD_OBJECTIVES:
+            raise ValueError(f"objective şunlardan biri olmalı: {', '.join(WALK_FORWARD_OBJECTIVES)}")
+        options['objective'] = data['objective']
+    
+    return options
+
+def _slice_panel(panel, start, end):
+    """Paneli [start, end) bar aralığına göre kes"""
+    sliced = {'dates': panel['dates'][start:end], 'symbols': panel['symbols']}
+    for key, value in panel.items():
+        if key not in sliced:
+            sliced[key] = value[start:end]
+    return sliced
+
+def _param_combinations(param_grid):
+    """Parametre ızgarasındaki tüm kombinasyonları üret"""
+    keys = sorted(param_grid)
+    for values in itertools.product(*(param_grid[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+def _run_window(window):
+    """
+    Tek bir walk-forward penceresini çalıştır (süreç havuzunda çalışır)
+    
+    Args:
+        window: Pencere tanımı ve bu pencereye ait panel/gösterge dilimleri
+    
+    Returns:
+        dict: Seçilen parametreler, eğitim ve test metrikleri; ızgaradaki hiçbir
+            kombinasyon hedef metriği üretemediyse optimized=False ve test sonucu yok
+    """
+    train_bars = window['train_bars']
+    panel = window['panel']
+    indicators = window['indicators']
+    objective = window['objective']
+    
+    train_panel = _slice_panel(panel, 0, train_bars)
+    train_indicators = {key: value[:train_bars] for key, value in indicators.items()}
+    test_panel = _slice_panel(panel, train_bars, len(panel['dates']))
+    test_indicators = {key: value[train_bars:] for key, value in indicators.items()}
+    
+    # Eğitim penceresinde en iyi parametreleri bul
+    best_params = None
+    best_score = -np.inf
+    best_train_summary = None
+    evaluated = 0
+    
+    for params in _param_combinations(window['param_grid']):
+        signals = compute_signal_panel(train_panel, train_indicators, params)
+        summary = run_backtest(train_panel, signals, params)['summary']
+        evaluated += 1
+        
+        # İşlem olmayan veya sıfır varyanslı pencerede metrik None/NaN olabilir
+        score = summary.get(objective)
+        if score is not None and np.isfinite(score) and score > best_score:
+            best_score = score
+            best_params = params
+            best_train_summary = summary
+    
+    window_info = {
+        'window': window['index'],
+        'train_start': train_panel['dates'][0],
+        'train_end': train_panel['dates'][-1],
+        'test_start': test_panel['dates'][0],
+        'test_end': test_panel['dates'][-1],
+        'evaluated_params': evaluated
+    }
+    
+    # Hiçbir kombinasyon puanlanamadıysa pencere optimize edilemez; ızgara dışı
+    # varsayılanlarla test edilip optimize edilmiş gibi raporlanmaz
+    if best_params is None:
+        return {
+            **window_info,
+            'optimized': False,
+            'best_params': None,
+            'train_summary': None,
+            'test_summary': None,
+            'test_equity': [],
+            'test_dates': []
+        }
+    
+    # Seçilen parametreleri örnek dışı test penceresinde değerlendir
+    test_signals = compute_signal_panel(test_panel, test_indicators, best_params)
+    test_result = run_backtest(test_panel, test_signals, best_params)
+    
+    return {
+        **window_info,
+        'optimized': True,
+        'best_params': best_params,
+        'train_summary': best_train_summary,
+        'test_summary': test_result['summary'],
+        'test_equity': [point['equity'] for point in test_result['equity_curve']],
+        'test_dates': [point['date'] for point in test_result['equity_curve']]
+    }
+
+class WalkForwardRunner:
+    """Strateji parametrelerinin walk-forward doğrulamasını yapan sınıf"""
+    
+    def __init__(self, db_path=DATABASE_PATH):
+        """
+        WalkForwardRunner sınıfını başlat
+        
+        Args:
+            db_path: Veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        self.backtester = PortfolioBacktester(db_path)
+        self._panel_cache = {}
+        self._lock = threading.Lock()
+        logger.info("WalkForwardRunner başlatıldı")
+    
+    def _get_panels(self, symbols=None):
+        """
+        Fiyat ve gösterge panellerini getir (pencereler arasında önbelleklenir)
+        
+        Göstergeler yalnızca geçmiş barları kullandığı için tüm geçmiş üzerinde
+        bir kez hesaplanıp her pencereye dilimlenebilir.
+        """
+        panel = self.backtester.load_price_panel(symbols)
+        if len(panel['dates']) == 0:
+            return panel, {}
+        
+        cache_key = (
+            tuple(panel['symbols']),
+            panel['dates'][0],
+            panel['dates'][-1],
+            len(panel['dates']),
+            float(np.nansum(panel['close'][-1]))
+        )
+        
+        with self._lock:
+            cached = self._panel_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Gösterge panelleri önbellekten kullanıldı")
+            return panel, cached
+        
+        indicators = compute_indicator_panel(panel)
+        with self._lock:
+            self._panel_cache = {cache_key: indicators}
+        return panel, indicators
+    
+    def build_windows(self, bar_count, train_bars=WALK_FORWARD_TRAIN_BARS, test_bars=WALK_FORWARD_TEST_BARS):
+        """
+        Kayan eğitim/test pencerelerini hesapla
+        
+        Args:
+            bar_count: Toplam bar sayısı
+            train_bars: Eğitim penceresi uzunluğu
+            test_bars: Test penceresi uzunluğu
+        
+        Returns:
+            list: (eğitim_başlangıç, test_başlangıç, test_bitiş) bar indeksleri
+        """
+        windows = []
+        start = 0
+        while start + train_bars + test_bars <= bar_count:
+            windows.append((start, start + train_bars, start + train_bars + test_bars))
+            start += test_bars
+        return windows
+    
+    def run(self, symbols=None, train_bars=WALK_FORWARD_TRAIN_BARS, test_bars=WALK_FORWARD_TEST_BARS,
+            param_grid=None, objective=WALK_FORWARD_OBJECTIVE, workers=WALK_FORWARD_WORKERS,
+            progress_callback=None):
+        """
+        Walk-forward doğrulamasını çalıştır
+        
+        Args:
+            symbols: Sembol listesi (None ise tüm semboller)
+            train_bars: Eğitim penceresi uzunluğu (bar)
+            test_bars: Test penceresi uzunluğu (bar)
+            param_grid: Optimize edilecek parametre ızgarası
+            objective: Eğitimde maksimize edilecek özet metriği
+            workers: Paralel süreç sayısı
+            progress_callback: Her pencere bittiğinde (biten, toplam) ile çağrılır
+        
+        Returns:
+            dict: Pencere sonuçları ve birleştirilmiş örnek dışı performans
+        """
+        try:
+            started = datetime.now()
+            panel, indicators = self._get_panels(symbols)
+            windows = self.build_windows(len(panel['dates']), train_bars, test_bars)
+            
+            if not windows:
+                return {
+                    'success': False,
+                    'message': f"Walk-forward için yeterli veri yok: {len(panel['dates'])} bar, en az {train_bars + test_bars} bar gerekli"
+                }
+            
+            tasks = [{
+                'index': index,
+                'train_bars': test_start - train_start,
+                'panel': _slice_panel(panel, train_start, test_end),
+                'indicators': {key: value[train_start:test_end] for key, value in indicators.items()},
+                'param_grid': param_grid or WALK_FORWARD_PARAM_GRID,
+                'objective': objective
+            } for index, (train_start, test_start, test_end) in enumerate(windows)]
+            
+            workers = min(workers or os.cpu_count() or 1, len(tasks))
+            results = []
+            
+            if workers > 1:
+                # Süreç arka plan thread'lerini (Telegram döngüsü, outbox, zamanlayıcı,
+                # iş havuzu) çalıştırırken fork edilirse alt süreç kilitlenebilir;
+                # işçiler 'spawn' ile temiz bir yorumlayıcıda başlatılır
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    for result in executor.map(_run_window, tasks):
+                        results.append(result)
+                        if progress_callback:
+                            progress_callback(len(results), len(tasks))
+            else:
+                for task in tasks:
+                    results.append(_run_window(task))
+                    if progress_callback:
+                        progress_callback(len(results), len(tasks))
+            
+            # Test pencerelerinin getirilerini zincirleyerek örnek dışı özsermaye eğrisi oluştur
+            # (optimize edilemeyen pencereler zincire katılmaz)
+            out_of_sample_curve = []
+            capital = 1.0
+            for result in results:
+                equity = np.asarray(result.pop('test_equity'), dtype=float)
+                dates = result.pop('test_dates')
+                if not result['optimized']:
+                    continue
+                scaled = capital * equity / equity[0]
+                out_of_sample_curve.extend({'date': date, 'equity': float(value)} for date, value in zip(dates, scaled))
+                capital = float(scaled[-1])
+            
+            optimized = [result for result in results if result['optimized']]
+            skipped = [result['window'] for result in results if not result['optimized']]
+            if not optimized:
+                return {
+                    'success': False,
+                    'message': f"Walk-forward pencerelerinin hiçbirinde {objective} metriği hesaplanamadı (işlem yok veya sabit sonuç); parametre ızgarasını veya pencere uzunluklarını değiştirin"
+                }
+            if skipped:
+                logger.warning(f"Optimize edilemeyen {len(skipped)} pencere örnek dışı sonuca katılmadı: {skipped}")
+            
+            test_returns = [result['test_summary']['total_return_percentage'] for result in optimized]
+            elapsed = (datetime.now() - started).total_seconds()
+            logger.info(f"Walk-forward tamamlandı: {len(results)} pencere, {workers} süreç ({elapsed:.2f} sn)")
+            
+            return {
+                'success': True,
+                'window_count': len(results),
+                'optimized_window_count': len(optimized),
+                'skipped_windows': skipped,
+                'train_bars': train_bars,
+                'test_bars': test_bars,
+                'objective': objective,
+                'workers': workers,
+                'out_of_sample': {
+                    'total_return_percentage': (capital - 1) * 100,
+                    'avg_window_return_percentage': float(np.mean(test_returns)),
+                    'positive_windows': sum(1 for value in test_returns if value > 0),
+                    'equity_curve': out_of_sample_curve
+                },
+                'windows': results,
+                'elapsed_seconds': elapsed
+            }
+        except Exception as e:
+            logger.error(f"Walk-forward hatası: {e}")
+            return {
+                'success': False,
+                'message': f"Walk-forward hatası: {str(e)}"
+            }
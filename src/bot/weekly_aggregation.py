@@ -0,0 +1,249 @@
+"""
+BIST30 Alım-Satım Bot - Haftalık Toplulaştırma Modülü
+
+Tüm hisselerin haftalık açılış referansı, kapanış, en yüksek, en düşük ve
+toplam hacim değerlerini SQLite pencere fonksiyonlarıyla tek sorguda
+hesaplar. Hafta başlangıcı date(date, 'weekday 0', '-6 days') ifadesiyle
+(ISO haftasının Pazartesi günü) bulunur.
+
+Sonuçlar weekly_summary tablosunda (symbol, week_start) anahtarıyla
+saklanır; yeni barlar ve sinyaller yalnızca etkiledikleri haftaları
+yeniden hesaplar.
+"""
+
+import pandas as pd
+from datetime import datetime
+
+# Konfigürasyon dosyasını import et
+from src.bot.config import *
+
+# Hafta başlangıcı (Pazartesi) SQL ifadesi
+WEEK_START_SQL = "date(date, 'weekday 0', '-6 days')"
+
+# weekly_summary tablosunda saklanan sütunlar
+WEEKLY_SUMMARY_COLUMNS = [
+    'symbol', 'week_start', 'first_date', 'last_date', 'weekly_open', 'first_price',
+    'last_price', 'weekly_high', 'weekly_low', 'weekly_volume', 'bar_count',
+    'weekly_change', 'weekly_change_percentage', 'buy_signal_count', 'sell_signal_count'
+]
+
+# Önceki haftanın kapanışını bulmak için pencere öncesine eklenen gün sayısı
+# (bayram tatilleri dahil en uzun işlem arası)
+PREVIOUS_CLOSE_LOOKBACK_DAYS = 21
+
+WEEKLY_AGGREGATE_QUERY = f"""
+WITH bars AS (
+    SELECT
+        symbol,
+        date,
+        {WEEK_START_SQL} AS week_start,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        LAG(close) OVER (PARTITION BY symbol ORDER BY date) AS previous_close
+    FROM stock_data
+    WHERE date >= date(?, '-{PREVIOUS_CLOSE_LOOKBACK_DAYS} days') AND date <= ? {{symbol_filter}}
+),
+weekly AS (
+    SELECT
+        symbol,
+        week_start,
+        date,
+        high,
+        low,
+        volume,
+        FIRST_VALUE(open) OVER week AS weekly_open,
+        FIRST_VALUE(COALESCE(previous_close, close)) OVER week AS first_price,
+        LAST_VALUE(close) OVER week AS last_price
+    FROM bars
+    WHERE week_start >= ?
+    WINDOW week AS (
+        PARTITION BY symbol, week_start ORDER BY date
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    )
+)
+SELECT
+    symbol,
+    week_start,
+    MIN(date) AS first_date,
+    MAX(date) AS last_date,
+    MAX(weekly_open) AS weekly_open,
+    MAX(first_price) AS first_price,
+    MAX(last_price) AS last_price,
+    MAX(high) AS weekly_high,
+    MIN(low) AS weekly_low,
+    SUM(volume) AS weekly_volume,
+    COUNT(*) AS bar_count
+FROM weekly
+GROUP BY symbol, week_start
+ORDER BY week_start, symbol
+"""
+
+SIGNAL_COUNT_QUERY = f"""
+SELECT
+    symbol,
+    {WEEK_START_SQL} AS week_start,
+    SUM(signal_type = 'BUY') AS buy_signal_count,
+    SUM(signal_type = 'SELL') AS sell_signal_count
+FROM signals
+WHERE date >= ? AND date <= ? {{symbol_filter}}
+GROUP BY symbol, week_start
+"""
+
+def week_start_of(dates):
+    """
+    Tarihlerin bulunduğu haftanın Pazartesi gününü bul
+    
+    Args:
+        dates: Tarih listesi (str veya datetime)
+    
+    Returns:
+        list: YYYY-MM-DD formatında hafta başlangıçları
+    """
+    dates = pd.to_datetime(pd.Series(dates))
+    return (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).dt.strftime('%Y-%m-%d').tolist()
+
+def ensure_weekly_indexes(conn):
+    """
+    Haftalık toplulaştırma sorgusunun kullandığı indeksleri oluştur
+    
+    (symbol, date) birincil anahtarı sembol filtreli sorguları karşılar;
+    tüm evreni tarayan sorgular için ayrıca tarih indeksi eklenir.
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_stock_data_date ON stock_data (date)')
+
+def load_weekly_aggregates(conn, start_date, end_date, symbols=None):
+    """
+    [start_date, end_date] aralığındaki tüm haftaların sembol bazında özetini getir
+    
+    first_price, haftadan önceki son kapanıştır (yoksa haftanın ilk kapanışı);
+    böylece haftalık değişim hem günlük hem haftalık barlarda tutarlıdır.
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        start_date: Başlangıç tarihi (YYYY-MM-DD, haftanın Pazartesi günü)
+        end_date: Bitiş tarihi (YYYY-MM-DD)
+        symbols: Sembol listesi (None ise tüm semboller)
+    
+    Returns:
+        pandas.DataFrame: (symbol, week_start) başına haftalık değerler ve değişim
+    """
+    symbol_filter, symbol_params = _symbol_filter(symbols)
+    weekly = pd.read_sql_query(
+        WEEKLY_AGGREGATE_QUERY.format(symbol_filter=symbol_filter),
+        conn,
+        params=[start_date, end_date] + symbol_params + [start_date]
+    )
+    weekly['weekly_change'] = weekly['last_price'] - weekly['first_price']
+    weekly['weekly_change_percentage'] = weekly['weekly_change'] / weekly['first_price'] * 100
+    return weekly
+
+def _symbol_filter(symbols):
+    """Sembol listesi için IN filtresi ve parametrelerini üret"""
+    if not symbols:
+        return '', []
+    return f"AND symbol IN ({', '.join('?' for _ in symbols)})", list(symbols)
+
+def _write_weekly_summary(conn, weekly, start_date, end_date, symbols=None):
+    """Haftalık değerlere sinyal sayılarını ekleyip weekly_summary tablosuna yaz"""
+    if weekly.empty:
+        return 0
+    
+    symbol_filter, symbol_params = _symbol_filter(symbols)
+    counts = pd.read_sql_query(
+        SIGNAL_COUNT_QUERY.format(symbol_filter=symbol_filter),
+        conn,
+        params=[start_date, end_date] + symbol_params
+    )
+    weekly = weekly.merge(counts, on=['symbol', 'week_start'], how='left')
+    weekly[['buy_signal_count', 'sell_signal_count']] = weekly[['buy_signal_count', 'sell_signal_count']].fillna(0).astype(int)
+    weekly['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    columns = WEEKLY_SUMMARY_COLUMNS + ['updated_at']
+    conn.executemany(f'''
+    INSERT OR REPLACE INTO weekly_summary ({', '.join(columns)})
+    VALUES ({', '.join('?' for _ in columns)})
+    ''', weekly[columns].itertuples(index=False, name=None))
+    return len(weekly)
+
+def ensure_weekly_summary(conn):
+    """
+    weekly_summary tablosunu oluştur, boşsa mevcut fiyat geçmişinden doldur
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS weekly_summary (
+        symbol TEXT,
+        week_start TEXT,
+        first_date TEXT,
+        last_date TEXT,
+        weekly_open REAL,
+        first_price REAL,
+        last_price REAL,
+        weekly_high REAL,
+        weekly_low REAL,
+        weekly_volume INTEGER,
+        bar_count INTEGER,
+        weekly_change REAL,
+        weekly_change_percentage REAL,
+        buy_signal_count INTEGER,
+        sell_signal_count INTEGER,
+        updated_at TEXT,
+        PRIMARY KEY (symbol, week_start)
+    )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_weekly_summary_week ON weekly_summary (week_start)')
+    
+    if conn.execute('SELECT 1 FROM weekly_summary LIMIT 1').fetchone() is None:
+        first_date, last_date = conn.execute('SELECT MIN(date), MAX(date) FROM stock_data').fetchone()
+        if first_date is not None:
+            start_date = week_start_of([first_date])[0]
+            _write_weekly_summary(conn, load_weekly_aggregates(conn, start_date, last_date), start_date, last_date)
+
+def refresh_weekly_summary(conn, symbol, week_starts):
+    """
+    Bir sembolün yalnızca verilen haftalarını yeniden hesapla
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        symbol: Hisse sembolü
+        week_starts: Yeniden hesaplanacak hafta başlangıçları (YYYY-MM-DD)
+    
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    week_starts = sorted(set(week_starts))
+    if not week_starts:
+        return 0
+    
+    start_date = week_starts[0]
+    end_date = (pd.Timestamp(week_starts[-1]) + pd.Timedelta(days=6)).strftime('%Y-%m-%d')
+    weekly = load_weekly_aggregates(conn, start_date, end_date, [symbol])
+    weekly = weekly[weekly['week_start'].isin(week_starts)]
+    return _write_weekly_summary(conn, weekly, start_date, end_date, [symbol])
+
+def load_weekly_summary(conn, week_start, symbols=None):
+    """
+    Bir haftanın sembol başına özetini weekly_summary tablosundan oku
+    
+    Args:
+        conn: Açık SQLite bağlantısı
+        week_start: Hafta başlangıcı (YYYY-MM-DD, Pazartesi)
+        symbols: Sembol listesi (None ise tüm semboller)
+    
+    Returns:
+        pandas.DataFrame: load_weekly_aggregates ile aynı sütunlar ve sinyal sayıları
+    """
+    symbol_filter, symbol_params = _symbol_filter(symbols)
+    return pd.read_sql_query(
+        f"SELECT {', '.join(WEEKLY_SUMMARY_COLUMNS)} FROM weekly_summary WHERE week_start = ? {symbol_filter}",
+        conn,
+        params=[week_start] + symbol_params
+    )
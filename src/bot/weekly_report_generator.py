@@ -12,6 +12,14 @@ import sys
 
 # Konfigürasyon dosyasını import et
 from src.bot.config import *
+from src.bot.risk_metrics import summarize_trades
+from src.bot.weekly_aggregation import load_weekly_aggregates, load_weekly_summary
+from src.bot.exit_engine import (
+    load_signal_price_frames, build_price_matrices, simulate_exits, build_trade_records
+)
+from src.bot.monte_carlo import MonteCarloSimulator
+from src.bot.backtester import PortfolioBacktester
+from src.bot.benchmark import BenchmarkSeries
 
 # Loglama ayarları
 log_handlers = [logging.StreamHandler()]
@@ -34,6 +42,9 @@ class WeeklyReportGenerator:
             db_path: Veritabanı dosya yolu
         """
         self.db_path = db_path
+        self.monte_carlo = MonteCarloSimulator(db_path)
+        self.backtester = PortfolioBacktester(db_path)
+        self.benchmark = BenchmarkSeries(db_path)
         logger.info("WeeklyReportGenerator başlatıldı")
     
     def _get_connection(self):
@@ -91,59 +102,31 @@ class WeeklyReportGenerator:
             }
         
         try:
-            # BIST30 hisselerinin haftalık performansını hesapla
-            stock_performances = []
+            # Haftanın sembol başına özetini materyalize tablodan oku; tablo
+            # henüz doldurulmamışsa fiyat geçmişinden tek sorguda hesapla
+            weekly = load_weekly_summary(conn, start_of_week.strftime('%Y-%m-%d'), BIST30_SYMBOLS)
+            if weekly.empty:
+                weekly = load_weekly_aggregates(
+                    conn,
+                    start_of_week.strftime('%Y-%m-%d'),
+                    end_of_week.strftime('%Y-%m-%d'),
+                    BIST30_SYMBOLS
+                )
             
-            for symbol in BIST30_SYMBOLS:
-                # Haftanın ilk ve son işlem günü verilerini al
-                query = f"""
-                SELECT * FROM stock_prices 
-                WHERE symbol = '{symbol}' 
-                AND date >= '{start_of_week.strftime('%Y-%m-%d')}' 
-                AND date <= '{end_of_week.strftime('%Y-%m-%d')}'
-                ORDER BY date ASC
-                """
-                
-                df = pd.read_sql_query(query, conn)
-                
-                if df.empty or len(df) < 2:
-                    logger.warning(f"{symbol} için haftalık veri bulunamadı")
-                    continue
-                
-                # İlk ve son işlem günü fiyatları
-                first_price = df.iloc[0]['close']
-                last_price = df.iloc[-1]['close']
-                
-                # Haftalık değişim
-                weekly_change = last_price - first_price
-                weekly_change_percentage = (weekly_change / first_price) * 100
-                
-                # Haftalık en yüksek ve en düşük
-                weekly_high = df['high'].max()
-                weekly_low = df['low'].min()
-                
-                # Haftalık işlem hacmi
-                weekly_volume = df['volume'].sum()
-                
-                stock_performances.append({
-                    'symbol': symbol,
-                    'first_date': df.iloc[0]['date'],
-                    'last_date': df.iloc[-1]['date'],
-                    'first_price': first_price,
-                    'last_price': last_price,
-                    'weekly_change': weekly_change,
-                    'weekly_change_percentage': weekly_change_percentage,
-                    'weekly_high': weekly_high,
-                    'weekly_low': weekly_low,
-                    'weekly_volume': weekly_volume
-                })
+            missing_symbols = sorted(set(BIST30_SYMBOLS) - set(weekly['symbol']))
+            if missing_symbols:
+                logger.warning(f"{len(missing_symbols)} hisse için haftalık veri bulunamadı: {', '.join(missing_symbols)}")
             
             # Performansı yüzdeye göre sırala
-            stock_performances = sorted(stock_performances, key=lambda x: x['weekly_change_percentage'], reverse=True)
+            weekly = weekly.sort_values('weekly_change_percentage', ascending=False)
+            stock_performances = weekly[[
+                'symbol', 'first_date', 'last_date', 'first_price', 'last_price',
+                'weekly_change', 'weekly_change_percentage', 'weekly_high', 'weekly_low', 'weekly_volume'
+            ]].to_dict('records')
             
             # BIST30 endeksinin ortalama performansı
             if stock_performances:
-                avg_change_percentage = sum(stock['weekly_change_percentage'] for stock in stock_performances) / len(stock_performances)
+                avg_change_percentage = float(weekly['weekly_change_percentage'].mean())
                 
                 # En iyi ve en kötü performans gösteren hisseler
                 best_performers = stock_performances[:3] if len(stock_performances) >= 3 else stock_performances
@@ -156,9 +139,9 @@ class WeeklyReportGenerator:
                     'week_end': end_of_week.strftime('%Y-%m-%d'),
                     'avg_change_percentage': avg_change_percentage,
                     'stock_count': len(stock_performances),
-                    'positive_count': sum(1 for stock in stock_performances if stock['weekly_change'] > 0),
-                    'negative_count': sum(1 for stock in stock_performances if stock['weekly_change'] < 0),
-                    'neutral_count': sum(1 for stock in stock_performances if stock['weekly_change'] == 0),
+                    'positive_count': int((weekly['weekly_change'] > 0).sum()),
+                    'negative_count': int((weekly['weekly_change'] < 0).sum()),
+                    'neutral_count': int((weekly['weekly_change'] == 0).sum()),
                     'best_performers': best_performers,
                     'worst_performers': worst_performers,
                     'all_performances': stock_performances
@@ -210,13 +193,17 @@ class WeeklyReportGenerator:
         
         try:
             # Haftanın sinyallerini al
-            signals_query = f"""
-            SELECT * FROM signals 
-            WHERE date(signal_date) >= date('{start_of_week.strftime('%Y-%m-%d')}') 
-            AND date(signal_date) <= date('{end_of_week.strftime('%Y-%m-%d')}')
+            signals_query = """
+            SELECT id, symbol, date AS signal_date, signal_type, price, reason, created_at
+            FROM signals
+            WHERE date >= ? AND date <= ?
             """
             
-            signals_df = pd.read_sql_query(signals_query, conn)
+            signals_df = pd.read_sql_query(
+                signals_query,
+                conn,
+                params=(start_of_week.strftime('%Y-%m-%d'), end_of_week.strftime('%Y-%m-%d'))
+            )
             
             if signals_df.empty:
                 logger.warning(f"{start_of_week.strftime('%Y-%m-%d')} - {end_of_week.strftime('%Y-%m-%d')} tarihleri arasında sinyal bulunamadı")
@@ -227,136 +214,44 @@ class WeeklyReportGenerator:
                     'message': 'Haftalık sinyal bulunamadı',
                     'buy_signals': [],
                     'sell_signals': [],
-                    'performance': {
-                        'total_profit_loss': 0,
-                        'avg_profit_loss_percentage': 0,
-                        'successful_trades': 0,
-                        'total_trades': 0,
-                        'success_rate': 0
-                    },
+                    'performance': summarize_trades([])[0],
+                    'equity_curve': [],
                     'trade_details': []
                 }
             
             # Sinyalleri alım ve satım olarak ayır
-            buy_signals = signals_df[signals_df['buy_signal'] == 1].to_dict('records')
-            sell_signals = signals_df[signals_df['sell_signal'] == 1].to_dict('records')
+            buy_signals = signals_df[signals_df['signal_type'] == 'BUY'].to_dict('records')
+            sell_signals = signals_df[signals_df['signal_type'] == 'SELL'].to_dict('records')
             
-            # Her alım sinyali için performans hesapla
-            performance_results = []
+            # Tüm alım sinyallerinin hafta sonuna kadarki fiyat verisini tek sorguda topla
+            price_frames, simulated_signals = load_signal_price_frames(
+                conn, buy_signals, end_date=end_of_week.strftime('%Y-%m-%d')
+            )
             
-            for signal in buy_signals:
-                symbol = signal['symbol']
-                signal_date = signal['signal_date']
-                
-                # Sinyal sonrası fiyat verilerini al
-                price_query = f"""
-                SELECT * FROM stock_prices 
-                WHERE symbol = '{symbol}' 
-                AND date(date) >= date('{signal_date}')
-                AND date(date) <= date('{end_of_week.strftime('%Y-%m-%d')}')
-                ORDER BY date ASC
-                """
-                
-                price_df = pd.read_sql_query(price_query, conn)
-                
-                if price_df.empty or len(price_df) < 2:
-                    logger.warning(f"{symbol} için yeterli fiyat verisi bulunamadı")
-                    continue
-                
-                # Alım fiyatı (sinyal günü kapanış)
-                buy_price = price_df.iloc[0]['close']
-                
-                # Satış senaryoları
-                scenarios = []
-                
-                # 1. Hedef kâra ulaşma
-                target_price = buy_price * (1 + TARGET_PROFIT_PERCENTAGE/100)
-                for i in range(1, len(price_df)):
-                    if price_df.iloc[i]['high'] >= target_price:
-                        sell_date = price_df.iloc[i]['date']
-                        sell_price = target_price
-                        profit_loss = sell_price - buy_price
-                        profit_loss_percentage = (profit_loss / buy_price) * 100
-                        
-                        scenarios.append({
-                            'scenario': 'target_profit',
-                            'buy_date': signal_date,
-                            'buy_price': buy_price,
-                            'sell_date': sell_date,
-                            'sell_price': sell_price,
-                            'profit_loss': profit_loss,
-                            'profit_loss_percentage': profit_loss_percentage,
-                            'holding_days': i
-                        })
-                        break
-                
-                # 2. Stop-loss'a düşme
-                stop_price = buy_price * (1 - STOP_LOSS_PERCENTAGE/100)
-                for i in range(1, len(price_df)):
-                    if price_df.iloc[i]['low'] <= stop_price:
-                        sell_date = price_df.iloc[i]['date']
-                        sell_price = stop_price
-                        profit_loss = sell_price - buy_price
-                        profit_loss_percentage = (profit_loss / buy_price) * 100
-                        
-                        scenarios.append({
-                            'scenario': 'stop_loss',
-                            'buy_date': signal_date,
-                            'buy_price': buy_price,
-                            'sell_date': sell_date,
-                            'sell_price': sell_price,
-                            'profit_loss': profit_loss,
-                            'profit_loss_percentage': profit_loss_percentage,
-                            'holding_days': i
-                        })
-                        break
-                
-                # 3. Haftanın son işlem günü
-                if len(price_df) > 1:
-                    sell_date = price_df.iloc[-1]['date']
-                    sell_price = price_df.iloc[-1]['close']
-                    profit_loss = sell_price - buy_price
-                    profit_loss_percentage = (profit_loss / buy_price) * 100
-                    
-                    scenarios.append({
-                        'scenario': 'week_end',
-                        'buy_date': signal_date,
-                        'buy_price': buy_price,
-                        'sell_date': sell_date,
-                        'sell_price': sell_price,
-                        'profit_loss': profit_loss,
-                        'profit_loss_percentage': profit_loss_percentage,
-                        'holding_days': len(price_df) - 1
-                    })
-                
-                # En iyi senaryoyu seç (en yüksek kâr veya en düşük zarar)
-                if scenarios:
-                    best_scenario = max(scenarios, key=lambda x: x['profit_loss_percentage'])
-                    best_scenario['symbol'] = symbol
-                    performance_results.append(best_scenario)
+            if len(simulated_signals) < len(buy_signals):
+                logger.warning(f"{len(buy_signals) - len(simulated_signals)} alım sinyali için yeterli fiyat verisi bulunamadı")
             
-            # Performans özeti
-            if performance_results:
-                total_profit_loss = sum(result['profit_loss'] for result in performance_results)
-                avg_profit_loss_percentage = sum(result['profit_loss_percentage'] for result in performance_results) / len(performance_results)
-                successful_trades = sum(1 for result in performance_results if result['profit_loss'] > 0)
-                success_rate = (successful_trades / len(performance_results)) * 100 if performance_results else 0
-                
-                performance_summary = {
-                    'total_profit_loss': total_profit_loss,
-                    'avg_profit_loss_percentage': avg_profit_loss_percentage,
-                    'successful_trades': successful_trades,
-                    'total_trades': len(performance_results),
-                    'success_rate': success_rate
-                }
-            else:
-                performance_summary = {
-                    'total_profit_loss': 0,
-                    'avg_profit_loss_percentage': 0,
-                    'successful_trades': 0,
-                    'total_trades': 0,
-                    'success_rate': 0
-                }
+            # Tüm sinyallerin çıkışlarını tek seferde hesapla; hedef/stop
+            # tetiklenmezse pozisyon haftanın son işlem gününde kapanır
+            performance_results = []
+            if price_frames:
+                matrices = build_price_matrices(price_frames)
+                exits = simulate_exits(
+                    matrices['close'][:, 0],
+                    matrices['high'],
+                    matrices['low'],
+                    matrices['close']
+                )
+                performance_results = build_trade_records(
+                    [signal['symbol'] for signal in simulated_signals],
+                    [signal['signal_date'] for signal in simulated_signals],
+                    matrices,
+                    exits,
+                    max_holding_scenario='week_end'
+                )
+            
+            # Performans özeti ve özsermaye eğrisi (vektörel risk metrikleri)
+            performance_summary, equity_curve = summarize_trades(performance_results)
             
             return {
                 'success': True,
@@ -365,6 +260,7 @@ class WeeklyReportGenerator:
                 'buy_signals': buy_signals,
                 'sell_signals': sell_signals,
                 'performance': performance_summary,
+                'equity_curve': equity_curve,
                 'trade_details': performance_results
             }
             
@@ -377,12 +273,30 @@ class WeeklyReportGenerator:
         finally:
             conn.close()
     
-    def get_weekly_report(self, date=None):
+    def get_relative_performance(self, end_date=None, lookback_bars=BENCHMARK_LOOKBACK_BARS):
+        """
+        Stratejinin son dönem özsermaye eğrisini endeksle karşılaştır
+        
+        Args:
+            end_date: Dönem sonu (None ise en yeni veri)
+            lookback_bars: Geriye bakılan bar sayısı
+            
+        Returns:
+            dict: Alfa, beta, korelasyon, takip hatası ve bilgi oranı
+        """
+        backtest = self.backtester.run(end_date=end_date)
+        if not backtest['success']:
+            return {'index': BENCHMARK_INDEX, 'message': backtest['message']}
+        
+        return self.benchmark.get_relative_performance(backtest['equity_curve'][-(lookback_bars + 1):])
+    
+    def get_weekly_report(self, date=None, include_confidence_intervals=False):
         """
         Haftalık rapor oluştur
         
         Args:
             date: Referans tarihi (None ise bugün)
+            include_confidence_intervals: True ise Monte Carlo güven aralıkları eklenir
             
         Returns:
             dict: Haftalık rapor
@@ -406,23 +320,45 @@ class WeeklyReportGenerator:
                 'negative_count': bist30_performance.get('negative_count', 0),
                 'neutral_count': bist30_performance.get('neutral_count', 0),
                 'best_performers': bist30_performance.get('best_performers', []),
-                'worst_performers': bist30_performance.get('worst_performers', [])
+                'worst_performers': bist30_performance.get('worst_performers', []),
+                'all_performances': bist30_performance.get('all_performances', [])
             },
             'signals_performance': {
                 'buy_signals_count': len(signals_performance.get('buy_signals', [])),
                 'sell_signals_count': len(signals_performance.get('sell_signals', [])),
                 'performance': signals_performance.get('performance', {}),
-                'trade_details': signals_performance.get('trade_details', [])
+                'trade_details': signals_performance.get('trade_details', []),
+                'equity_curve': signals_performance.get('equity_curve', [])
             },
+            'benchmark_performance': {},
             'comparison': {
                 'bot_vs_market': 0  # Botun performansı - BIST30 performansı
             }
         }
         
+        # Endekslerin haftalık getirisi (kümülatif log getiriden)
+        start_of_week, end_of_week = self._get_week_dates(date)
+        week_start = start_of_week.strftime('%Y-%m-%d')
+        week_end = end_of_week.strftime('%Y-%m-%d')
+        for index_symbol in BENCHMARK_INDICES:
+            report['benchmark_performance'][index_symbol] = {
+                'week_return_percentage': self.benchmark.get_window_return(index_symbol, week_start, week_end)
+            }
+        
         # Bot performansı vs BIST30 performansı karşılaştırması
         if report['signals_performance']['performance'].get('avg_profit_loss_percentage') is not None and report['bist30_performance'].get('avg_change_percentage') is not None:
             report['comparison']['bot_vs_market'] = report['signals_performance']['performance'].get('avg_profit_loss_percentage', 0) - report['bist30_performance'].get('avg_change_percentage', 0)
         
+        # Gerçek endekse göre karşılaştırma: haftalık fark ve son dönem alfa/beta/takip hatası
+        index_return = report['benchmark_performance'].get(BENCHMARK_INDEX, {}).get('week_return_percentage')
+        if index_return is not None:
+            report['comparison']['bot_vs_benchmark'] = report['signals_performance']['performance'].get('avg_profit_loss_percentage', 0) - index_return
+        report['comparison']['relative_to_benchmark'] = self.get_relative_performance(week_end)
+        
+        # Bootstrap güven aralıkları pahalı olduğundan yalnızca istendiğinde hesaplanır
+        if include_confidence_intervals:
+            report['signals_performance']['confidence_intervals'] = self.monte_carlo.get_confidence_intervals()
+        
         return report
 
 # Test fonksiyonu
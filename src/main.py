@@ -1,12 +1,15 @@
 import os
 import threading
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, send_from_directory, abort
 from whitenoise import WhiteNoise
 
 # Bot modüllerini import et
-from src.routes.bist30 import bist30_bp
-from src.bot.config import validate_telegram_config
+from src.routes.bist30 import bist30_bp, outbox_dispatcher, job_manager, market_scheduler, DATABASE_PATH
+from src.routes.user import user_bp
+from src.models.user import db
+from src.bot.config import validate_telegram_config, REPORT_OUTPUT_DIR, REPORT_CACHE_MAX_AGE, SCHEDULER_ENABLED
+from src.bot.report_renderer import is_report_file
 
 def create_app():
     """Flask uygulamasını oluştur ve konfigüre et"""
@@ -14,15 +17,53 @@ def create_app():
     
     # Static dosyalar için WhiteNoise middleware
     app.wsgi_app = WhiteNoise(app.wsgi_app, root='static/')
+    os.makedirs(REPORT_OUTPUT_DIR, exist_ok=True)
+    
+    # Kullanıcı ve abonelik tabloları bot ile aynı veritabanında tutulur;
+    # sinyal dağıtımı bunları doğrudan SQLite üzerinden okur
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{DATABASE_PATH}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
     
     # Blueprint'leri kaydet
     app.register_blueprint(bist30_bp, url_prefix='/api/bist30')
+    app.register_blueprint(user_bp, url_prefix='/api')
+    
+    # Arka plan işleri (ör. haftalık analiz) uygulama bağlamında çalışır
+    job_manager.init_app(app)
     
     @app.route('/')
     def index():
         """Ana sayfa"""
         return render_template('index.html')
     
+    @app.route('/reports/<file_name>')
+    def serve_report(file_name):
+        """
+        Önceden üretilmiş HTML raporu diskten sun
+        
+        Dosya her istekte diskte aranır; böylece herhangi bir worker'ın
+        ürettiği rapor tüm worker'larda görünür. İçerik özetli dosya adları
+        hiç değişmediği için uzak gelecek (immutable) önbellek başlıklarıyla
+        sunulur.
+        """
+        if not is_report_file(file_name):
+            abort(404)
+        
+        # İstemci destekliyorsa önceden sıkıştırılmış kopya gönderilir
+        gzip_name = f"{file_name}.gz"
+        if 'gzip' in request.accept_encodings and os.path.exists(os.path.join(REPORT_OUTPUT_DIR, gzip_name)):
+            response = send_from_directory(REPORT_OUTPUT_DIR, gzip_name, mimetype='text/html', max_age=REPORT_CACHE_MAX_AGE)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_from_directory(REPORT_OUTPUT_DIR, file_name, mimetype='text/html', max_age=REPORT_CACHE_MAX_AGE)
+        
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.cache_control.immutable = True
+        return response
+    
     @app.route('/health')
     def health_check():
         """Sağlık kontrolü endpoint'i"""
@@ -32,8 +73,14 @@ def create_app():
             'service': 'BIST30 Web App'
         })
     
-    # Telegram konfigürasyonunu kontrol et
-    validate_telegram_config()
+    # Telegram konfigürasyonunu kontrol et; geçerliyse bekleyen bildirimler
+    # (ör. yeniden başlatma öncesinden kalanlar) arka planda gönderilmeye başlar
+    if validate_telegram_config():
+        outbox_dispatcher.start()
+    
+    # Zamanlanmış analizler; birden fazla worker'da yalnızca kilidi alan çalıştırır
+    if SCHEDULER_ENABLED:
+        market_scheduler.start()
     
     return app
 
@@ -0,0 +1,33 @@
+from datetime import datetime
+from src.models.user import db
+
+# Tüm hisseleri kapsayan abonelik sembolü
+ALL_SYMBOLS = '*'
+
+class Subscription(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    symbol = db.Column(db.String(20), nullable=False, default=ALL_SYMBOLS)
+    notify_buy = db.Column(db.Boolean, nullable=False, default=True)
+    notify_sell = db.Column(db.Boolean, nullable=False, default=True)
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'symbol', name='uq_subscription_user_symbol'),
+        db.Index('idx_subscription_symbol', 'symbol'),
+    )
+
+    def __repr__(self):
+        return f'<Subscription {self.user_id}:{self.symbol}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'symbol': self.symbol,
+            'notify_buy': self.notify_buy,
+            'notify_sell': self.notify_sell,
+            'active': self.active,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None
+        }
@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, redirect, url_for
 import os
 import sys
 import json
+import sqlite3
 from datetime import datetime
 
 # Bot modüllerini import et
@@ -11,7 +12,21 @@ from src.bot.signal_generator import SignalGenerator
 from src.bot.performance_simulator import PerformanceSimulator
 from src.bot.weekly_report_generator import WeeklyReportGenerator
 from src.bot.telegram_notifier import TelegramNotifier
-from src.bot.config import validate_telegram_config
+from src.bot.notification_queue import PRIORITY_SUMMARY
+from src.bot.outbox import OutboxDispatcher, enqueue_notification, KIND_MESSAGE
+from src.bot.subscriptions import SubscriptionFanOut
+from src.bot.jobs import JobManager
+from src.bot.scheduler import MarketScheduler
+from src.bot.backtester import PortfolioBacktester, validate_backtest_request
+from src.bot.walk_forward import WalkForwardRunner, validate_walk_forward_request
+from src.bot.monte_carlo import MonteCarloSimulator, validate_monte_carlo_request
+from src.bot.result_cache import ResultCache
+from src.bot.response_cache import ResponseCache
+from src.bot.batch_data import BatchDataReader, resolve_symbols, TECHNICAL_LOOKBACK
+from src.bot.exporter import TableExporter, EXPORT_FORMATS
+from src.bot.range_report import RangeReportGenerator, resolve_report_range, validate_rolling_weeks, DEFAULT_ROLLING_WEEKS
+from src.bot.report_renderer import ReportRenderer
+from src.bot.config import validate_telegram_config, BIST30_SYMBOLS, BATCH_MAX_LIMIT
 
 # Blueprint oluştur
 bist30_bp = Blueprint('bist30', __name__)
@@ -23,8 +38,53 @@ DATABASE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bot/da
 data_fetcher = DataFetcher(db_path=DATABASE_PATH)
 technical_analyzer = TechnicalAnalyzer(db_path=DATABASE_PATH)
 signal_generator = SignalGenerator(db_path=DATABASE_PATH)
+# Çoklu sembol uç noktaları için tek sorguluk panel okuyucu
+batch_data_reader = BatchDataReader(db_path=DATABASE_PATH, signal_generator=signal_generator)
+# Tabloları sabit bellekle akış halinde dışa aktaran okuyucu
+table_exporter = TableExporter(db_path=DATABASE_PATH)
 performance_simulator = PerformanceSimulator(db_path=DATABASE_PATH)
 weekly_report_generator = WeeklyReportGenerator(db_path=DATABASE_PATH)
+portfolio_backtester = PortfolioBacktester(db_path=DATABASE_PATH)
+walk_forward_runner = WalkForwardRunner(db_path=DATABASE_PATH)
+monte_carlo_simulator = MonteCarloSimulator(db_path=DATABASE_PATH)
+result_cache = ResultCache(db_path=DATABASE_PATH)
+# Veri yalnızca pipeline çalıştığında değişen GET uç noktaları için ETag'li yanıt önbelleği
+response_cache = ResponseCache(db_path=DATABASE_PATH)
+range_report_generator = RangeReportGenerator(db_path=DATABASE_PATH)
+report_renderer = ReportRenderer()
+# Olay döngüsü ve HTTP bağlantı havuzu istekler arasında paylaşılır
+telegram_notifier = TelegramNotifier()
+# Outbox'taki bildirimleri arka planda gönderen dağıtıcı (uygulama açılışında başlatılır)
+outbox_dispatcher = OutboxDispatcher(db_path=DATABASE_PATH, notifier=telegram_notifier)
+# Sinyalleri kullanıcı aboneliklerine dağıtan motor
+subscription_fan_out = SubscriptionFanOut(db_path=DATABASE_PATH)
+# Uzun süren akışları HTTP isteği dışında çalıştıran iş yöneticisi
+job_manager = JobManager(db_path=DATABASE_PATH)
+
+WEEKLY_ANALYSIS_JOB = 'weekly-analysis'
+WEEKLY_ANALYSIS_STAGES = ['fetch', 'analyze', 'signals', 'report', 'notify']
+WALK_FORWARD_JOB = 'walk-forward'
+WALK_FORWARD_STAGES = ['windows']
+# Borsa takvimine göre işleri başlatan zamanlayıcı (uygulama açılışında başlatılır)
+market_scheduler = MarketScheduler(db_path=DATABASE_PATH, job_manager=job_manager)
+
+def render_weekly_html_report(date=None):
+    """
+    Haftalık raporu statik HTML olarak üret
+    
+    Args:
+        date: Referans tarihi (None ise bugün)
+    
+    Returns:
+        dict: ReportRenderer.render_weekly_report çıktısı
+    """
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    weekly_report = result_cache.get_or_compute(
+        'weekly-report', date,
+        lambda: weekly_report_generator.get_weekly_report(date)
+    )
+    # Dosya /reports/<ad> ile diskten sunulduğu için tüm worker'larda hemen görünür
+    return report_renderer.render_weekly_report(weekly_report)
 
 @bist30_bp.route('/symbols', methods=['GET'])
 def get_symbols():
@@ -97,63 +157,88 @@ def generate_signals():
             'message': f"Sinyal üretme hatası: {str(e)}"
         }), 500
 
-@bist30_bp.route('/run-weekly-analysis', methods=['POST'])
-def run_weekly_analysis():
-    """Haftalık analiz akışını çalıştır"""
+def run_weekly_analysis_job(job):
+    """
+    Haftalık analiz akışını çalıştır (arka plan işi olarak)
+    
+    Args:
+        job: JobContext (aşama ilerlemesi kaydedilir)
+    
+    Returns:
+        dict: Analiz raporu
+    """
+    # 1. Veri çekme
+    job.stage('fetch')
+    fetch_results = data_fetcher.fetch_all_stocks()
+    fetch_success_count = sum(1 for success in fetch_results.values() if success)
+    fetch_changed_count = len(data_fetcher.last_run_stats['changed'])
+    
+    # 2. Teknik analiz (verisi değişmeyen hisseler atlanır)
+    job.stage('analyze')
+    analysis_results = technical_analyzer.analyze_all_stocks(skip_unchanged=True)
+    analysis_success_count = sum(1 for success in analysis_results.values() if success)
+    analysis_skipped_count = len(technical_analyzer.last_run_stats['skipped'])
+    
+    # 3. Sinyal üretimi (girdisi değişmeyen hisseler atlanır)
+    job.stage('signals')
+    signals = signal_generator.generate_all_signals(skip_unchanged=True)
+    buy_signals = signals.get('buy_signals', [])
+    sell_signals = signals.get('sell_signals', [])
+    signals_skipped_count = len(signals.get('skipped_symbols', []))
+    
+    # Atlanan iş özeti (analiz + sinyal aşamaları)
+    total_stage_runs = len(analysis_results) + len(BIST30_SYMBOLS)
+    skipped_stage_runs = analysis_skipped_count + signals_skipped_count
+    
+    # Datetime nesnelerini string'e dönüştür (JSON serileştirme için)
+    for signal_list in [buy_signals, sell_signals]:
+        for signal in signal_list:
+            if 'last_date' in signal and isinstance(signal['last_date'], datetime):
+                signal['last_date'] = signal['last_date'].strftime('%Y-%m-%d')
+    
+    # Rapor oluştur
+    report = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'fetch_results': {
+            'total': len(fetch_results),
+            'success': fetch_success_count,
+            'changed': fetch_changed_count
+        },
+        'analysis_results': {
+            'total': len(analysis_results),
+            'success': analysis_success_count,
+            'skipped': analysis_skipped_count
+        },
+        'signals': {
+            'buy_count': len(buy_signals),
+            'sell_count': len(sell_signals),
+            'skipped': signals_skipped_count,
+            'buy_signals': buy_signals,
+            'sell_signals': sell_signals
+        },
+        'skipped_work': {
+            'skipped': skipped_stage_runs,
+            'total': total_stage_runs,
+            'skipped_percentage': (skipped_stage_runs / total_stage_runs) * 100 if total_stage_runs else 0
+        }
+    }
+    
+    # 4. Haftalık HTML rapor (görüntülenmesi hesaplama gerektirmez)
+    job.stage('report')
     try:
-        # 1. Veri çekme
-        fetch_results = data_fetcher.fetch_all_stocks()
-        fetch_success_count = sum(1 for success in fetch_results.values() if success)
-        
-        # 2. Teknik analiz
-        analysis_results = technical_analyzer.analyze_all_stocks()
-        analysis_success_count = sum(1 for success in analysis_results.values() if success)
-        
-        # 3. Sinyal üretimi
-        signals = signal_generator.generate_all_signals()
-        buy_signals = signals.get('buy_signals', [])
-        sell_signals = signals.get('sell_signals', [])
-        
-        # Datetime nesnelerini string'e dönüştür (JSON serileştirme için)
-        for signal_list in [buy_signals, sell_signals]:
-            for signal in signal_list:
-                if 'last_date' in signal and isinstance(signal['last_date'], datetime):
-                    signal['last_date'] = signal['last_date'].strftime('%Y-%m-%d')
-        
-        # Rapor oluştur
-        report = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'fetch_results': {
-                'total': len(fetch_results),
-                'success': fetch_success_count
-            },
-            'analysis_results': {
-                'total': len(analysis_results),
-                'success': analysis_success_count
-            },
-            'signals': {
-                'buy_count': len(buy_signals),
-                'sell_count': len(sell_signals),
-                'buy_signals': buy_signals,
-                'sell_signals': sell_signals
-            }
+        rendered_report = render_weekly_html_report()
+        report['html_report'] = {
+            'url': rendered_report['url'],
+            'size': rendered_report['size']
         }
-        
-        # Telegram bildirimi gönder (eğer konfigüre edilmişse)
-        try:
-            if validate_telegram_config():
-                telegram_notifier = TelegramNotifier()
-                
-                # Sinyalleri Telegram'a gönder
-                if buy_signals or sell_signals:
-                    telegram_signals = {
-                        'buy_signals': buy_signals,
-                        'sell_signals': sell_signals
-                    }
-                    telegram_notifier.send_signals(telegram_signals)
-                
-                # Haftalık özet mesajı
-                summary_message = f"""
+    except Exception as render_error:
+        print(f"HTML rapor üretilemedi: {render_error}")
+    
+    # Telegram bildirimleri: sinyaller kaydedilirken outbox'a yazıldı; özetler
+    # de outbox'a eklenir ve arka plan dağıtıcısı gönderir (iş Telegram'ı beklemez)
+    job.stage('notify')
+    try:
+        summary_message = f"""
 📊 <b>BIST30 Haftalık Analiz Tamamlandı</b>
 
 📅 <b>Tarih:</b> {report['timestamp']}
@@ -165,6 +250,7 @@ def run_weekly_analysis():
 🔍 <b>Teknik Analiz:</b>
 • Analiz edilen: {report['analysis_results']['total']}
 • Başarılı: {report['analysis_results']['success']}
+• Değişmediği için atlanan: {report['analysis_results']['skipped']}
 
 🎯 <b>Sinyaller:</b>
 • 🟢 Alım: {report['signals']['buy_count']}
@@ -172,23 +258,155 @@ def run_weekly_analysis():
 
 #BIST30 #HaftalıkAnaliz
 """
-                telegram_notifier.send_message_sync(summary_message)
-                
-        except Exception as telegram_error:
-            print(f"Telegram bildirimi gönderilemedi: {telegram_error}")
+        summaries = [summary_message]
+        if buy_signals or sell_signals:
+            summaries.insert(0, telegram_notifier.format_weekly_report({
+                'buy_signals': buy_signals,
+                'sell_signals': sell_signals
+            }))
+        
+        # Telegram yapılandırılmamışsa özetler kuyruğa alınmaz (enqueue False döner)
+        conn = sqlite3.connect(DATABASE_PATH)
+        try:
+            queued = 0
+            for index, text in enumerate(summaries):
+                queued += enqueue_notification(
+                    conn, f"weekly-analysis:{report['timestamp']}:{index}", KIND_MESSAGE,
+                    {'text': text}, priority=PRIORITY_SUMMARY
+                )
+            conn.commit()
+        finally:
+            conn.close()
         
+        report['notifications'] = 'queued' if queued else 'skipped'
+    except Exception as telegram_error:
+        print(f"Telegram bildirimleri kuyruğa eklenemedi: {telegram_error}")
+    
+    # Abone kullanıcılara sinyal bildirimleri (ters indeksle eşleştirilir)
+    try:
+        report['subscriptions'] = subscription_fan_out.fan_out({
+            'buy_signals': buy_signals,
+            'sell_signals': sell_signals
+        })
+    except Exception as fan_out_error:
+        print(f"Abonelik bildirimleri kuyruğa eklenemedi: {fan_out_error}")
+    
+    if validate_telegram_config():
+        outbox_dispatcher.wake()
+    
+    return report
+
+def run_fetch_job(job):
+    """Tüm hisselerin verisini çek (zamanlanmış aşama)"""
+    job.stage('fetch')
+    fetch_results = data_fetcher.fetch_all_stocks()
+    return {
+        'total': len(fetch_results),
+        'success': sum(1 for success in fetch_results.values() if success),
+        'changed': len(data_fetcher.last_run_stats['changed'])
+    }
+
+def run_analyze_job(job):
+    """Verisi değişen hisseleri analiz et (zamanlanmış aşama)"""
+    job.stage('analyze')
+    analysis_results = technical_analyzer.analyze_all_stocks(skip_unchanged=True)
+    return {
+        'total': len(analysis_results),
+        'success': sum(1 for success in analysis_results.values() if success),
+        'skipped': len(technical_analyzer.last_run_stats['skipped'])
+    }
+
+def run_signals_job(job):
+    """Sinyalleri üret ve abonelere dağıt (zamanlanmış aşama)"""
+    job.stage('signals')
+    signals = signal_generator.generate_all_signals(skip_unchanged=True)
+    
+    job.stage('notify')
+    fan_out_stats = subscription_fan_out.fan_out(signals)
+    if validate_telegram_config():
+        outbox_dispatcher.wake()
+    
+    return {
+        'buy_count': len(signals.get('buy_signals', [])),
+        'sell_count': len(signals.get('sell_signals', [])),
+        'skipped': len(signals.get('skipped_symbols', [])),
+        'subscriptions': fan_out_stats
+    }
+
+def run_report_job(job):
+    """Haftalık HTML raporu üret (zamanlanmış aşama)"""
+    job.stage('report')
+    rendered_report = render_weekly_html_report()
+    return {
+        'url': rendered_report['url'],
+        'size': rendered_report['size']
+    }
+
+job_manager.register(WEEKLY_ANALYSIS_JOB, run_weekly_analysis_job, WEEKLY_ANALYSIS_STAGES)
+
+def run_walk_forward_job(job):
+    """
+    Walk-forward doğrulamasını çalıştır (arka plan işi olarak)
+    
+    Args:
+        job: JobContext (pencere ilerlemesi kaydedilir)
+    
+    Returns:
+        dict: Pencere sonuçları ve birleştirilmiş örnek dışı performans
+    """
+    job.stage('windows')
+    result = walk_forward_runner.run(progress_callback=job.step, **job.params)
+    if not result['success']:
+        raise RuntimeError(result['message'])
+    return result
+
+job_manager.register(WALK_FORWARD_JOB, run_walk_forward_job, WALK_FORWARD_STAGES)
+job_manager.register('fetch', run_fetch_job, ['fetch'])
+job_manager.register('analyze', run_analyze_job, ['analyze'])
+job_manager.register('signals', run_signals_job, ['signals', 'notify'])
+job_manager.register('report', run_report_job, ['report'])
+
+@bist30_bp.route('/run-weekly-analysis', methods=['POST'])
+def run_weekly_analysis():
+    """Haftalık analiz işini başlat (çalışan iş varsa ona bağlanır)"""
+    try:
+        job, created = job_manager.submit(WEEKLY_ANALYSIS_JOB)
         return jsonify({
             'success': True,
-            'message': "Haftalık analiz başarıyla tamamlandı",
-            'report': report
-        })
+            'message': "Haftalık analiz başlatıldı" if created else "Çalışan haftalık analiz işine bağlanıldı",
+            'coalesced': not created,
+            'job': job,
+            'status_url': url_for('bist30.get_job', job_id=job['id'])
+        }), 202
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f"Haftalık analiz hatası: {str(e)}"
         }), 500
 
+@bist30_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Arka plan işinin durumunu, aşama ilerlemesini ve sonucunu döndür"""
+    try:
+        job = job_manager.get_job(job_id)
+        if job is None:
+            return jsonify({
+                'success': False,
+                'message': f"İş bulunamadı: {job_id}"
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"İş durumu hatası: {str(e)}"
+        }), 500
+
 @bist30_bp.route('/stock-data/<symbol>', methods=['GET'])
+@response_cache.cached
 def get_stock_data(symbol):
     """Belirli bir hisse için veri getir"""
     try:
@@ -215,6 +433,7 @@ def get_stock_data(symbol):
         }), 500
 
 @bist30_bp.route('/technical-data/<symbol>', methods=['GET'])
+@response_cache.cached
 def get_technical_data(symbol):
     """Belirli bir hisse için teknik göstergeleri getir"""
     try:
@@ -242,6 +461,7 @@ def get_technical_data(symbol):
         }), 500
 
 @bist30_bp.route('/signals/<symbol>', methods=['GET'])
+@response_cache.cached
 def get_signals(symbol):
     """Belirli bir hisse için sinyal üret"""
     try:
@@ -262,6 +482,119 @@ def get_signals(symbol):
             'message': f"Sinyal üretme hatası: {str(e)}"
         }), 500
 
+def _batch_request_args(default_limit):
+    """Batch uç noktalarının symbols/universe ve limit parametrelerini çözümle"""
+    symbols = resolve_symbols(request.args.get('symbols'), request.args.get('universe'))
+    limit = request.args.get('limit', default=default_limit, type=int)
+    if limit < 1 or limit > BATCH_MAX_LIMIT:
+        raise ValueError(f"limit 1 ile {BATCH_MAX_LIMIT} arasında olmalı")
+    return symbols, limit
+
+@bist30_bp.route('/stock-data', methods=['GET'])
+@response_cache.cached
+def get_batch_stock_data():
+    """Birden çok hisse için veri getir (?symbols=AKBNK,GARAN veya ?universe=bist30)"""
+    try:
+        symbols, limit = _batch_request_args(10)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            **batch_data_reader.get_stock_data(symbols, limit)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Veri getirme hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/technical-data', methods=['GET'])
+@response_cache.cached
+def get_batch_technical_data():
+    """Birden çok hisse için teknik göstergeleri getir (?symbols=AKBNK,GARAN veya ?universe=bist30)"""
+    try:
+        symbols, limit = _batch_request_args(TECHNICAL_LOOKBACK)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            **batch_data_reader.get_technical_data(symbols, limit)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Teknik gösterge getirme hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/signals', methods=['GET'])
+@response_cache.cached
+def get_batch_signals():
+    """Birden çok hisse için sinyal üret (?symbols=AKBNK,GARAN veya ?universe=bist30)"""
+    try:
+        symbols = resolve_symbols(request.args.get('symbols'), request.args.get('universe'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            **batch_data_reader.get_signals(symbols)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Sinyal üretme hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/export/<table>', methods=['GET'])
+def export_table(table):
+    """
+    Tabloyu akış halinde dışa aktar
+    
+    Parametreler: format=ndjson|csv|arrow, symbols=AKBNK,GARAN,
+    start_date/end_date=YYYY-MM-DD, gzip=true
+    """
+    try:
+        symbols = request.args.get('symbols')
+        export_format = request.args.get('format', 'ndjson').lower()
+        compress = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+        chunks = table_exporter.export(
+            table, export_format,
+            symbols=[symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()] if symbols else None,
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date'),
+            compress=compress
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f"{table}.{extension}"
+    if compress:
+        mimetype, filename = 'application/gzip', f"{filename}.gz"
+    
+    response = Response(chunks, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Ara vekil sunucuların yanıtı tamamen tamponlamasını engelle
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 # YENİ API UÇLARI
 
 @bist30_bp.route('/daily-report', methods=['POST'])
@@ -272,9 +605,15 @@ def get_daily_report():
         data = request.get_json()
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         time_of_day = data.get('time_of_day', 'close')  # 'noon' veya 'close'
+        # Monte Carlo güven aralıkları isteğe bağlıdır
+        include_confidence_intervals = data.get('confidence_intervals') is True
         
-        # Günlük rapor oluştur
-        report = performance_simulator.get_daily_report(date, time_of_day)
+        # Günlük rapor oluştur (aynı veri versiyonu için önbellekten)
+        report = result_cache.get_or_compute(
+            'daily-report', date,
+            lambda: performance_simulator.get_daily_report(date, time_of_day, include_confidence_intervals),
+            variant=[time_of_day, include_confidence_intervals]
+        )
         
         return jsonify({
             'success': True,
@@ -295,8 +634,11 @@ def run_performance_simulation():
         data = request.get_json()
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         
-        # Performans simülasyonu yap
-        performance = performance_simulator.get_daily_performance(date)
+        # Performans simülasyonu yap (aynı veri versiyonu için önbellekten)
+        performance = result_cache.get_or_compute(
+            'performance-simulation', date,
+            lambda: performance_simulator.get_daily_performance(date)
+        )
         
         return jsonify({
             'success': True,
@@ -338,9 +680,15 @@ def get_weekly_report():
         # İstek parametrelerini al
         data = request.get_json()
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        # Monte Carlo güven aralıkları isteğe bağlıdır
+        include_confidence_intervals = data.get('confidence_intervals') is True
         
-        # Haftalık rapor oluştur
-        report = weekly_report_generator.get_weekly_report(date)
+        # Haftalık rapor oluştur (aynı veri versiyonu için önbellekten)
+        report = result_cache.get_or_compute(
+            'weekly-report', date,
+            lambda: weekly_report_generator.get_weekly_report(date, include_confidence_intervals),
+            variant='confidence-intervals' if include_confidence_intervals else None
+        )
         
         return jsonify({
             'success': True,
@@ -353,6 +701,31 @@ def get_weekly_report():
             'message': f"Haftalık rapor oluşturma hatası: {str(e)}"
         }), 500
 
+@bist30_bp.route('/weekly-report/html', methods=['GET'])
+def get_weekly_report_html():
+    """En son (veya belirli bir haftanın) önceden üretilmiş HTML raporuna yönlendir"""
+    try:
+        week_start = request.args.get('week')
+        latest = report_renderer.get_latest_report(week_start)
+        
+        # Rapor henüz üretilmemişse bir kez üret; sonraki istekler statik dosyaya gider
+        if latest is None and week_start is None:
+            latest = render_weekly_html_report()
+        if latest is None:
+            return jsonify({
+                'success': False,
+                'message': f"{week_start} haftası için HTML rapor bulunamadı"
+            }), 404
+        
+        response = redirect(latest['url'])
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"HTML rapor hatası: {str(e)}"
+        }), 500
+
 @bist30_bp.route('/bist30-weekly-performance', methods=['POST'])
 def get_bist30_weekly_performance():
     """BIST30 endeksinin haftalık performansını hesapla"""
@@ -361,8 +734,11 @@ def get_bist30_weekly_performance():
         data = request.get_json()
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         
-        # BIST30 haftalık performansını hesapla
-        performance = weekly_report_generator.get_weekly_bist30_performance(date)
+        # BIST30 haftalık performansını hesapla (aynı veri versiyonu için önbellekten)
+        performance = result_cache.get_or_compute(
+            'bist30-weekly-performance', date,
+            lambda: weekly_report_generator.get_weekly_bist30_performance(date)
+        )
         
         return jsonify({
             'success': True,
@@ -375,6 +751,196 @@ def get_bist30_weekly_performance():
             'message': f"BIST30 haftalık performans hesaplama hatası: {str(e)}"
         }), 500
 
+@bist30_bp.route('/range-report', methods=['POST'])
+def get_range_report():
+    """Serbest tarih aralığı, 4 haftalık veya çeyrek başından bugüne rapor oluştur"""
+    try:
+        # İstek parametrelerini al
+        data = request.get_json(silent=True) or {}
+        try:
+            rolling_weeks = validate_rolling_weeks(data.get('rolling_weeks', DEFAULT_ROLLING_WEEKS))
+            from_date, to_date = resolve_report_range(
+                period=data.get('period'),
+                from_date=data.get('from'),
+                to_date=data.get('to')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        # Aralık raporu oluştur (aynı veri versiyonu için önbellekten)
+        report = result_cache.get_or_compute(
+            'range-report', f"{from_date}:{to_date}",
+            lambda: range_report_generator.get_range_report(from_date, to_date, rolling_weeks),
+            variant=rolling_weeks
+        )
+        
+        if not report['success']:
+            return jsonify(report), 400
+        
+        return jsonify({
+            'success': True,
+            'message': f"{from_date} - {to_date} aralığı için rapor oluşturuldu",
+            'report': report
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Aralık raporu oluşturma hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Rapor/performans sonuç önbelleğinin ve HTTP yanıt önbelleğinin isabet metriklerini döndür"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': result_cache.get_stats(),
+            'responses': response_cache.get_stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Önbellek metrikleri hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/notifier-stats', methods=['GET'])
+def get_notifier_stats():
+    """Telegram giden kuyruk ve outbox metriklerini döndür (derinlik, gecikme, kısıtlama)"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': {
+                'queue': telegram_notifier.get_queue_stats(),
+                'outbox': outbox_dispatcher.get_stats(),
+                'subscriptions': subscription_fan_out.last_run_stats
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Bildirim metrikleri hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/scheduler', methods=['GET'])
+def get_scheduler_status():
+    """Zamanlayıcı durumu, sonraki/son çalıştırmalar ve süre eğilimleri"""
+    try:
+        return jsonify({
+            'success': True,
+            'scheduler': market_scheduler.get_status(recent=request.args.get('recent', 20, type=int))
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Zamanlayıcı durumu hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/backtest', methods=['POST'])
+def run_backtest():
+    """Sinyal kurallarını fiyat geçmişi üzerinde portföy olarak test et"""
+    # İstek parametrelerini al ve doğrula (hatalı istekler 400, iç hatalar 500 döner)
+    data = request.get_json(silent=True) or {}
+    params = data.get('params') or {}
+    try:
+        if not isinstance(params, dict):
+            raise ValueError("params bir nesne olmalı")
+        symbols, params = validate_backtest_request(
+            data.get('start_date'), data.get('end_date'), data.get('symbols'), params
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        # Backtest çalıştır
+        result = portfolio_backtester.run(
+            start_date=data.get('start_date'),
+            end_date=data.get('end_date'),
+            symbols=symbols,
+            params=params
+        )
+        
+        if not result['success']:
+            return jsonify(result), 400
+        
+        return jsonify({
+            'success': True,
+            'message': f"{result['start_date']} - {result['end_date']} aralığı için backtest tamamlandı",
+            'backtest': result
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Backtest hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/walk-forward', methods=['POST'])
+def start_walk_forward():
+    """Walk-forward doğrulaması işini başlat (durum /jobs/<id> ile sorgulanır)"""
+    # İstek parametrelerini al ve doğrula (hatalı istekler 400, iç hatalar 500 döner)
+    data = request.get_json(silent=True) or {}
+    try:
+        options = validate_walk_forward_request(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        job, created = job_manager.submit(WALK_FORWARD_JOB, options)
+        
+        # Aynı anda tek walk-forward işi çalışır; farklı parametreli istek çalışan işe bağlanmaz
+        if not created and job['params'] != options:
+            return jsonify({
+                'success': False,
+                'message': "Farklı parametrelerle çalışan bir walk-forward işi var, bitince tekrar deneyin",
+                'job': job,
+                'status_url': url_for('bist30.get_job', job_id=job['id'])
+            }), 409
+        
+        return jsonify({
+            'success': True,
+            'message': "Walk-forward doğrulaması başlatıldı" if created else "Çalışan walk-forward işine bağlanıldı",
+            'coalesced': not created,
+            'job': job,
+            'status_url': url_for('bist30.get_job', job_id=job['id'])
+        }), 202
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Walk-forward başlatma hatası: {str(e)}"
+        }), 500
+
+@bist30_bp.route('/monte-carlo', methods=['POST'])
+def run_monte_carlo():
+    """İşlem sonuçları için Monte Carlo güven aralıklarını hesapla"""
+    # İstek parametrelerini al ve doğrula (hatalı istekler hesaplamadan önce 400 döner)
+    data = request.get_json(silent=True) or {}
+    try:
+        options = validate_monte_carlo_request(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        result = monte_carlo_simulator.get_confidence_intervals(**options)
+        
+        if not result['success']:
+            return jsonify(result), 400
+        
+        return jsonify({
+            'success': True,
+            'message': f"{result['trade_count']} işlem üzerinden {result['simulations']} Monte Carlo simülasyonu tamamlandı",
+            'monte_carlo': result
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Monte Carlo hatası: {str(e)}"
+        }), 500
+
 @bist30_bp.route('/test-telegram', methods=['POST'])
 def test_telegram():
     """Telegram bot bağlantısını test et"""
@@ -385,7 +951,6 @@ def test_telegram():
                 'message': "Telegram konfigürasyonu eksik! TELEGRAM_SETUP.md dosyasına bakın."
             }), 400
         
-        telegram_notifier = TelegramNotifier()
         test_message = """
 🤖 <b>BIST30 Bot Test Mesajı</b>
 
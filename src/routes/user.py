@@ -1,8 +1,59 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.models.subscription import Subscription, ALL_SYMBOLS
+from src.bot.config import BIST30_SYMBOLS
 
 user_bp = Blueprint('user', __name__)
 
+# JSON'da metin olarak gelebilecek bayrak değerleri
+_TRUE_VALUES = ('true', '1', 'yes')
+_FALSE_VALUES = ('false', '0', 'no')
+
+def _parse_flag(data, name):
+    """Bildirim bayrağını bool'a çevir (varsayılan True); geçersizse ValueError"""
+    value = data.get(name, True)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE_VALUES + _FALSE_VALUES:
+        return value.strip().lower() in _TRUE_VALUES
+    raise ValueError(f"'{name}' true/false olmalı")
+
+def validate_subscription_request(data):
+    """
+    Abonelik isteğini doğrula
+    
+    Args:
+        data: İstek gövdesi (dict)
+    
+    Returns:
+        tuple: (semboller, notify_buy, notify_sell)
+    
+    Raises:
+        ValueError: 'symbols' bilinen sembollerin (veya '*') listesi değilse ya da
+            bayraklar bool'a çevrilemiyorsa
+    """
+    if not isinstance(data, dict):
+        raise ValueError("İstek gövdesi JSON nesnesi olmalı")
+    symbols = data.get('symbols')
+    if symbols is None:
+        symbols = []
+    if not isinstance(symbols, list):
+        raise ValueError("'symbols' bir liste olmalı")
+    
+    normalized = []
+    for symbol in symbols:
+        if not isinstance(symbol, str):
+            raise ValueError("'symbols' yalnızca metin içermeli")
+        symbol = symbol.strip().upper()
+        if symbol != ALL_SYMBOLS and symbol not in BIST30_SYMBOLS:
+            raise ValueError(f"Bilinmeyen sembol: {symbol}")
+        if symbol not in normalized:
+            normalized.append(symbol)
+    
+    return normalized or [ALL_SYMBOLS], _parse_flag(data, 'notify_buy'), _parse_flag(data, 'notify_sell')
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
     users = User.query.all()
@@ -12,7 +63,7 @@ def get_users():
 def create_user():
     
     data = request.json
-    user = User(username=data['username'], email=data['email'])
+    user = User(username=data['username'], email=data['email'], telegram_chat_id=data.get('telegram_chat_id'))
     db.session.add(user)
     db.session.commit()
     return jsonify(user.to_dict()), 201
@@ -28,6 +79,7 @@ def update_user(user_id):
     data = request.json
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
+    user.telegram_chat_id = data.get('telegram_chat_id', user.telegram_chat_id)
     db.session.commit()
     return jsonify(user.to_dict())
 
@@ -37,3 +89,37 @@ def delete_user(user_id):
     db.session.delete(user)
     db.session.commit()
     return '', 204
+
+@user_bp.route('/users/<int:user_id>/subscriptions', methods=['GET'])
+def get_subscriptions(user_id):
+    user = User.query.get_or_404(user_id)
+    return jsonify([subscription.to_dict() for subscription in user.subscriptions])
+
+@user_bp.route('/users/<int:user_id>/subscriptions', methods=['POST'])
+def create_subscriptions(user_id):
+    """İzleme listesine hisse ekle; 'symbols' boşsa tüm hisselere abone olunur"""
+    user = User.query.get_or_404(user_id)
+    try:
+        symbols, notify_buy, notify_sell = validate_subscription_request(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    existing = {subscription.symbol: subscription for subscription in user.subscriptions}
+    for symbol in symbols:
+        subscription = existing.get(symbol)
+        if subscription is None:
+            subscription = Subscription(user_id=user.id, symbol=symbol)
+            db.session.add(subscription)
+            existing[symbol] = subscription
+        subscription.notify_buy = notify_buy
+        subscription.notify_sell = notify_sell
+        subscription.active = True
+    db.session.commit()
+    return jsonify([existing[symbol].to_dict() for symbol in symbols]), 201
+
+@user_bp.route('/users/<int:user_id>/subscriptions/<int:subscription_id>', methods=['DELETE'])
+def delete_subscription(user_id, subscription_id):
+    subscription = Subscription.query.filter_by(id=subscription_id, user_id=user_id).first_or_404()
+    db.session.delete(subscription)
+    db.session.commit()
+    return '', 204